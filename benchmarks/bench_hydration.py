@@ -0,0 +1,85 @@
+"""
+Compara a hidratação de linhas antiga (`_create_instance_from_row` original: cópia direta com
+`str(k)` por célula, mais a conversão manual que o código cliente fazia) com a hidratação
+linha a linha e com o plano por forma de consulta (montado na primeira linha).
+
+Uso:
+    python benchmarks/bench_hydration.py [linhas]
+"""
+import gc
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+
+from wborm.core import Model
+from wborm.fields import Field
+from wborm.query import QuerySet
+
+
+class Pedido(Model):
+    __tablename__ = "pedidos"
+    id = Field(int, primary_key=True)
+    cliente = Field(str)
+    total = Field(Decimal)
+    criado_em = Field(datetime)
+    status = Field(str)
+
+
+class _Conn:
+    def execute_query(self, sql):
+        return []
+
+
+def _rows(n):
+    # O driver entrega DECIMAL como float e DATETIME como texto (conversão padrão do jaydebeapi).
+    return [
+        {"id": i, "cliente": f"cliente {i}", "total": i * 1.25, "criado_em": "2024-01-31 10:20:30.5", "status": "ABERTO"}
+        for i in range(n)
+    ]
+
+
+def hidratacao_antiga(model, rows):
+    out = []
+    for row in rows:
+        obj = model()
+        for k, v in row.items():
+            k = str(k)
+            obj.__dict__[k] = v
+        # conversão feita depois, valor a valor, pelo código cliente
+        obj.total = Decimal(str(obj.total))
+        obj.criado_em = datetime.fromisoformat(obj.criado_em + "00000")
+        out.append(obj)
+    return out
+
+
+def hidratacao_por_linha(queryset, rows):
+    return [queryset._create_instance_from_row(row) for row in rows]
+
+
+def hidratacao_atual(queryset, rows):
+    return queryset._hydrate(rows)
+
+
+def medir(nome, fn, repeticoes=5):
+    melhor = min(_tempo(fn) for _ in range(repeticoes))
+    print(f"{nome:<28} {melhor * 1000:9.1f} ms")
+    return melhor
+
+
+def _tempo(fn):
+    gc.collect()  # cada medição começa com o heap limpo (sem lixo da anterior)
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = _rows(n)
+    qs = QuerySet(Pedido, _Conn())
+    print(f"Hidratando {n} linhas de {len(rows[0])} colunas")
+    antigo = medir("antiga + conversão manual", lambda: hidratacao_antiga(Pedido, rows))
+    medir("conversores linha a linha", lambda: hidratacao_por_linha(qs, rows))
+    atual = medir("plano por forma", lambda: hidratacao_atual(qs, rows))
+    print(f"razão: {antigo / atual:.2f}x")
@@ -7,6 +7,11 @@ from .model_cache import generate_model_stub, try_load_model_from_disk
 from .query import QuerySet
 from .expressions import col, date, now, raw, format_informix_datetime
 from .bootstrap import auto_load_cached_models
+from .cache import invalidate_tables, clear_cache, cache_stats
+from .unit_of_work import Session, session
+from .identity import IdentityMap, identity_map
+from .pool import ConnectionPool
+from . import stats
 from wborm.registry import _model_cache, _model_registry, _connection
 from wborm.bootstrap import auto_load_cached_models
 import inspect
@@ -26,6 +31,15 @@ __all__ = [
     "now",
     "raw",
     "format_informix_datetime",
+    "invalidate_tables",
+    "clear_cache",
+    "cache_stats",
+    "Session",
+    "session",
+    "IdentityMap",
+    "identity_map",
+    "ConnectionPool",
+    "stats",
     "register_global_connection",
 ]
 
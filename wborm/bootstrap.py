@@ -48,6 +48,7 @@ def auto_load_cached_models(conn, inject_globals=True, verbose=False, target_glo
             class_attrs = {
                 "__tablename__": table,
                 "_relations": cached["relations"],
+                "_indexes": cached.get("indexes", []),
                 **field_map
             }
 
@@ -0,0 +1,472 @@
+import pickle
+import re
+import sys
+import time
+import threading
+import zlib
+from wborm.registry import _query_result_cache, _cache_table_index
+
+_lock = threading.RLock()
+_stats = {
+    "hits": 0, "misses": 0, "stores": 0, "invalidations": 0,
+    "stale_hits": 0, "refreshes": 0, "refresh_errors": 0, "coalesced": 0,
+}
+_table_versions = {}
+_sizes = {"bytes": 0, "raw_bytes": 0, "compressed_entries": 0}
+_options = {
+    "compress_min_bytes": 256 * 1024,
+    "compress_level": 1,
+    "stale_grace": 0,
+    "refresh_ahead": None,
+    "refresh_min_rate": 60,
+    "flight_timeout": 30,
+}
+_entry_hits = {}
+_refreshing = set()
+_in_flight = {}
+
+_TABLE_NAME = r"[A-Za-z_\"][\w$\"]*(?:[.:@][\w$\"]+)*"
+_FROM_JOIN_RE = re.compile(
+    rf"\b(FROM|JOIN|INTO|UPDATE)\s+({_TABLE_NAME}(?:\s+(?:AS\s+)?\w+)?(?:\s*,\s*{_TABLE_NAME}(?:\s+(?:AS\s+)?\w+)?)*)",
+    re.IGNORECASE,
+)
+_SQL_KEYWORDS = {
+    "select", "where", "join", "inner", "left", "right", "full", "outer", "cross",
+    "on", "group", "order", "having", "union", "table", "temp", "first", "skip",
+}
+
+
+class CachedRows:
+    """
+        Resultado armazenado no cache em formato colunar: nomes das colunas uma única vez e
+        uma lista de valores por coluna, comprimida com zlib quando a entrada é grande.
+
+        Comporta-se como uma lista de dicionários (`len`, índice, iteração), decodificando
+        sob demanda; a hidratação usa `columns` + `tuples()` direto, sem montar dicionários.
+
+        Antes de comprimir, valores do driver (objetos Java) viram tipos Python (`to_python`),
+        que o pickle consegue serializar; formatos de linha que ainda falham não são retentados.
+        """
+
+    def __init__(self, columns, data, count, compressed=False, nbytes=0, raw_bytes=0):
+        self.columns = columns
+        self._data = data
+        self._count = count
+        self.compressed = compressed
+        self.nbytes = nbytes
+        self.raw_bytes = raw_bytes
+
+    @classmethod
+    def encode(cls, rows, compress_min_bytes=None):
+        columns = list(rows[0].keys()) if rows else []
+        data = [[row.get(c) for row in rows] for c in columns]
+        nbytes = _estimate_columns(columns, data)
+        raw_bytes = _estimate_rows(rows)
+        threshold = _options["compress_min_bytes"] if compress_min_bytes is None else compress_min_bytes
+        shape = tuple(columns)
+        if threshold is not None and nbytes >= threshold and shape not in _unpicklable_shapes:
+            data = [_python_values(values) for values in data]
+            try:
+                blob = zlib.compress(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL), _options["compress_level"])
+            except Exception:
+                blob = None  # ainda não serializável: não tenta de novo para este formato de linha
+                if len(_unpicklable_shapes) >= _MAX_UNPICKLABLE_SHAPES:
+                    _unpicklable_shapes.clear()
+                _unpicklable_shapes.add(shape)
+            if blob is not None and len(blob) < nbytes:
+                return cls(columns, blob, len(rows), True, len(blob), raw_bytes)
+        return cls(columns, data, len(rows), False, nbytes, raw_bytes)
+
+    def column_values(self):
+        if self.compressed:
+            return pickle.loads(zlib.decompress(self._data))
+        return self._data
+
+    def tuples(self):
+        if not self.columns:
+            return [() for _ in range(self._count)]
+        return list(zip(*self.column_values()))
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        columns = self.columns
+        for values in self.tuples():
+            yield dict(zip(columns, values))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [dict(zip(self.columns, values)) for values in self.tuples()[index]]
+        values = self.column_values()
+        return {c: col[index] for c, col in zip(self.columns, values)}
+
+
+_SAMPLE = 64
+_MAX_UNPICKLABLE_SHAPES = 1024
+_unpicklable_shapes = set()
+
+
+def _python_values(values):
+    """Coluna com valores do driver convertidos para tipos Python (a mesma lista, se já forem)."""
+    from wborm.converters import _PYTHON_TYPES, to_python
+
+    if all(v is None or isinstance(v, _PYTHON_TYPES) for v in values):
+        return values
+    return [to_python(v) for v in values]
+
+
+def _sampled_value_bytes(values, count):
+    """Tamanho estimado dos valores a partir de uma amostra (evita medir cada célula)."""
+    sample = values[:_SAMPLE]
+    if not sample:
+        return 0
+    return sum(sys.getsizeof(v) for v in sample if v is not None) * count // len(sample)
+
+
+def _estimate_columns(columns, data):
+    size = sys.getsizeof(data) + sum(sys.getsizeof(c) for c in columns)
+    for values in data:
+        size += sys.getsizeof(values) + _sampled_value_bytes(values, len(values))
+    return size
+
+
+def _estimate_rows(rows):
+    if not rows:
+        return sys.getsizeof(rows)
+    sample = rows[:_SAMPLE]
+    per_row = sum(
+        sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row.values() if v is not None)
+        for row in sample
+    ) / len(sample)
+    return sys.getsizeof(rows) + int(per_row * len(rows))
+
+
+_UNSET = object()
+
+
+def configure_cache(compress_min_bytes=None, compress_level=None, stale_grace=None,
+                    refresh_ahead=_UNSET, refresh_min_rate=None, flight_timeout=_UNSET):
+    """
+        Ajusta as opções do cache de resultados.
+
+        Forma de uso:
+        -------------
+        configure_cache(compress_min_bytes=64 * 1024)   # comprime entradas a partir de 64 KB
+        configure_cache(compress_min_bytes=0)           # comprime sempre
+
+        configure_cache(stale_grace=30)                 # serve o valor vencido por até 30s enquanto atualiza
+        configure_cache(refresh_ahead=0.8, refresh_min_rate=120)
+                                                        # atualiza antes de vencer (a 80% do TTL)
+                                                        # as entradas com 120+ acertos por minuto
+
+        Observações:
+        ------------
+        - Compressão: vale para as próximas entradas gravadas; as existentes não são recodificadas.
+        - `stale_grace` (segundos, 0 = desligado): após o TTL, a entrada continua sendo servida
+          durante a janela enquanto uma única thread em segundo plano refaz a consulta.
+        - `refresh_ahead` (fração do TTL, None = desligado): entradas quentes são atualizadas em
+          segundo plano antes de vencer, sem que nenhum chamador espere pelo banco.
+        - A atualização em segundo plano só acontece quando a consulta informa como se refazer
+          (o QuerySet usa uma conexão de `Model._pool`; sem pool, o comportamento é o TTL simples).
+        - `flight_timeout` (segundos, None = sem limite): quanto uma consulta idêntica espera pela
+          execução já em andamento (ver `single_flight`).
+        """
+    if compress_min_bytes is not None:
+        _options["compress_min_bytes"] = compress_min_bytes
+    if compress_level is not None:
+        _options["compress_level"] = compress_level
+    if stale_grace is not None:
+        _options["stale_grace"] = stale_grace
+    if refresh_ahead is not _UNSET:
+        _options["refresh_ahead"] = refresh_ahead
+    if refresh_min_rate is not None:
+        _options["refresh_min_rate"] = refresh_min_rate
+    if flight_timeout is not _UNSET:
+        _options["flight_timeout"] = flight_timeout
+    return dict(_options)
+
+
+def normalize_table_name(name):
+    """
+        Normaliza o nome de uma tabela para uso como chave de dependência.
+
+        Remove aspas, owner (`informix.clientes`) e banco (`db:clientes`, `db@srv:informix.clientes`).
+        """
+    name = str(name).strip().strip('"').lower()
+    name = name.split(":")[-1]
+    name = name.split(".")[-1]
+    return name.strip('"')
+
+
+def tables_in_sql(sql):
+    """
+        Extrai o conjunto de tabelas lidas ou escritas por uma instrução SQL.
+
+        Forma de uso:
+        -------------
+        tables_in_sql("SELECT * FROM clientes t1 JOIN pedidos AS t2 ON ...")
+
+        Retorna:
+        --------
+        {"clientes", "pedidos"}
+
+        Observações:
+        ------------
+        - Considera cláusulas FROM, JOIN, INTO e UPDATE, inclusive dentro de subqueries.
+        - Listas separadas por vírgula (`FROM a, b`) também são reconhecidas.
+        - Em caso de dúvida, prefere marcar uma tabela a mais (invalidação extra é inofensiva).
+        """
+    tables = set()
+    for _, chunk in _FROM_JOIN_RE.findall(sql or ""):
+        for item in chunk.split(","):
+            parts = item.split()
+            if not parts:
+                continue
+            name = normalize_table_name(parts[0])
+            if name and name not in _SQL_KEYWORDS:
+                tables.add(name)
+    return tables
+
+
+def cache_get(key, ttl, refresh=None):
+    """
+        Retorna os resultados armazenados para `key` se ainda estiverem dentro do TTL.
+        Caso contrário retorna None.
+
+        Com `refresh` (função sem argumentos que refaz a consulta e retorna as linhas):
+        - dentro de `stale_grace` após o TTL, retorna o valor vencido e agenda a atualização;
+        - com `refresh_ahead`, entradas acessadas `refresh_min_rate`+ vezes por minuto são
+          atualizadas quando passam dessa fração do TTL.
+        Só uma atualização por chave roda de cada vez.
+        """
+    with _lock:
+        entry = _query_result_cache.get(key)
+        if entry is None:
+            _stats["misses"] += 1
+            return None
+        results, timestamp, tables = entry
+        age = time.time() - timestamp
+        if age >= ttl:
+            if refresh is None or age >= ttl + _options["stale_grace"]:
+                _stats["misses"] += 1
+                return None
+            _stats["stale_hits"] += 1
+            _schedule_refresh(key, refresh, tables)
+            return results
+        _stats["hits"] += 1
+        hits = _entry_hits[key] = _entry_hits.get(key, 0) + 1
+        ahead = _options["refresh_ahead"]
+        if refresh is not None and ahead is not None and age >= ttl * ahead:
+            if hits * 60 / max(age, 1) >= _options["refresh_min_rate"]:
+                _schedule_refresh(key, refresh, tables)
+        return results
+
+
+def _schedule_refresh(key, refresh, tables):
+    """Dispara (uma vez por chave) a atualização da entrada em uma thread em segundo plano."""
+    if key in _refreshing:
+        return
+    _refreshing.add(key)
+    versions = {t: _table_versions.get(t, 0) for t in tables}
+    threading.Thread(
+        target=_run_refresh, args=(key, refresh, tables, versions), daemon=True, name="wborm-refresh"
+    ).start()
+
+
+def _run_refresh(key, refresh, tables, versions):
+    try:
+        results = refresh()
+    except Exception:
+        with _lock:
+            _stats["refresh_errors"] += 1
+        return
+    finally:
+        with _lock:
+            _refreshing.discard(key)
+    # uma escrita durante a atualização torna o resultado suspeito: cache_set descarta
+    if cache_set(key, results, tables, versions=versions):
+        with _lock:
+            _stats["refreshes"] += 1
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def single_flight(key, func, timeout=_UNSET):
+    """
+        Executa `func()` uma única vez por `key` entre chamadas concorrentes.
+
+        Forma de uso:
+        -------------
+        rows = single_flight(cache_key, lambda: conn.execute_query(sql))
+
+        Observações:
+        ------------
+        - A primeira thread executa; as demais com a mesma chave esperam e recebem o mesmo resultado.
+        - Se a execução falhar, a mesma exceção é levantada em todas as threads que esperavam.
+        - Quem espera mais que `timeout` (padrão `flight_timeout`) recebe `TimeoutError`;
+          a execução original continua e ainda grava o resultado.
+        - Só agrupa chamadas simultâneas: nada é guardado após o término (isso é papel do cache).
+        """
+    with _lock:
+        flight = _in_flight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _in_flight[key] = _Flight()
+        else:
+            _stats["coalesced"] += 1
+
+    if not leader:
+        timeout = _options["flight_timeout"] if timeout is _UNSET else timeout
+        if not flight.done.wait(timeout):
+            raise TimeoutError(f"Consulta idêntica em andamento não terminou em {timeout}s.")
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    try:
+        flight.result = func()
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _lock:
+            _in_flight.pop(key, None)
+        flight.done.set()
+    return flight.result
+
+
+def cache_set(key, results, tables, versions=None):
+    """
+        Armazena os resultados de uma consulta marcando as tabelas das quais ela depende.
+
+        Listas de linhas (dicionários) são gravadas em formato colunar (`CachedRows`),
+        comprimidas a partir de `compress_min_bytes` (ver `configure_cache`).
+
+        Com `versions` (de `table_versions`, tirado antes de executar a consulta), não grava se
+        alguma tabela recebeu escrita nesse meio tempo: as linhas podem ser anteriores a ela.
+        Retorna True se gravou.
+        """
+    tables = frozenset(normalize_table_name(t) for t in tables)
+    if isinstance(results, list) and (not results or isinstance(results[0], dict)):
+        results = CachedRows.encode(results)
+    with _lock:
+        if versions is not None and any(_table_versions.get(t, 0) != v for t, v in versions.items()):
+            return False
+        _discard(key)
+        _entry_hits.pop(key, None)
+        _query_result_cache[key] = (results, time.time(), tables)
+        _account(results, 1)
+        for table in tables:
+            _cache_table_index.setdefault(table, set()).add(key)
+        _stats["stores"] += 1
+    return True
+
+
+def _discard(key):
+    entry = _query_result_cache.pop(key, None)
+    _entry_hits.pop(key, None)
+    if entry is None:
+        return False
+    _account(entry[0], -1)
+    for table in entry[2]:
+        keys = _cache_table_index.get(table)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del _cache_table_index[table]
+    return True
+
+
+def _account(results, sign):
+    if isinstance(results, CachedRows):
+        _sizes["bytes"] += sign * results.nbytes
+        _sizes["raw_bytes"] += sign * results.raw_bytes
+        _sizes["compressed_entries"] += sign * results.compressed
+
+
+def invalidate_tables(*tables):
+    """
+        Invalida as entradas do cache de consultas que dependem das tabelas informadas.
+
+        Forma de uso:
+        -------------
+        invalidate_tables("clientes")
+        invalidate_tables("pedidos", "itens_pedido")
+
+        Observações:
+        ------------
+        - Chamado automaticamente por `add`, `update`, `delete`, `bulk_add` e `insert_into`.
+        - Use manualmente após escritas feitas fora do wborm (ex: `conn.execute(...)`).
+        - Também avança a versão das tabelas (`table_version`), usada pelas relações cacheadas.
+        - Retorna a quantidade de entradas removidas.
+        """
+    removed = 0
+    with _lock:
+        for table in tables:
+            table = normalize_table_name(table)
+            _table_versions[table] = _table_versions.get(table, 0) + 1
+            keys = _cache_table_index.get(table)
+            for key in list(keys or ()):
+                removed += _discard(key)
+        _stats["invalidations"] += removed
+    return removed
+
+
+def table_versions(tables):
+    """Retrato `{tabela: versão}` das tabelas informadas (nomes normalizados)."""
+    with _lock:
+        return {t: _table_versions.get(t, 0) for t in (normalize_table_name(t) for t in tables)}
+
+
+def table_version(table):
+    """
+        Contador de escritas conhecidas pelo wborm em `table` (avança a cada `invalidate_tables`).
+        """
+    return _table_versions.get(normalize_table_name(table), 0)
+
+
+def clear_cache():
+    """
+        Remove todas as entradas do cache de consultas.
+        """
+    with _lock:
+        _query_result_cache.clear()
+        _cache_table_index.clear()
+        _entry_hits.clear()
+        for name in _sizes:
+            _sizes[name] = 0
+
+
+def cache_stats():
+    """
+        Retorna estatísticas do cache de consultas.
+
+        Gera estruturas como:
+        ---------------------
+        {"entries": 3, "tables": 2, "hits": 10, "misses": 4, "stores": 4, "invalidations": 1,
+         "stale_hits": 2, "refreshes": 2, "refresh_errors": 0, "coalesced": 12,
+         "bytes": 18200, "raw_bytes": 96400, "compressed_entries": 1}
+
+        Observações:
+        ------------
+        - `bytes`: tamanho estimado das entradas como estão armazenadas (colunar/comprimido).
+        - `raw_bytes`: tamanho estimado das mesmas linhas como lista de dicionários.
+        - `stale_hits`: acertos servidos vencidos (dentro de `stale_grace`) enquanto a entrada era atualizada.
+        - `coalesced`: consultas que aguardaram uma execução idêntica em andamento em vez de ir ao banco.
+        """
+    with _lock:
+        return {
+            "entries": len(_query_result_cache),
+            "tables": len(_cache_table_index),
+            **_stats,
+            **_sizes,
+        }
+
+
+__all__ = ["CachedRows", "configure_cache", "single_flight", "tables_in_sql", "invalidate_tables", "table_version", "table_versions", "clear_cache", "cache_stats"]
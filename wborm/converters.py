@@ -0,0 +1,436 @@
+import gc
+import re
+from contextlib import contextmanager
+from operator import itemgetter
+from datetime import date, datetime, time
+from decimal import Decimal
+from wborm.identity import current_identity_map
+
+_PYTHON_TYPES = (str, int, float, bool, Decimal, datetime, date, time)
+_CONVERSION_ERRORS = (ValueError, TypeError, ArithmeticError)
+_converter_cache = {}
+_hydration_plans = {}
+_ALIAS_COLUMN = re.compile(r"t\d+_")
+_MAX_HYDRATION_PLANS = 1024
+_GC_PAUSE_MIN_ROWS = 2000
+
+
+def _parse_datetime(text):
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        # Informix/JDBC em Pythons antigos: "2024-01-31 10:20:30.5" (fração com menos de 6 dígitos)
+        base, _, fraction = text.strip().partition(".")
+        value = datetime.strptime(base, "%Y-%m-%d %H:%M:%S" if " " in base else "%Y-%m-%d")
+        return value.replace(microsecond=int((fraction + "000000")[:6])) if fraction else value
+
+
+def to_str(value):
+    if value is None or value.__class__ is str:
+        return value
+    return str(value)
+
+
+def to_int(value):
+    if value is None or value.__class__ is int:
+        return value
+    try:
+        return int(value) if isinstance(value, (int, float)) else int(Decimal(str(value)))
+    except _CONVERSION_ERRORS:
+        return value
+
+
+def to_float(value):
+    if value is None or value.__class__ is float:
+        return value
+    try:
+        return float(value) if isinstance(value, (int, float, Decimal)) else float(str(value))
+    except _CONVERSION_ERRORS:
+        return value
+
+
+def to_decimal(value):
+    if value is None or value.__class__ is Decimal:
+        return value
+    try:
+        return Decimal(str(value))
+    except _CONVERSION_ERRORS:
+        return value
+
+
+def to_datetime(value):
+    if value is None or value.__class__ is datetime:
+        return value
+    if value.__class__ is date:
+        return datetime(value.year, value.month, value.day)
+    try:
+        return _parse_datetime(str(value))
+    except _CONVERSION_ERRORS:
+        return value
+
+
+def to_date(value):
+    if value is None or value.__class__ is date:
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    try:
+        return _parse_datetime(str(value)[:10]).date()
+    except _CONVERSION_ERRORS:
+        return value
+
+
+def to_bool(value):
+    if value is None or value.__class__ is bool:
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    return str(value).strip().lower() in ("1", "t", "true")
+
+
+_JAVA_CONVERTERS = {
+    "java.lang.String": to_str,
+    "java.math.BigDecimal": to_decimal,
+    "java.sql.Timestamp": to_datetime,
+    "java.sql.Date": to_date,
+    "java.lang.Boolean": to_bool,
+}
+
+
+def to_python(value):
+    """Conversor genérico para colunas sem tipo conhecido: só atua sobre valores Java."""
+    if value is None or isinstance(value, _PYTHON_TYPES):
+        return value
+    converter = _JAVA_CONVERTERS.get(type(value).__name__)
+    return converter(value) if converter else str(value)
+
+
+_TYPE_CONVERTERS = {
+    str: to_str,
+    int: to_int,
+    float: to_float,
+    Decimal: to_decimal,
+    datetime: to_datetime,
+    date: to_date,
+    bool: to_bool,
+}
+
+
+# Tipos que cada conversor devolve sem alterar (o valor pode ser copiado direto)
+_NATIVE = {
+    to_str: (str,),
+    to_int: (int,),
+    to_float: (float,),
+    to_decimal: (Decimal,),
+    to_datetime: (datetime,),
+    to_date: (date,),
+    to_bool: (bool,),
+}
+
+
+def converter_for(field_type):
+    """
+        Retorna a função especializada que converte valores JDBC para `field_type`.
+
+        Valores que não puderem ser convertidos são mantidos como vieram do driver.
+        """
+    return _TYPE_CONVERTERS.get(field_type, to_python)
+
+
+def _fields_of(model):
+    fields = getattr(model, "_fields", None)
+    return fields if isinstance(fields, dict) else {}
+
+
+def _field_for_key(key, model, join_models):
+    fields = _fields_of(model)
+    if key in fields:
+        return fields[key]
+    alias, sep, column = key.partition("_")
+    if sep and alias[:1] == "t" and alias[1:].isdigit():
+        target = model if alias == "t1" else join_models.get(alias)
+        if target is not None:
+            return _fields_of(target).get(column)
+    return None
+
+
+def build_converters(model, keys, join_models=None):
+    """
+        Monta, uma vez por forma de consulta, a lista de conversores por coluna.
+
+        Forma de uso:
+        -------------
+        converters = build_converters(Cliente, ["id", "nome", "saldo"])
+        # [("id", to_int), ("nome", to_str), ("saldo", to_decimal)]
+
+        Observações:
+        ------------
+        - O tipo vem do `Field.field_type` (introspectado do Informix) de cada coluna.
+        - Colunas de joins (`t2_coluna`) usam o modelo registrado para o alias.
+        - Colunas sem campo correspondente (expressões, agregações) usam `to_python`.
+        - O resultado é cacheado por (modelo, colunas, modelos dos joins).
+        """
+    join_models = join_models or {}
+    cache_key = (model, tuple(keys), tuple(sorted((a, id(m)) for a, m in join_models.items())))
+    cached = _converter_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    converters = []
+    for key in keys:
+        field = _field_for_key(key, model, join_models)
+        converters.append((key, converter_for(field.field_type) if field is not None else to_python))
+
+    _converter_cache[cache_key] = converters
+    return converters
+
+
+def hydration_plan(model, raw_keys, join_models=None, joined=False, positional=False):
+    """
+        Plano de hidratação de uma forma de linha: gerado a partir da primeira linha e
+        reaproveitado para as demais linhas da mesma consulta.
+
+        Retorna `(valores_padrao, colunas, identidade, copia)`, onde `colunas` é uma tupla de
+        `(chave_bruta, atributo, conversor)` apenas com as colunas que sobrevivem ao filtro,
+        `identidade` traz `(chave_bruta, conversor)` da chave primária quando a linha contém
+        todos os campos do modelo (senão None: a instância não entra no mapa de identidade) e
+        `copia` diz como copiar os valores brutos de uma vez: "row" (a linha já tem todos os
+        campos: `row.copy()`), None (`update` sobre os valores padrão) ou `(atributos, itemgetter)`
+        para linhas em tupla, com alias ou com colunas descartadas.
+
+        Observações:
+        ------------
+        - Com `joined=True`, só as colunas `tX_coluna` são mantidas (as demais são descartadas no plano).
+        - `positional=True` usa o índice da coluna como chave bruta (linhas em tupla).
+        - O mapeamento `str(chave)` → atributo é feito aqui, uma vez por forma, e não por linha.
+        - O plano é cacheado por forma de consulta: (modelo, chaves da linha, modelos dos joins).
+        """
+    join_models = join_models or {}
+    cache_key = (model, tuple(raw_keys), joined, positional, tuple(sorted((a, id(m)) for a, m in join_models.items())))
+    plan = _hydration_plans.get(cache_key)
+    if plan is not None:
+        return plan
+
+    keys = [str(k) for k in raw_keys]
+    columns = tuple(
+        (index if positional else raw, key, conv)
+        for index, (raw, (key, conv)) in enumerate(zip(raw_keys, build_converters(model, keys, join_models)))
+        if not joined or _ALIAS_COLUMN.match(key)
+    )
+    fields = _fields_of(model)
+    by_attr = {key: (raw, conv) for raw, key, conv in columns}
+    pks = [name for name, field in fields.items() if field.primary_key]
+    identity = None
+    if pks and not joined and all(name in by_attr for name in fields):
+        identity = tuple(by_attr[name] for name in pks)
+
+    attrs = tuple(key for _, key, _ in columns)
+    if not positional and len(columns) == len(raw_keys) and all(raw == key for raw, key, _ in columns):
+        # a própria linha (dict) já tem as chaves dos atributos: copia a linha inteira
+        copy = "row" if all(name in by_attr for name in fields) else None
+    else:
+        raws = [raw for raw, _, _ in columns]
+        getter = itemgetter(*raws) if len(raws) > 1 else (lambda row, raw=raws[0] if raws else None: (row[raw],))
+        copy = (attrs, getter) if raws else ((), lambda row: ())
+    plan = (dict.fromkeys(fields), columns, identity, copy)
+
+    if len(_hydration_plans) >= _MAX_HYDRATION_PLANS:
+        _hydration_plans.clear()
+    _hydration_plans[cache_key] = plan
+    return plan
+
+
+@contextmanager
+def _gc_paused(count):
+    """
+        Pausa a coleta cíclica enquanto um lote grande é hidratado: cada linha aloca dicionários
+        (valores e snapshot) que disparariam várias coletas completas sobre objetos que não formam
+        ciclos. Lotes pequenos e GC já desligado passam direto.
+        """
+    if count < _GC_PAUSE_MIN_ROWS or not gc.isenabled():
+        yield
+        return
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+
+
+def _pending_converters(columns, first_row):
+    """
+        `(atributo, conversor)` das colunas que ainda precisam de conversão, decidido pela
+        primeira linha: se o valor já é do tipo que o conversor devolve, a coluna é só copiada.
+        Colunas NULL na primeira linha continuam com o conversor.
+        """
+    return tuple(
+        (key, conv)
+        for raw, key, conv in columns
+        if conv is not to_python and type(first_row[raw]) not in _NATIVE.get(conv, ())
+        or conv is to_python and (first_row[raw] is None or type(first_row[raw]) not in _PYTHON_TYPES)
+    )
+
+
+def hydrate(model, plan, rows):
+    """
+        Cria as instâncias de `model` aplicando o plano a cada linha, sem ramificações por célula.
+
+        Observações:
+        ------------
+        - Não passa por `Model.__init__`: os campos começam em None e os valores da linha são
+          copiados de uma vez (`dict.update`); só as colunas cujo valor ainda não é do tipo do
+          campo passam pelo conversor (o driver entrega um tipo fixo por coluna, então isso é
+          decidido pela primeira linha de cada chamada).
+        - Cada instância nasce "limpa" (com o snapshot usado por `dirty_fields`).
+        - Com um mapa de identidade ativo, linhas já conhecidas devolvem a instância existente
+          (só a chave primária é convertida).
+        """
+    if not rows:
+        return []
+    defaults, columns, identity, copy = plan
+    pending = _pending_converters(columns, rows[0])
+    attrs, getter = copy if isinstance(copy, tuple) else (copy, None)
+    imap = current_identity_map() if identity else None
+
+    if imap is None:
+        with _gc_paused(len(rows)):
+            return _fill(model, defaults, attrs, getter, pending, rows)
+
+    table = model.__tablename__
+    out = []
+    for row in rows:
+        obj = imap.get(table, tuple(conv(row[raw]) for raw, conv in identity))
+        if obj is None:
+            obj = imap.add(_fill(model, defaults, attrs, getter, pending, [row])[0])
+        out.append(obj)
+    return out
+
+
+def _fill(model, defaults, attrs, getter, pending, rows):
+    """Laço quente de `hydrate`: cópia em bloco dos valores e só as conversões pendentes."""
+    new = model.__new__
+    copy_defaults = defaults.copy
+    out = []
+    append = out.append
+    if attrs == "row":
+        for row in rows:
+            values = row.copy()
+            for key, conv in pending:
+                values[key] = conv(values[key])
+            obj = new(model)
+            values["_original"] = values.copy()
+            obj.__dict__ = values
+            append(obj)
+    elif getter is None:
+        for row in rows:
+            values = copy_defaults()
+            values.update(row)
+            for key, conv in pending:
+                values[key] = conv(values[key])
+            obj = new(model)
+            values["_original"] = values.copy()
+            obj.__dict__ = values
+            append(obj)
+    else:
+        for row in rows:
+            values = copy_defaults()
+            values.update(zip(attrs, getter(row)))
+            for key, conv in pending:
+                values[key] = conv(values[key])
+            obj = new(model)
+            values["_original"] = values.copy()
+            obj.__dict__ = values
+            append(obj)
+    return out
+
+
+def split_plan(alias_models, raw_keys):
+    """
+        Plano para separar linhas de um join em uma instância por alias.
+
+        Retorna uma lista `(alias, modelo, valores_padrao, colunas_pk, colunas)`, com
+        `colunas` no formato `(chave_bruta, atributo, conversor)` e `colunas_pk` com as
+        chaves brutas da chave primária (vazia se o modelo não tiver PK: sem identidade,
+        cada linha gera sua própria instância).
+        """
+    by_name = {str(k): k for k in raw_keys}
+    plan = []
+    for alias, model in alias_models.items():
+        fields = _fields_of(model)
+        columns = tuple(
+            (by_name[f"{alias}_{name}"], name, converter_for(field.field_type))
+            for name, field in fields.items()
+            if f"{alias}_{name}" in by_name
+        )
+        if not columns:
+            continue
+        pk_names = [name for name, field in fields.items() if field.primary_key]
+        pk_columns = tuple(raw for raw, name, _ in columns if name in pk_names)
+        plan.append((alias, model, dict.fromkeys(fields), pk_columns, columns))
+    return plan
+
+
+def hydrate_split(plan, rows):
+    """
+        Cria uma instância por alias em cada linha de um join, reaproveitando instâncias já
+        vistas (mesma chave primária) e ligando o alias principal aos demais.
+
+        Retorna a lista de instâncias do primeiro alias do plano, sem repetições e na ordem
+        em que aparecem. Cada instância recebe `_joined = {alias: [instâncias ligadas]}`.
+
+        Observações:
+        ------------
+        - Linhas de LEFT JOIN sem correspondência (todas as colunas nulas) não geram instância.
+        - Modelos sem chave primária não são deduplicados: linhas idênticas são registros
+          distintos, então cada linha gera uma instância.
+        - A chave é lida dos valores brutos: colunas de um pai repetido não são convertidas de novo.
+        - Com um mapa de identidade ativo, cada instância nova é trocada pela canônica (se houver).
+        """
+    if not plan:
+        return []
+    imap = current_identity_map()
+    identities = [{} for _ in plan]
+    links = set()
+    roots = []
+    root_alias = plan[0][0]
+
+    for row in rows:
+        instances = []
+        for (alias, model, defaults, pk_columns, columns), seen in zip(plan, identities):
+            key = tuple(row[raw] for raw in pk_columns)
+            obj = seen.get(key) if pk_columns else None
+            if obj is None:
+                if all(row[raw] is None for raw, _, _ in columns):
+                    instances.append(None)
+                    continue
+                values = defaults.copy()
+                for raw, name, conv in columns:
+                    values[name] = conv(row[raw])
+                obj = model.__new__(model)
+                values["_original"] = values.copy()
+                values["_joined"] = {}
+                obj.__dict__ = values
+                if imap is not None:
+                    canonical = imap.add(obj)
+                    if canonical is not obj:
+                        canonical.__dict__["_joined"] = {}
+                        obj = canonical
+                if pk_columns:
+                    seen[key] = obj
+                if alias == root_alias:
+                    roots.append(obj)
+            instances.append(obj)
+
+        root = instances[0]
+        if root is None:
+            continue
+        for (alias, *_), child in zip(plan[1:], instances[1:]):
+            if child is None or (id(root), alias, id(child)) in links:
+                continue
+            links.add((id(root), alias, id(child)))
+            root._joined.setdefault(alias, []).append(child)
+            child._joined.setdefault(root_alias, []).append(root)
+    return roots
+
+
+__all__ = ["converter_for", "build_converters", "hydration_plan", "hydrate", "split_plan", "hydrate_split", "to_python"]
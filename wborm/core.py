@@ -1,8 +1,108 @@
+import time
+from wborm import stats
 from wborm.fields import Field
 from wborm.query import QuerySet
+from wborm.cache import invalidate_tables, table_version
+from wborm.identity import current_identity_map
 from termcolor import cprint
 from tabulate import tabulate
 
+def _format_value(value):
+    """Formata um valor Python como literal SQL (mesma convenção de `add`/`update`)."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "'t'" if value else "'f'"  # literal BOOLEAN do Informix
+    escaped = str(value).replace("'", "''")
+    return f"'{escaped}'"
+
+
+def _sql_type_for(field_type):
+    """Tipo SQL (Informix) usado para colunas criadas a partir do tipo Python de um `Field`."""
+    from datetime import date, datetime
+    from decimal import Decimal
+
+    if field_type is bool:
+        return "BOOLEAN"
+    if field_type is int:
+        return "INT8"
+    if field_type is float:
+        return "FLOAT"
+    if field_type is Decimal:
+        return "DECIMAL(32)"
+    if field_type is datetime:
+        return "DATETIME YEAR TO FRACTION(5)"
+    if field_type is date:
+        return "DATE"
+    return "LVARCHAR(4096)"
+
+
+def _json_default(value):
+    """Serialização JSON dos tipos que os conversores produzem e o `json` não conhece."""
+    from datetime import date, time as time_of_day
+    from decimal import Decimal
+
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (date, time_of_day)):
+        return value.isoformat()
+    return str(value)
+
+
+def _insert_rows(conn, table, columns, types, rows, batch_size=500):
+    """
+        Insere `rows` (tuplas na ordem de `columns`) em lotes, sem uma ida ao banco por linha.
+
+        Gera comandos como:
+        -------------------
+        Com cursor DB-API (`conn.cursor()`):  executemany("INSERT INTO t (a, b) VALUES (?, ?)", lote)
+        Sem cursor:
+            INSERT INTO t (a, b)
+                SELECT '1', 'x' FROM systables WHERE tabid = 1
+                UNION ALL SELECT '2', CAST(NULL AS LVARCHAR(4096)) FROM systables WHERE tabid = 1
+
+        Observações:
+        ------------
+        - `types` (tipos SQL das colunas) tipa os NULLs do UNION ALL.
+        - Retorna a quantidade de linhas enviadas.
+        """
+    column_list = ", ".join(columns)
+    cursor = conn.cursor() if hasattr(conn, "cursor") else None
+    total = 0
+
+    def send(batch):
+        if cursor is not None:
+            placeholders = ", ".join("?" for _ in columns)
+            start = time.perf_counter()
+            cursor.executemany(f"INSERT INTO {table} ({column_list}) VALUES ({placeholders})", batch)
+            stats.record(f"INSERT INTO {table} ({column_list}) VALUES ({placeholders})",
+                         time.perf_counter() - start, len(batch))
+            return
+        selects = [
+            "SELECT " + ", ".join(
+                _format_value(v) if v is not None else f"CAST(NULL AS {t})" for v, t in zip(values, types)
+            ) + " FROM systables WHERE tabid = 1"
+            for values in batch
+        ]
+        stats.timed_write(conn, f"INSERT INTO {table} ({column_list}) " + " UNION ALL ".join(selects))
+
+    try:
+        batch = []
+        for values in rows:
+            batch.append(tuple(values))
+            if len(batch) >= batch_size:
+                send(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            send(batch)
+            total += len(batch)
+    finally:
+        if cursor is not None:
+            cursor.close()
+    return total
+
+
 class lazy_property:
     def __init__(self, func):
         self.func = func
@@ -15,6 +115,42 @@ class lazy_property:
             setattr(obj, self.attr_name, self.func(obj))
         return getattr(obj, self.attr_name)
 
+
+class cached_relation(lazy_property):
+    """
+        `lazy_property` para relações geradas a partir de FKs: o resultado fica em
+        `_lazy_<nome>` e é descartado quando o valor da chave (`key_attr`) muda ou quando
+        a tabela alvo recebe escritas pelo wborm (`invalidate_tables`).
+
+        Forma de uso:
+        -------------
+        Pedido.cliente = cached_relation(getter, "cliente", "cliente_id", "clientes")
+        pedido.cliente.nome   # consulta uma vez
+        pedido.cliente.nome   # reaproveita
+
+        Observações:
+        ------------
+        - `obj.invalidate_lazy("cliente")` ou `ResultSet.invalidate_lazy()` forçam nova consulta.
+        """
+
+    def __init__(self, func, name, key_attr, table):
+        super().__init__(func)
+        self.attr_name = f"_lazy_{name}"
+        self.key_attr = key_attr
+        self.table = table
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        stamp = (getattr(obj, self.key_attr, None), table_version(self.table))
+        cached = obj.__dict__.get(self.attr_name)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        value = self.func(obj)
+        obj.__dict__[self.attr_name] = (stamp, value)
+        return value
+
+
 class ModelMeta(type):
     def __new__(cls, name, bases, attrs):
         fields = {str(k): v for k, v in attrs.items() if isinstance(v, Field)}
@@ -32,6 +168,11 @@ class Model(metaclass=ModelMeta):
     __tablename__ = None
     _connection = None
     _relations = {}
+    _indexes = []
+    _pool = None
+    _fragments = None
+    _pk_cache_size = 1024
+    _pk_cache_ttl = 60
 
     def __init__(self, **kwargs):
         for field in self._fields:
@@ -79,10 +220,11 @@ class Model(metaclass=ModelMeta):
             Observações:
             ------------
             - Utiliza os dados de `to_dict()`.
+            - DECIMAL vira texto (sem perder casas) e DATE/DATETIME viram ISO 8601 (`isoformat()`).
             - Ideal para exportar objetos como JSON em APIs ou logs.
             """
         import json
-        return json.dumps(self.to_dict())
+        return json.dumps(self.to_dict(), default=_json_default)
 
     def as_dict(self, deep=False):
         """
@@ -208,6 +350,52 @@ class Model(metaclass=ModelMeta):
             return table
         print(table)
 
+    def _insert_columns(self):
+        """
+            Colunas enviadas no INSERT: todas, menos as da chave primária sem valor. Colunas
+            SERIAL são geradas pelo banco quando omitidas (o Informix recusa NULL nelas).
+            """
+        return [k for k, f in self._fields.items() if not (f.primary_key and getattr(self, k, None) is None)]
+
+    def _mark_clean(self):
+        self.__dict__["_original"] = {k: self.__dict__.get(k) for k in self._fields}
+
+    @property
+    def dirty_fields(self):
+        """
+            Lista os campos alterados desde que o objeto foi carregado do banco.
+
+            Forma de uso:
+            -------------
+            cliente = Cliente.filter(id=1).first()
+            cliente.nome = "Novo nome"
+            cliente.dirty_fields   # ["nome"]
+
+            Observações:
+            ------------
+            - Objetos carregados por consultas guardam um snapshot dos valores lidos.
+            - Para objetos criados manualmente (sem snapshot), considera todos os campos não-nulos.
+            """
+        original = self.__dict__.get("_original")
+        if original is None:
+            return [k for k in self._fields if getattr(self, k, None) is not None]
+        return [k for k in self._fields if getattr(self, k, None) != original.get(k)]
+
+    @property
+    def is_dirty(self):
+        return bool(self.dirty_fields)
+
+    def joined(self, alias):
+        """
+            Retorna as instâncias ligadas a este objeto por um join com `split_joins()`.
+
+            Forma de uso:
+            -------------
+            cliente = Cliente.filter(id=1).join(Pedido, "cliente_id").split_joins().all()[0]
+            cliente.joined("t2")   # [<Pedido>, <Pedido>, ...]
+            """
+        return self.__dict__.get("_joined", {}).get(alias, [])
+
     def invalidate_lazy(self, attr):
         """
             Remove o cache de um atributo calculado de forma preguiçosa (lazy).
@@ -369,6 +557,7 @@ class Model(metaclass=ModelMeta):
             Observações:
             ------------
             - Requer confirmação explícita com `confirm=True` para evitar inserções acidentais.
+            - Colunas da chave primária sem valor ficam fora do INSERT (SERIAL gerado pelo banco).
             - Executa `validate()` automaticamente antes de salvar.
             - Realiza `BEGIN WORK` e `COMMIT WORK` para controle transacional.
             - Em caso de falha, executa `ROLLBACK WORK` e exibe erro no terminal.
@@ -380,12 +569,16 @@ class Model(metaclass=ModelMeta):
         self.validate()
         try:
             self._connection.execute("BEGIN WORK")
-            keys = list(self._fields.keys())
+            keys = self._insert_columns()
             values = [getattr(self, k) for k in keys]
             placeholders = ", ".join(f"'{v}'" if v is not None else "NULL" for v in values)
             sql = f"INSERT INTO {self.__tablename__} ({', '.join(keys)}) VALUES ({placeholders})"
-            self._connection.execute(sql)
+            stats.timed_write(self._connection, sql)
             self._connection.execute("COMMIT WORK")
+            invalidate_tables(self.__tablename__)
+            self._mark_clean()
+            if current_identity_map() is not None:
+                current_identity_map().add(self)
             cprint(f"✔ Registro adicionado em {self.__tablename__}", "green")
         except Exception as e:
             self._connection.execute("ROLLBACK WORK")
@@ -419,20 +612,143 @@ class Model(metaclass=ModelMeta):
             return
         try:
             cls._connection.execute("BEGIN WORK")
-            keys = list(cls._fields.keys())
             for obj in objs:
                 obj.validate()
+                keys = obj._insert_columns()
                 values = [getattr(obj, k) for k in keys]
                 placeholders = ", ".join(f"'{v}'" if v is not None else "NULL" for v in values)
                 sql = f"INSERT INTO {cls.__tablename__} ({', '.join(keys)}) VALUES ({placeholders})"
-                cls._connection.execute(sql)
+                stats.timed_write(cls._connection, sql)
             cls._connection.execute("COMMIT WORK")
+            invalidate_tables(cls.__tablename__)
             cprint(f"✔ {len(objs)} registros adicionados em {cls.__tablename__}", "green")
         except Exception as e:
             cls._connection.execute("ROLLBACK WORK")
             cprint(f"✖ Falha no bulk_add de {cls.__tablename__}: {str(e)}", "red")
             raise
 
+    @classmethod
+    def bulk_load(cls, source, batch_size=1000, workers=1, confirm=False, queue_size=None,
+                  delimiter=",", encoding="utf-8"):
+        """
+            Carrega grandes volumes em streaming a partir de um CSV ou de qualquer iterável.
+
+            Forma de uso:
+            -------------
+            Cliente.bulk_load("clientes.csv", batch_size=5000, workers=2, confirm=True)
+            Cliente.bulk_load(({"id": i, "nome": n} for i, n in origem), confirm=True)
+
+            Parâmetros:
+            -----------
+            source : str ou iterável
+                Caminho de um CSV com cabeçalho, ou iterável de dicts, tuplas (na ordem de `_fields`) ou objetos do modelo.
+            batch_size : int
+                Registros por lote; cada lote é gravado em sua própria transação.
+            workers : int
+                Threads que leem, convertem (`Field.field_type`) e validam os lotes em paralelo às gravações.
+            queue_size : int, opcional
+                Lotes convertidos aguardando gravação (padrão: `2 * workers`). Limita o uso de memória.
+
+            Observações:
+            ------------
+            - Requer `confirm=True`.
+            - A memória fica limitada a `(queue_size + workers) * batch_size` registros, independente do tamanho da origem.
+            - Erros de conversão/validação informam o número da linha; lotes já gravados permanecem.
+            - Retorna a quantidade de registros carregados.
+            """
+        if not confirm:
+            raise ValueError("Confirmação necessária: bulk_load(confirm=True)")
+        from wborm.loader import bulk_load
+        return bulk_load(cls, source, batch_size=batch_size, workers=workers, queue_size=queue_size,
+                         delimiter=delimiter, encoding=encoding)
+
+    @classmethod
+    def bulk_upsert(cls, objs, key=None, confirm=False, temp_name=None, batch_size=500):
+        """
+            Insere ou atualiza vários registros com uma carga em tabela temporária e um único MERGE.
+
+            Forma de uso:
+            -------------
+            Cliente.bulk_upsert(clientes_do_feed, key=["id"], confirm=True)
+
+            Gera comandos como:
+            -------------------
+            CREATE TEMP TABLE tmp_upsert_clientes (id INT8, nome LVARCHAR(4096)) WITH NO LOG
+            INSERT INTO tmp_upsert_clientes (id, nome)
+                SELECT '1', 'João' FROM systables WHERE tabid = 1
+                UNION ALL SELECT '2', 'Maria' FROM systables WHERE tabid = 1      (lotes de `batch_size`)
+            MERGE INTO clientes AS t USING tmp_upsert_clientes AS s ON (t.id = s.id)
+                WHEN MATCHED THEN UPDATE SET nome = s.nome
+                WHEN NOT MATCHED THEN INSERT (id, nome) VALUES (s.id, s.nome)
+            DROP TABLE tmp_upsert_clientes
+
+            Observações:
+            ------------
+            - Requer `confirm=True`; cada objeto é validado com `validate()` durante a carga.
+            - `objs` pode ser qualquer iterável (lista ou gerador); as linhas são enviadas em lotes de
+              `batch_size` à medida que são lidas (`executemany` quando a conexão expõe um cursor DB-API).
+            - `key` define as colunas de correspondência (padrão: chaves primárias do modelo).
+            - Carga e MERGE rodam na mesma transação; em falha, executa `ROLLBACK WORK`.
+            - A tabela temporária é sempre descartada ao final.
+            - Retorna a quantidade de registros enviados.
+            """
+        if not confirm:
+            raise ValueError("Confirmação necessária: bulk_upsert(confirm=True)")
+
+        key = [key] if isinstance(key, str) else list(key or cls._primary_keys())
+        if not key:
+            raise ValueError("bulk_upsert requer as colunas de correspondência: ex. bulk_upsert(objs, key=['id'])")
+        unknown = [k for k in key if k not in cls._fields]
+        if unknown:
+            raise ValueError(f"Colunas de chave inexistentes em {cls.__tablename__}: {', '.join(unknown)}")
+
+        conn = cls._connection
+        table = cls.__tablename__
+        temp_name = temp_name or f"tmp_upsert_{table}"
+        keys = list(cls._fields.keys())
+        columns = ", ".join(keys)
+
+        cls._get_queryset().create_empty_temp_table(
+            temp_name,
+            [(name, _sql_type_for(field.field_type)) for name, field in cls._fields.items()],
+            as_model=False,
+        )
+
+        on_clause = " AND ".join(f"t.{k} = s.{k}" for k in key)
+        merge_sql = f"MERGE INTO {table} AS t USING {temp_name} AS s ON ({on_clause})"
+        non_key = [k for k in keys if k not in key]
+        if non_key:
+            merge_sql += " WHEN MATCHED THEN UPDATE SET " + ", ".join(f"{k} = s.{k}" for k in non_key)
+        merge_sql += f" WHEN NOT MATCHED THEN INSERT ({columns}) VALUES ({', '.join(f's.{k}' for k in keys)})"
+
+        types = [_sql_type_for(field.field_type) for field in cls._fields.values()]
+
+        def staged():
+            for obj in objs:
+                obj.validate()
+                yield [getattr(obj, k) for k in keys]
+
+        total = 0
+        try:
+            conn.execute("BEGIN WORK")
+            total = _insert_rows(conn, temp_name, keys, types, staged(), batch_size)
+            if total:
+                stats.timed_write(conn, merge_sql)
+            conn.execute("COMMIT WORK")
+            invalidate_tables(table)
+            cprint(f"✔ {total} registros sincronizados em {table} via MERGE", "green")
+        except Exception as e:
+            conn.execute("ROLLBACK WORK")
+            cprint(f"✖ Falha no bulk_upsert de {table}: {str(e)}", "red")
+            raise
+        finally:
+            try:
+                stats.timed_write(conn, f"DROP TABLE {temp_name}")
+            except Exception:
+                pass
+
+        return total
+
     def update(self, confirm=False, **kwargs):
         """
             Atualiza o registro atual no banco de dados com base em cláusulas WHERE explícitas.
@@ -451,7 +767,9 @@ class Model(metaclass=ModelMeta):
             ------------
             - `confirm=True` é obrigatório para evitar alterações não intencionais.
             - É necessário informar uma cláusula WHERE via `kwargs`.
-            - Todos os campos com valor não-nulo são incluídos na atualização.
+            - Objetos carregados do banco enviam apenas os campos alterados (`dirty_fields`).
+            - Se nada mudou, a atualização é ignorada sem ir ao banco.
+            - Objetos criados manualmente enviam todos os campos com valor não-nulo.
             - Executa `BEGIN WORK` e `COMMIT WORK` para garantir atomicidade.
             - Em caso de erro, executa `ROLLBACK WORK` e exibe mensagem de falha.
             - Chama `after_update()` após o sucesso.
@@ -460,13 +778,19 @@ class Model(metaclass=ModelMeta):
             raise ValueError("Confirmação necessária: update(confirm=True)")
         if not kwargs:
             raise ValueError("Update requer cláusula explícita: ex. update(confirm=True, id=1)")
+        changed = self.dirty_fields
+        if not changed:
+            cprint(f"ℹ Nenhuma alteração para gravar em {self.__tablename__}", "cyan")
+            return
         try:
             self._connection.execute("BEGIN WORK")
-            updates = [f"{k} = '{getattr(self, k)}'" for k in self._fields if getattr(self, k) is not None]
+            updates = [f"{k} = {_format_value(getattr(self, k))}" for k in changed]
             where_clause = " AND ".join(f"{k} = '{v}'" for k, v in kwargs.items())
             sql = f"UPDATE {self.__tablename__} SET {', '.join(updates)} WHERE {where_clause}"
-            self._connection.execute(sql)
+            stats.timed_write(self._connection, sql)
             self._connection.execute("COMMIT WORK")
+            invalidate_tables(self.__tablename__)
+            self._mark_clean()
             self.after_update()
             cprint(f"✔ Registro atualizado em {self.__tablename__} (WHERE {where_clause})", "yellow")
         except Exception as e:
@@ -501,8 +825,11 @@ class Model(metaclass=ModelMeta):
             self._connection.execute("BEGIN WORK")
             where_clause = " AND ".join(f"{k} = '{v}'" for k, v in kwargs.items())
             sql = f"DELETE FROM {self.__tablename__} WHERE {where_clause}"
-            self._connection.execute(sql)
+            stats.timed_write(self._connection, sql)
             self._connection.execute("COMMIT WORK")
+            invalidate_tables(self.__tablename__)
+            if current_identity_map() is not None:
+                current_identity_map().discard(self)
             cprint(f"✔ Registro deletado de {self.__tablename__} (WHERE {where_clause})", "red")
         except Exception as e:
             self._connection.execute("ROLLBACK WORK")
@@ -513,6 +840,10 @@ class Model(metaclass=ModelMeta):
     def _get_queryset(cls):
         return QuerySet(cls, cls._connection)
 
+    @classmethod
+    def _primary_keys(cls):
+        return [name for name, field in cls._fields.items() if field.primary_key]
+
     @classmethod
     def all(cls):
         """
@@ -528,6 +859,51 @@ class Model(metaclass=ModelMeta):
             """
         return cls._get_queryset().all()
 
+    @classmethod
+    def get(cls, pk):
+        """
+            Busca um registro pela chave primária, sem montar um QuerySet.
+
+            Forma de uso:
+            -------------
+            cliente = Cliente.get(10)
+            item = ItemPedido.get((500, 3))      # chave composta, na ordem dos campos
+
+            Gera cláusulas como:
+            --------------------
+            SELECT id, nome, status FROM clientes WHERE id = '10'
+
+            Observações:
+            ------------
+            - Retorna None quando o registro não existe.
+            - A SQL base é montada uma vez por modelo; chaves repetidas são servidas de um cache
+              LRU por modelo (`_pk_cache_size` entradas, `_pk_cache_ttl` segundos), invalidado
+              pelas escritas do wborm na tabela.
+            """
+        from wborm.lookup import get
+        return get(cls, pk)
+
+    @classmethod
+    def get_many(cls, pks, chunk_size=1000):
+        """
+            Busca vários registros pela chave primária em lotes IN.
+
+            Forma de uso:
+            -------------
+            clientes = Cliente.get_many([1, 2, 3])      # {1: <Cliente>, 2: <Cliente>, 3: <Cliente>}
+
+            Gera cláusulas como:
+            --------------------
+            SELECT id, nome, status FROM clientes WHERE id IN ('1', '2', '3')
+
+            Observações:
+            ------------
+            - Retorna `{chave: instância}` na ordem pedida; chaves inexistentes ficam de fora.
+            - Só as chaves ausentes do cache de chaves primárias vão ao banco, em lotes de `chunk_size`.
+            """
+        from wborm.lookup import get_many
+        return get_many(cls, pks, chunk_size=chunk_size)
+
     @classmethod
     def filter(cls, *args, **kwargs):
         """
@@ -729,7 +1105,7 @@ class Model(metaclass=ModelMeta):
 
             Gera cláusulas como:
             --------------------
-            SELECT FIRST 1 1 FROM (...)
+            SELECT FIRST 1 1 AS existe FROM clientes t1 WHERE ...
             """
         return cls._get_queryset().exists()
 
@@ -0,0 +1,218 @@
+import os
+import re
+import tempfile
+
+_QUERY_HEADER = re.compile(r"^QUERY:", re.MULTILINE)
+_SUBQUERY_HEADER = re.compile(r"^\s*Subquery:\s*$", re.MULTILINE)
+_COST = re.compile(r"Estimated Cost:\s*(\d+)")
+_ROWS = re.compile(r"Estimated # of Rows Returned:\s*(\d+)")
+_STEP = re.compile(r"^\s*(\d+)\)\s+(\S+?):\s+(.+?)\s*$")
+_INDEX_NAME = re.compile(r"Index Name:\s*(\S+)")
+_INDEX_KEYS = re.compile(r"Index Keys:\s*(.+?)(?:\s+\(|\s*$)")
+_FILTER = re.compile(r"^\s*((?:Lower |Upper )?Index Filter|Filters):\s*(.+?)\s*$")
+_JOIN = re.compile(r"^\s*((?:NESTED LOOP|DYNAMIC HASH|MERGE|SORT MERGE)(?: \w+)*? JOIN)", re.MULTILINE)
+
+
+class PlanStep:
+    """Um passo do plano: tabela acessada, tipo de acesso e índice usado (se houver)."""
+
+    def __init__(self, order, table, access, index=None, index_keys=None, filters=None):
+        self.order = order
+        self.table = table
+        self.access = access
+        self.index = index
+        self.index_keys = index_keys or []
+        self.filters = filters or []
+
+    @property
+    def is_sequential(self):
+        return "SEQUENTIAL" in self.access
+
+    def to_dict(self):
+        return {
+            "order": self.order,
+            "table": self.table,
+            "access": self.access,
+            "index": self.index,
+            "index_keys": self.index_keys,
+            "filters": self.filters,
+        }
+
+    def __repr__(self):
+        via = f" via {self.index}" if self.index else ""
+        return f"<PlanStep {self.order}) {self.table}: {self.access}{via}>"
+
+
+class QueryPlan:
+    """
+        Plano de execução do Informix (saída de `SET EXPLAIN`) em forma estruturada.
+
+        Atributos:
+        ----------
+        - `cost`: custo estimado pelo otimizador.
+        - `rows`: quantidade estimada de linhas retornadas.
+        - `steps`: lista de `PlanStep`, na ordem de junção escolhida.
+        - `join_order`: tabelas na ordem em que são lidas.
+        - `joins`: métodos de junção (NESTED LOOP JOIN, DYNAMIC HASH JOIN, ...).
+        - `subqueries`: planos das seções `Subquery:` do mesmo bloco.
+        - `raw`: texto original do plano.
+        """
+
+    def __init__(self, sql=None, cost=None, rows=None, steps=None, joins=None, raw="", subqueries=None):
+        self.sql = sql
+        self.cost = cost
+        self.rows = rows
+        self.steps = steps or []
+        self.joins = joins or []
+        self.raw = raw
+        self.subqueries = subqueries or []
+
+    @property
+    def join_order(self):
+        return [step.table for step in self.steps]
+
+    @property
+    def sequential_scans(self):
+        return [step.table for step in self.steps if step.is_sequential]
+
+    def to_dict(self):
+        return {
+            "cost": self.cost,
+            "rows": self.rows,
+            "join_order": self.join_order,
+            "joins": self.joins,
+            "steps": [step.to_dict() for step in self.steps],
+            "subqueries": [plan.to_dict() for plan in self.subqueries],
+        }
+
+    def show(self):
+        """Exibe o plano no terminal, destacando leituras sequenciais."""
+        from termcolor import cprint
+
+        cprint(f"📐 Custo estimado: {self.cost}  |  Linhas estimadas: {self.rows}", "cyan")
+        for step in self.steps:
+            via = f" ({step.index}: {', '.join(step.index_keys)})" if step.index else ""
+            color = "red" if step.is_sequential else "green"
+            cprint(f"  {step.order}) {step.table}: {step.access}{via}", color)
+            for condition in step.filters:
+                print(f"       {condition}")
+        for join in self.joins:
+            cprint(f"  ↳ {join}", "yellow")
+
+    def __repr__(self):
+        return f"<QueryPlan cost={self.cost} rows={self.rows} order={self.join_order}>"
+
+
+def _parse_block(block):
+    parts = _SUBQUERY_HEADER.split(block)
+    plan = _parse_section(parts[0])
+    plan.subqueries = [_parse_section(part) for part in parts[1:]]
+    plan.raw = block
+    return plan
+
+
+def _parse_section(block):
+    cost = _COST.search(block)
+    rows = _ROWS.search(block)
+    sql = block.split("\n\n", 1)[0].split("\n", 1)[-1].strip().lstrip("-").strip() or None
+
+    steps = []
+    current = None
+    for line in block.splitlines():
+        match = _STEP.match(line)
+        if match:
+            current = PlanStep(int(match.group(1)), match.group(2), match.group(3).strip())
+            steps.append(current)
+            continue
+        if current is None:
+            continue
+        if current.index is None:
+            index = _INDEX_NAME.search(line)
+            if index:
+                current.index = index.group(1)
+                continue
+        keys = _INDEX_KEYS.search(line)
+        if keys and not current.index_keys:
+            current.index_keys = keys.group(1).split()
+            continue
+        condition = _FILTER.match(line)
+        if condition:
+            current.filters.append(f"{condition.group(1)}: {condition.group(2)}")
+
+    return QueryPlan(
+        sql=sql,
+        cost=int(cost.group(1)) if cost else None,
+        rows=int(rows.group(1)) if rows else None,
+        steps=steps,
+        joins=[j.strip() for j in _JOIN.findall(block)],
+        raw=block,
+    )
+
+
+def parse_explain(text):
+    """
+        Converte o texto gerado por `SET EXPLAIN` em um `QueryPlan`.
+
+        Observações:
+        ------------
+        - Quando o texto contém vários blocos QUERY (arquivo reaproveitado), usa o último.
+        - Seções `Subquery:` do bloco viram `QueryPlan`s em `subqueries`.
+        """
+    starts = [m.start() for m in _QUERY_HEADER.finditer(text or "")]
+    if not starts:
+        return QueryPlan(raw=text or "")
+    return _parse_block(text[starts[-1]:])
+
+
+def explain_query(conn, sql, path=None):
+    """
+        Executa `sql` sob `SET EXPLAIN ON AVOID_EXECUTE` e devolve o plano estruturado.
+
+        Gera comandos como:
+        -------------------
+        SET EXPLAIN FILE TO '/tmp/wborm_explain_xxx.out'
+        SET EXPLAIN ON AVOID_EXECUTE
+        SELECT ...
+        SET EXPLAIN OFF
+
+        Observações:
+        ------------
+        - O arquivo é gravado pelo servidor: `path` precisa ser visível para este processo
+          (servidor local ou diretório compartilhado).
+        - O Informix acrescenta ao arquivo existente: só o trecho gerado agora é lido.
+        - O arquivo temporário criado pelo wborm é removido após a leitura.
+        """
+    own_file = path is None
+    if own_file:
+        fd, path = tempfile.mkstemp(prefix="wborm_explain_", suffix=".out")
+        os.close(fd)
+        os.remove(path)
+    offset = os.path.getsize(path) if os.path.exists(path) else 0
+
+    try:
+        escaped = str(path).replace("'", "''")
+        conn.execute(f"SET EXPLAIN FILE TO '{escaped}'")
+        conn.execute("SET EXPLAIN ON AVOID_EXECUTE")
+        try:
+            conn.execute_query(sql)
+        finally:
+            conn.execute("SET EXPLAIN OFF")
+
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"Plano não encontrado em {path}. O arquivo de EXPLAIN é gravado no servidor; "
+                "informe explain(path=...) em um diretório visível para este processo."
+            )
+        with open(path, "rb") as f:
+            f.seek(offset)
+            text = f.read().decode("utf-8", errors="replace")
+    finally:
+        if own_file and os.path.exists(path):
+            os.remove(path)
+
+    plan = parse_explain(text)
+    plan.sql = sql
+    return plan
+
+
+__all__ = ["QueryPlan", "PlanStep", "parse_explain", "explain_query"]
@@ -0,0 +1,268 @@
+import csv
+import gzip
+import io
+import json
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+from wborm import stats
+
+_PLAIN_TYPES = (str, int, float, bool, Decimal, datetime, date)
+
+
+def _export_value(value):
+    if value is None or isinstance(value, _PLAIN_TYPES):
+        return value
+    return str(value)
+
+
+def _open_text(path, compression):
+    if compression is None and str(path).endswith(".gz"):
+        compression = "gzip"
+    if compression == "gzip":
+        return io.TextIOWrapper(gzip.open(path, "wb"), encoding="utf-8", newline="")
+    if compression is not None:
+        raise ValueError(f"Compressão não suportada: {compression}. Use 'gzip' ou None.")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _column_index(columns, row_keys):
+    """Casa a ordem de colunas compilada com as chaves reais da linha (sem diferenciar maiúsculas)."""
+    by_name = {str(k).lower(): k for k in row_keys}
+    keys = [by_name.get(c.lower()) for c in columns]
+    if any(k is None for k in keys):
+        return [str(k) for k in row_keys], list(row_keys)
+    return columns, keys
+
+
+def iter_chunks(queryset, chunk_size=5000):
+    """
+        Gera `(colunas, linhas)` em blocos, direto da camada de leitura, sem criar objetos do modelo.
+
+        - Se a conexão expõe um cursor DB-API (`conn.cursor()`), usa `fetchmany(chunk_size)`.
+        - Caso contrário, pagina pela chave primária (`WHERE pk > último ORDER BY pk FIRST n`):
+          cada página custa o mesmo, em vez de reler e pular as linhas anteriores.
+        - Sem chave utilizável (raw_sql, GROUP BY/DISTINCT, `order_by()` diferente da PK, modelo
+          sem PK), pagina com `SKIP/FIRST`; sem nenhuma ordem estável, emite um aviso.
+        """
+    conn = queryset.conn
+    if hasattr(conn, "cursor"):
+        cursor = conn.cursor()
+        sql = queryset._build_query()
+        elapsed = 0.0  # só o tempo no banco, sem o consumo de cada bloco
+        total = 0
+        try:
+            start = time.perf_counter()
+            cursor.execute(sql)
+            columns = [d[0] for d in cursor.description]
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                elapsed += time.perf_counter() - start
+                if not rows:
+                    break
+                total += len(rows)
+                yield columns, [tuple(r) for r in rows]
+                start = time.perf_counter()
+        finally:
+            cursor.close()
+        stats.record(sql, elapsed, total)
+        return
+
+    columns = queryset._output_columns()
+    pks = _keyset_columns(queryset)
+    if pks is None:
+        yield from _iter_skip_pages(queryset, conn, columns, chunk_size)
+        return
+
+    alias = getattr(queryset, "_table_alias", "t1")
+    page = queryset._clone()
+    page._order_by = [f"{alias}.{pk}" for pk in pks]
+    base_filters = list(page._filters)
+    pk_keys = [f"{alias}_{pk}" if page._joins else pk for pk in pks]
+    remaining = queryset._limit
+    offset = queryset._offset or 0
+    keys = row_pks = None
+    last = None
+
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        page._filters = base_filters + ([_after(alias, pks, last)] if last is not None else [])
+        page._offset = offset if last is None else None
+        page._limit = size
+        rows = stats.timed(conn, page._build_query())
+        if not rows:
+            break
+        if keys is None:
+            row_keys = list(rows[0].keys())
+            columns, keys = _column_index(columns, row_keys)
+            _, row_pks = _column_index(pk_keys, row_keys)
+        yield columns, [tuple(row.get(k) for k in keys) for row in rows]
+        last = tuple(rows[-1].get(k) for k in row_pks)
+        if remaining is not None:
+            remaining -= len(rows)
+        if len(rows) < size:
+            break
+
+
+def _keyset_columns(queryset):
+    """
+        Chaves primárias usadas na paginação por chave (`WHERE pk > último ORDER BY pk`),
+        ou None quando a consulta não permite (raw_sql, agrupamento, ORDER BY próprio, sem PK).
+        """
+    if queryset._raw_sql or queryset._group_by or queryset._having or queryset._distinct:
+        return None
+    pks = queryset.model._primary_keys()
+    if not pks:
+        return None
+    if queryset._order_by:
+        alias = getattr(queryset, "_table_alias", "t1")
+        wanted = [[pk.lower(), f"{alias}.{pk}".lower()] for pk in pks]
+        given = [str(o).strip().lower() for o in queryset._order_by]
+        given = [g[:-4].strip() if g.endswith(" asc") else g for g in given]
+        if len(given) != len(pks) or any(g not in w for g, w in zip(given, wanted)):
+            return None
+    return pks
+
+
+def _after(alias, pks, last):
+    """Condição "depois da última chave lida": `(a > x) OR (a = x AND b > y)`."""
+    from wborm.core import _format_value
+
+    terms = []
+    for i, pk in enumerate(pks):
+        equal = [f"{alias}.{p} = {_format_value(v)}" for p, v in zip(pks[:i], last)]
+        terms.append("(" + " AND ".join(equal + [f"{alias}.{pk} > {_format_value(last[i])}"]) + ")")
+    return terms[0] if len(terms) == 1 else "(" + " OR ".join(terms) + ")"
+
+
+def _iter_skip_pages(queryset, conn, columns, chunk_size):
+    """Paginação com `SKIP/FIRST` para consultas sem chave primária utilizável."""
+    if not queryset._order_by and not queryset._raw_sql:
+        from termcolor import cprint
+        cprint(
+            f"⚠ {queryset.model.__tablename__}: sem chave primária nem order_by(), a paginação SKIP/FIRST "
+            "não tem ordem estável (linhas podem se repetir ou faltar). Defina order_by() com colunas únicas.",
+            "yellow",
+        )
+    keys = None
+    base_offset = queryset._offset or 0
+    remaining = queryset._limit
+    fetched = 0
+    page = queryset._clone()
+
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        page._offset = base_offset + fetched
+        page._limit = size
+        rows = stats.timed(conn, page._build_query())
+        if not rows:
+            break
+        if keys is None:
+            columns, keys = _column_index(columns, list(rows[0].keys()))
+        yield columns, [tuple(row.get(k) for k in keys) for row in rows]
+        fetched += len(rows)
+        if remaining is not None:
+            remaining -= len(rows)
+        if len(rows) < size:
+            break
+
+
+def to_csv(queryset, path, chunk_size=5000, compression=None, delimiter=",", header=True):
+    total = 0
+    with _open_text(path, compression) as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        wrote_header = not header
+        for columns, rows in iter_chunks(queryset, chunk_size):
+            if not wrote_header:
+                writer.writerow(columns)
+                wrote_header = True
+            writer.writerows(rows)
+            total += len(rows)
+        if not wrote_header:
+            writer.writerow(queryset._output_columns())
+    return total
+
+
+def to_jsonl(queryset, path, chunk_size=5000, compression=None):
+    total = 0
+    with _open_text(path, compression) as f:
+        for columns, rows in iter_chunks(queryset, chunk_size):
+            f.writelines(
+                json.dumps(dict(zip(columns, map(_export_value, row))), default=str, ensure_ascii=False) + "\n"
+                for row in rows
+            )
+            total += len(rows)
+    return total
+
+
+def _field_type(queryset, column):
+    """Tipo Python (`Field.field_type`) da coluna de saída, quando ela vem de um modelo conhecido."""
+    fields = getattr(queryset.model, "_fields", {})
+    if not queryset._joins:
+        field = fields.get(column)
+        return field.field_type if field is not None else None
+    alias, _, name = column.partition("_")
+    model = queryset.model if alias == getattr(queryset, "_table_alias", "t1") else queryset._alias_model(alias)
+    field = (getattr(model, "_fields", None) or {}).get(name)
+    return field.field_type if field is not None else None
+
+
+def _parquet_schema(pa, queryset, data):
+    """
+        Schema do arquivo a partir dos tipos dos campos do modelo, e não do primeiro bloco: uma coluna
+        toda NULL no primeiro bloco não pode virar tipo `null`.
+
+        Retorna `(schema, conversores)`: colunas de campos conhecidos passam pelo conversor do tipo;
+        as demais usam o tipo inferido do bloco ou, se ele for `null`, texto. DECIMAL vai como texto
+        (precisão e escala variam por coluna e não cabem num único decimal128 sem perda).
+        """
+    from wborm.converters import converter_for
+
+    by_type = {
+        bool: pa.bool_(), int: pa.int64(), float: pa.float64(), str: pa.string(),
+        datetime: pa.timestamp("us"), date: pa.date32(), Decimal: pa.string(),
+    }
+    fields, converters = [], {}
+    for column, values in data.items():
+        field_type = _field_type(queryset, column)
+        arrow_type = by_type.get(field_type)
+        if arrow_type is not None:
+            converters[column] = str if field_type is Decimal else converter_for(field_type)
+        else:
+            arrow_type = pa.array(values).type
+            if pa.types.is_null(arrow_type):
+                arrow_type = pa.string()
+                converters[column] = str
+        fields.append(pa.field(column, arrow_type))
+    return pa.schema(fields), converters
+
+
+def to_parquet(queryset, path, chunk_size=50000, compression="snappy"):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("to_parquet requer pyarrow: pip install wborm[parquet]")
+
+    total = 0
+    writer = None
+    converters = {}
+    try:
+        for columns, rows in iter_chunks(queryset, chunk_size):
+            data = {c: [_export_value(r[i]) for r in rows] for i, c in enumerate(columns)}
+            if writer is None:
+                schema, converters = _parquet_schema(pa, queryset, data)
+                writer = pq.ParquetWriter(path, schema, compression=compression)
+            for c, convert in converters.items():
+                data[c] = [None if v is None else convert(v) for v in data[c]]
+            writer.write_table(pa.table(data, schema=writer.schema))
+            total += len(rows)
+        if writer is None:
+            schema, _ = _parquet_schema(pa, queryset, {c: [] for c in queryset._output_columns()})
+            writer = pq.ParquetWriter(path, schema, compression=compression)
+            writer.write_table(schema.empty_table())
+    finally:
+        if writer is not None:
+            writer.close()
+    return total
@@ -0,0 +1,97 @@
+import contextvars
+from contextlib import contextmanager
+
+_current = contextvars.ContextVar("wborm_identity_map", default=None)
+
+
+class IdentityMap:
+    """
+        Mapa de identidade: uma única instância por linha do banco, identificada por
+        (tabela, chave primária).
+
+        Forma de uso:
+        -------------
+        with wborm.identity_map() as imap:
+            a = Cliente.filter(id=1).first()
+            b = Cliente.filter(id=1).first()
+            assert a is b
+
+        Observações:
+        ------------
+        - Só vale dentro do bloco `with` (ou da `Session(identity_map=True)`) que o ativou.
+        - Instâncias já conhecidas são devolvidas como estão: alterações locais ainda não
+          gravadas não são sobrescritas pelos valores lidos de novo do banco.
+        - Modelos sem chave primária e consultas com `select()` ou joins planos não passam pelo mapa.
+        """
+
+    def __init__(self):
+        self._objects = {}
+        self.hits = 0
+
+    @staticmethod
+    def key_for(obj):
+        pks = obj._primary_keys()
+        if not pks:
+            return None
+        return (obj.__tablename__, tuple(getattr(obj, pk, None) for pk in pks))
+
+    def get(self, table, pk_values):
+        obj = self._objects.get((table, pk_values))
+        if obj is not None:
+            self.hits += 1
+        return obj
+
+    def add(self, obj):
+        """Registra `obj` e retorna a instância canônica para a sua chave."""
+        key = self.key_for(obj)
+        if key is None or any(v is None for v in key[1]):
+            return obj
+        return self._objects.setdefault(key, obj)
+
+    def discard(self, obj):
+        key = self.key_for(obj)
+        if key is not None and self._objects.get(key) is obj:
+            del self._objects[key]
+
+    def clear(self):
+        self._objects.clear()
+        self.hits = 0
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __contains__(self, obj):
+        key = self.key_for(obj)
+        return key is not None and self._objects.get(key) is obj
+
+
+def current_identity_map():
+    """Retorna o mapa de identidade ativo no contexto atual (ou None)."""
+    return _current.get()
+
+
+@contextmanager
+def identity_map(imap=None):
+    """
+        Ativa um mapa de identidade para todas as consultas feitas dentro do bloco.
+
+        Forma de uso:
+        -------------
+        with wborm.identity_map():
+            pedido = Pedido.filter(id=10).first()
+            cliente = Cliente.filter(id=pedido.cliente_id).first()
+
+        Observações:
+        ------------
+        - Escopo por contexto (`contextvars`): threads e tarefas asyncio não compartilham o mapa.
+        - Blocos aninhados sem `imap` criam um mapa novo; passe `imap` para reaproveitar um existente.
+        """
+    imap = imap if imap is not None else IdentityMap()
+    token = _current.set(imap)
+    try:
+        yield imap
+    finally:
+        _current.reset(token)
+
+
+__all__ = ["IdentityMap", "identity_map", "current_identity_map"]
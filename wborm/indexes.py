@@ -0,0 +1,106 @@
+import re
+
+_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_ALIASED_COLUMN = re.compile(r"\b(t\d+)\.([A-Za-z_]\w*)")
+_COMPARED_COLUMN = re.compile(
+    r"(?:\b(t\d+)\.)?\b([A-Za-z_]\w*)\s*(?:=|<>|!=|<=|>=|<|>|\b(?:NOT\s+)?(?:LIKE|MATCHES|IN|BETWEEN)\b|\bIS\b)",
+    re.IGNORECASE,
+)
+_KEYWORDS = {"and", "or", "not", "null", "select", "where", "from", "exists", "case", "when", "then", "else", "end"}
+
+
+def _split_column(expr, default_alias):
+    expr = str(expr).strip().split()[0] if str(expr).strip() else ""
+    alias, sep, column = expr.partition(".")
+    return (alias, column) if sep else (default_alias, alias)
+
+
+def _filter_columns(condition, default_alias):
+    """Colunas comparadas em uma condição de nível superior (literais e subqueries ignorados)."""
+    text = _LITERAL.sub("''", condition)
+    depth = 0
+    top = []
+    for ch in text:
+        depth += ch == "("
+        top.append(ch if depth == 0 else " ")
+        depth -= ch == ")"
+    columns = []
+    for alias, column in _COMPARED_COLUMN.findall("".join(top)):
+        if column.lower() not in _KEYWORDS:
+            columns.append((alias or default_alias, column))
+    return columns
+
+
+def used_columns(queryset):
+    """
+        Lista `(origem, alias, coluna)` das colunas usadas em filtros, IN, ORDER BY e joins.
+        """
+    base = getattr(queryset, "_table_alias", "t1")
+    used = []
+    for condition in queryset._filters:
+        used += [("filter", a, c) for a, c in _filter_columns(condition, base)]
+    for column, _ in queryset._in_filters:
+        used.append(("filter_in", *_split_column(column, base)))
+    for column, _, _ in queryset._not_in_filters:
+        used.append(("not_in", *_split_column(column, base)))
+    for _, _, on in queryset._joins:
+        used += [("join", a, c) for a, c in _ALIASED_COLUMN.findall(_LITERAL.sub("''", on))]
+    for order in queryset._order_by:
+        used.append(("order_by", *_split_column(order, base)))
+    return list(dict.fromkeys(used))
+
+
+def _leading_index(model, column):
+    for index in getattr(model, "_indexes", None) or []:
+        if index["columns"] and index["columns"][0].lower() == column.lower():
+            return index["name"]
+    return None
+
+
+def index_report(queryset, show=True):
+    """
+        Verifica, sem executar a consulta, se as colunas de filtros, ORDER BY e joins têm um
+        índice cuja coluna líder seja a própria coluna.
+
+        Gera estruturas como:
+        ---------------------
+        [
+            {"source": "filter", "table": "pedidos", "column": "status", "index": None, "indexed": False},
+            {"source": "join", "table": "clientes", "column": "id", "index": "pk_clientes", "indexed": True},
+        ]
+
+        Observações:
+        ------------
+        - Usa os metadados de índices introspectados (`Model._indexes`), salvos no cache de modelos.
+        - Modelos sem metadados de índice aparecem com `indexed=None`.
+        - Colunas sem modelo conhecido (tabelas via string, expressões) são ignoradas.
+        """
+    report = []
+    for source, alias, column in used_columns(queryset):
+        model = queryset.model if alias == getattr(queryset, "_table_alias", "t1") else queryset._alias_model(alias)
+        if model is None or column not in getattr(model, "_fields", {}):
+            continue
+        has_metadata = bool(getattr(model, "_indexes", None))
+        index = _leading_index(model, column) if has_metadata else None
+        report.append({
+            "source": source,
+            "table": model.__tablename__,
+            "column": column,
+            "index": index,
+            "indexed": (index is not None) if has_metadata else None,
+        })
+
+    if show:
+        from termcolor import cprint
+        for item in report:
+            where = f"{item['table']}.{item['column']} ({item['source']})"
+            if item["indexed"]:
+                cprint(f"✔ {where}: índice {item['index']}", "green")
+            elif item["indexed"] is None:
+                cprint(f"ℹ {where}: sem metadados de índice para a tabela", "cyan")
+            else:
+                cprint(f"⚠ {where}: nenhum índice com esta coluna como líder", "yellow")
+    return report
+
+
+__all__ = ["index_report", "used_columns"]
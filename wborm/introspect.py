@@ -7,7 +7,8 @@ WHEN c.coltype = 4 THEN 'SMALLFLOAT' WHEN c.coltype = 5 THEN 'DECIMAL' WHEN c.co
 WHEN c.coltype = 9 THEN 'NULL' WHEN c.coltype = 10 THEN 'DATETIME' WHEN c.coltype = 11 THEN 'BYTE' WHEN c.coltype = 12 THEN 'TEXT' WHEN c.coltype = 13 THEN 'VARCHAR' 
 WHEN c.coltype = 14 THEN 'INTERVAL' WHEN c.coltype = 15 THEN 'NCHAR' WHEN c.coltype = 16 THEN 'NVARCHAR'WHEN c.coltype = 17 THEN 'INT8' WHEN c.coltype = 18 THEN 'SERIAL8' 
 WHEN c.coltype = 19 THEN 'SET' WHEN c.coltype = 20 THEN 'MULTISET' WHEN c.coltype = 21 THEN 'LIST' WHEN c.coltype = 22 THEN 'Unnamed ROW' WHEN c.coltype = 40 THEN 'LVARCHAR' 
-WHEN c.coltype = 41 THEN 'CLOB' WHEN c.coltype = 43 THEN 'BLOB' WHEN c.coltype = 44 THEN 'BOOLEAN' WHEN c.coltype = 256 THEN 'CHAR' WHEN c.coltype = 257 THEN 'SMALLINT' 
+WHEN c.coltype = 41 THEN 'CLOB' WHEN c.coltype = 43 THEN 'BLOB' WHEN c.coltype = 44 THEN 'BOOLEAN' WHEN c.coltype = 45 THEN 'BOOLEAN' 
+WHEN c.coltype = 52 THEN 'BIGINT' WHEN c.coltype = 53 THEN 'BIGSERIAL' WHEN c.coltype = 308 THEN 'BIGINT' WHEN c.coltype = 309 THEN 'BIGSERIAL' WHEN c.coltype = 256 THEN 'CHAR' WHEN c.coltype = 257 THEN 'SMALLINT' 
 WHEN c.coltype = 258 THEN 'INTEGER' WHEN c.coltype = 259 THEN 'FLOAT' WHEN c.coltype = 260 THEN 'REAL' WHEN c.coltype = 261 THEN 'DECIMAL' WHEN c.coltype = 262 THEN 'SERIAL' 
 WHEN c.coltype = 263 THEN 'DATE' WHEN c.coltype = 264 THEN 'MONEY' WHEN c.coltype = 266 THEN 'DATETIME' WHEN c.coltype = 267 THEN 'BYTE' WHEN c.coltype = 268 THEN 'TEXT' 
 WHEN c.coltype = 269 THEN 'VARCHAR' WHEN c.coltype = 270 THEN 'INTERVAL' WHEN c.coltype = 271 THEN 'NCHAR' WHEN c.coltype = 272 THEN 'NVARCHAR'WHEN c.coltype = 273 THEN 'INT8' 
@@ -63,4 +64,128 @@ WHERE c.constrtype = 'R'
   AND idx_fk.part1 IS NOT NULL
   AND idx_pk.part1 IS NOT NULL
     """
-    return conn.execute_query(sql)
\ No newline at end of file
+    return conn.execute_query(sql)
+
+_CONSTRAINT_PRIORITY = {"P": 0, "U": 1, "R": 2}
+
+
+def get_indexes(tablename, conn):
+    """
+        Lê os índices da tabela (sysindexes) e as constraints associadas (sysconstraints).
+
+        Gera estruturas como:
+        ---------------------
+        [
+            {"name": "pk_clientes", "columns": ["id"], "unique": True, "constraint": "P"},
+            {"name": "ix_cli_nome", "columns": ["nome", "cidade"], "unique": False, "constraint": None},
+        ]
+
+        Observações:
+        ------------
+        - `columns` segue a ordem das partes do índice (a primeira é a coluna líder).
+        - `constraint` é o tipo da constraint que usa o índice: P (primária), U (única), R (FK).
+        """
+    parts = ", ".join(f"i.part{n}" for n in range(1, 17))
+    sql = f"""
+SELECT
+    TRIM(i.idxname) AS idxname,
+    i.idxtype,
+    {parts},
+    c.constrtype
+FROM systables t
+JOIN sysindexes i ON i.tabid = t.tabid
+LEFT JOIN sysconstraints c ON c.tabid = i.tabid AND c.idxname = i.idxname
+WHERE t.tabname = '{tablename}'
+ORDER BY i.idxname
+    """
+    rows = conn.execute_query(sql)
+    if not rows:
+        return []
+
+    columns = {int(c["position"]): str(c["name"]).strip() for c in introspect_table(tablename, conn)}
+    indexes = {}
+    for row in rows:
+        name = str(row["idxname"]).strip()
+        constraint = row.get("constrtype")
+        constraint = str(constraint).strip() if constraint else None
+        if name in indexes:
+            # Um índice pode servir a mais de uma constraint: prioriza P > U > R
+            current = indexes[name]["constraint"]
+            if constraint and _CONSTRAINT_PRIORITY.get(constraint, 9) < _CONSTRAINT_PRIORITY.get(current, 9):
+                indexes[name]["constraint"] = constraint
+            continue
+        colnos = [row.get(f"part{n}") for n in range(1, 17)]
+        indexes[name] = {
+            "name": name,
+            "columns": [columns.get(abs(int(p)), str(p)) for p in colnos if p],
+            "unique": str(row.get("idxtype") or "").strip().upper() == "U" or constraint in ("P", "U"),
+            "constraint": constraint,
+        }
+    return list(indexes.values())
+
+
+def get_primary_key(tablename, conn, indexes=None):
+    """
+        Retorna as colunas da chave primária (constraint 'P'), na ordem do índice.
+
+        Forma de uso:
+        -------------
+        get_primary_key("itens_pedido", conn)   # ["pedido_id", "item"]
+
+        Observações:
+        ------------
+        - Aceita `indexes` já lidos por `get_indexes` para evitar nova consulta ao catálogo.
+        - Retorna lista vazia quando a tabela não tem chave primária declarada.
+        """
+    if indexes is None:
+        indexes = get_indexes(tablename, conn)
+    for index in indexes:
+        if index.get("constraint") == "P":
+            return list(index["columns"])
+    return []
+
+
+def get_fragments(tablename, conn):
+    """
+        Lê a estratégia de fragmentação da tabela (sysfragments, fragmentos de dados).
+
+        Gera estruturas como:
+        ---------------------
+        [
+            {"position": 1, "strategy": "E", "dbspace": "dbs1", "partition": "p2023",
+             "expression": "(ano < 2024)", "rows": 1200000},
+            {"position": 2, "strategy": "E", "dbspace": "dbs2", "partition": "p_resto",
+             "expression": "REMAINDER", "rows": 80000},
+        ]
+
+        Observações:
+        ------------
+        - `strategy`: E (expressão), R (round-robin), L (lista), N (intervalo), entre outras.
+        - Tabelas não fragmentadas retornam lista vazia.
+        """
+    sql = f"""
+SELECT
+    f.evalpos,
+    f.strategy,
+    TRIM(f.dbspace) AS dbspace,
+    TRIM(f.partition) AS partition,
+    f.exprtext,
+    f.nrows
+FROM sysfragments f
+JOIN systables t ON t.tabid = f.tabid
+WHERE t.tabname = '{tablename}'
+  AND f.fragtype = 'T'
+ORDER BY f.evalpos
+    """
+    fragments = []
+    for row in conn.execute_query(sql) or []:
+        expression = row.get("exprtext")
+        fragments.append({
+            "position": int(row["evalpos"]),
+            "strategy": str(row.get("strategy") or "").strip(),
+            "dbspace": row.get("dbspace"),
+            "partition": row.get("partition"),
+            "expression": str(expression).strip() if expression is not None else None,
+            "rows": row.get("nrows"),
+        })
+    return fragments
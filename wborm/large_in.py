@@ -0,0 +1,131 @@
+import itertools
+
+from wborm import stats
+
+_temp_ids = itertools.count(1)
+
+
+def _literal_lists(queryset):
+    """Listas de valores literais (não subqueries) de `filter_in` e `not_in`: `(op, índice, coluna, valores)`."""
+    from wborm.query import QuerySet, _is_subquery
+
+    found = []
+    for i, (column, values) in enumerate(queryset._in_filters):
+        if not isinstance(values, (QuerySet, str)) and not _is_subquery(values):
+            found.append(("IN", i, column, values))
+    for i, (column, values, subquery) in enumerate(queryset._not_in_filters):
+        if not subquery and not isinstance(values, str):
+            found.append(("NOT IN", i, column, values))
+    return found
+
+
+def large_lists(queryset):
+    """Listas literais com mais valores que `queryset._in_chunk_size`."""
+    limit = queryset._in_chunk_size
+    return [item for item in _literal_lists(queryset) if len(item[3]) > limit]
+
+
+def strategy(queryset, large=None):
+    """
+        Escolhe como executar a consulta: "inline", "chunks" ou "temp".
+
+        - "chunks": uma única lista IN grande, até `_in_temp_threshold` valores, em consulta
+          cujos resultados podem ser simplesmente concatenados.
+        - "temp": demais casos (NOT IN, várias listas grandes, ORDER BY, limit/offset, DISTINCT,
+          GROUP BY, contagens), via tabela temporária.
+        """
+    large = large_lists(queryset) if large is None else large
+    if not large:
+        return "inline"
+    op, _, _, values = large[0]
+    threshold = queryset._in_temp_threshold
+    concatenable = not (
+        queryset._limit is not None or queryset._offset or queryset._order_by
+        or queryset._distinct or queryset._group_by or queryset._having
+    )
+    if len(large) == 1 and op == "IN" and concatenable and (threshold is None or len(values) <= threshold):
+        return "chunks"
+    return "temp"
+
+
+def _column_type(queryset, column, values):
+    from wborm.core import _sql_type_for
+
+    alias, sep, name = str(column).rpartition(".")
+    base = getattr(queryset, "_table_alias", "t1")
+    model = queryset.model if not sep or alias == base else queryset._alias_model(alias)
+    field = (getattr(model, "_fields", None) or {}).get(name)
+    if field is not None:
+        return _sql_type_for(field.field_type)
+    kinds = {type(v) for v in values if v is not None}
+    return _sql_type_for(kinds.pop()) if len(kinds) == 1 else "LVARCHAR(4096)"
+
+
+def _run_chunks(queryset, sql, conn, large):
+    from wborm.query import _in_condition
+
+    _, _, column, values = large[0]
+    original = _in_condition(column, values, "IN")
+    unique = list(dict.fromkeys(values))  # evita linhas repetidas entre lotes
+    size = queryset._in_chunk_size
+    rows = []
+    for start in range(0, len(unique), size):
+        chunk = _in_condition(column, unique[start:start + size], "IN")
+        rows += stats.timed(conn, sql.replace(original, chunk))
+    return rows
+
+
+def _run_with_temp(queryset, sql, conn, large):
+    from wborm.core import _insert_rows
+    from wborm.query import _in_condition
+
+    temp_tables = []
+    try:
+        for op, _, column, values in large:
+            temp_name = f"tmp_wborm_in{next(_temp_ids)}"
+            sql_type = _column_type(queryset, column, values)
+            # na mesma conexão da consulta: tabelas temporárias são da sessão (vale para o pool)
+            stats.timed_write(conn, f"CREATE TEMP TABLE {temp_name} (v {sql_type}) WITH NO LOG")
+            temp_tables.append(temp_name)
+            _insert_rows(conn, temp_name, ["v"], [sql_type], ((v,) for v in dict.fromkeys(values)))
+            sql = sql.replace(_in_condition(column, values, op), f"{column} {op} (SELECT v FROM {temp_name})")
+        return stats.timed(conn, sql)
+    finally:
+        for temp_name in temp_tables:
+            try:
+                stats.timed_write(conn, f"DROP TABLE {temp_name}")
+            except Exception:
+                pass
+
+
+def execute(queryset, sql, conn=None, chunks=True):
+    """
+        Executa `sql` (compilada a partir de `queryset`) tratando listas IN/NOT IN grandes.
+
+        Gera comandos como:
+        -------------------
+        "chunks":  SELECT ... WHERE t1.id IN ('1', ..., '1000')        (um SELECT por lote)
+        "temp":    CREATE TEMP TABLE tmp_wborm_in1 (v INT8) WITH NO LOG
+                   INSERT INTO tmp_wborm_in1 (v) SELECT '1' FROM systables WHERE tabid = 1
+                       UNION ALL SELECT '2' ...                             (lotes de 500 valores)
+                   SELECT ... WHERE t1.id IN (SELECT v FROM tmp_wborm_in1)
+                   DROP TABLE tmp_wborm_in1
+
+        Observações:
+        ------------
+        - A condição IN original é trocada no texto da SQL, então vale para a consulta principal,
+          para COUNT/EXISTS e para consultas envolvidas em subquery.
+        - `chunks=False` (consultas de valor único) sempre usa a tabela temporária.
+        - Tabela temporária, carga e consulta rodam todas em `conn` (inclusive a conexão do
+          pool na atualização em segundo plano do cache).
+        """
+    conn = conn if conn is not None else queryset.conn
+    large = large_lists(queryset)
+    if not large:
+        return stats.timed(conn, sql)
+    if strategy(queryset, large) == "chunks" and chunks:
+        return _run_chunks(queryset, sql, conn, large)
+    return _run_with_temp(queryset, sql, conn, large)
+
+
+__all__ = ["execute", "large_lists", "strategy"]
@@ -0,0 +1,170 @@
+import csv
+import queue
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+
+from wborm import stats
+
+_DONE = object()
+_TRUE_VALUES = {"1", "t", "true", "s", "sim", "y", "yes"}
+
+
+def coerce_value(value, field_type):
+    """
+        Converte um valor lido (texto de CSV, valor Python ou Java) para o `field_type` do campo.
+
+        - Strings vazias e None viram None.
+        - Valores já no tipo correto são devolvidos sem cópia.
+        """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if value == "":
+            return None
+    if field_type is bool:
+        return value if isinstance(value, bool) else str(value).lower() in _TRUE_VALUES
+    if isinstance(value, field_type):
+        return value
+    if field_type is datetime:
+        return datetime.fromisoformat(str(value))
+    if field_type is date:
+        return date.fromisoformat(str(value)[:10])
+    if field_type is Decimal:
+        return Decimal(str(value))
+    if field_type is int:
+        return int(str(value))
+    return field_type(value)
+
+
+def _iter_source(model, source, delimiter, encoding):
+    """Gera as linhas da origem como dicionários {campo: valor bruto}."""
+    if isinstance(source, str):
+        with open(source, newline="", encoding=encoding) as f:
+            for row in csv.DictReader(f, delimiter=delimiter):
+                yield row
+        return
+
+    fields = list(model._fields)
+    for row in source:
+        if isinstance(row, dict):
+            yield row
+        elif hasattr(row, "_fields") and hasattr(row, "__tablename__"):
+            yield {k: getattr(row, k, None) for k in fields}
+        else:
+            yield dict(zip(fields, row))
+
+
+class _BatchParser:
+    """Lê lotes da origem (sob lock) e converte/valida fora do lock, em paralelo."""
+
+    def __init__(self, model, rows, batch_size):
+        self.model = model
+        self.rows = rows
+        self.batch_size = batch_size
+        self.lock = threading.Lock()
+        self.position = 0
+        self.fields = list(model._fields.items())
+
+    def next_raw_batch(self):
+        with self.lock:
+            batch = list(islice(self.rows, self.batch_size))
+            start = self.position
+            self.position += len(batch)
+        return start, batch
+
+    def convert(self, start, raw_batch):
+        converted = []
+        for offset, raw in enumerate(raw_batch):
+            try:
+                values = {name: coerce_value(raw.get(name), field.field_type) for name, field in self.fields}
+                self.model(**values).validate()
+            except Exception as e:
+                raise ValueError(f"Linha {start + offset + 1} inválida para {self.model.__tablename__}: {e}") from e
+            converted.append(tuple(values[name] for name, _ in self.fields))
+        return converted
+
+
+def bulk_load(model, source, batch_size=1000, workers=1, queue_size=None, delimiter=",", encoding="utf-8"):
+    """
+        Carrega registros em streaming, com memória limitada e leitura em paralelo às gravações.
+
+        Implementação de `Model.bulk_load`: `workers` threads leem e convertem lotes da origem e
+        os colocam em uma fila limitada (`queue_size`, padrão `2 * workers`). A thread chamadora
+        consome a fila e grava cada lote em sua própria transação. Quando a fila enche, a leitura
+        pausa (backpressure) até o banco consumir os lotes pendentes.
+        """
+    from termcolor import cprint
+    from wborm.cache import invalidate_tables
+    from wborm.core import _format_value
+
+    if batch_size < 1 or workers < 1:
+        raise ValueError("batch_size e workers devem ser maiores que zero.")
+
+    conn = model._connection
+    table = model.__tablename__
+    parser = _BatchParser(model, _iter_source(model, source, delimiter, encoding), batch_size)
+    batches = queue.Queue(maxsize=queue_size or 2 * workers)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker():
+        try:
+            while not stop.is_set():
+                start, raw_batch = parser.next_raw_batch()
+                if not raw_batch:
+                    break
+                if not put(parser.convert(start, raw_batch)):
+                    return
+        except Exception as e:
+            put(e)
+        finally:
+            put(_DONE)
+
+    threads = [threading.Thread(target=worker, daemon=True, name=f"wborm-load-{i}") for i in range(workers)]
+    for t in threads:
+        t.start()
+
+    columns = ", ".join(model._fields.keys())
+    total = 0
+    finished = 0
+    try:
+        while finished < workers:
+            item = batches.get()
+            if item is _DONE:
+                finished += 1
+                continue
+            if isinstance(item, Exception):
+                raise item
+            try:
+                conn.execute("BEGIN WORK")
+                for values in item:
+                    placeholders = ", ".join(_format_value(v) for v in values)
+                    stats.timed_write(conn, f"INSERT INTO {table} ({columns}) VALUES ({placeholders})")
+                conn.execute("COMMIT WORK")
+            except Exception:
+                conn.execute("ROLLBACK WORK")
+                raise
+            total += len(item)
+    except Exception as e:
+        cprint(f"✖ Falha no bulk_load de {table} após {total} registros: {str(e)}", "red")
+        raise
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+        if total:
+            invalidate_tables(table)
+
+    cprint(f"✔ {total} registros carregados em {table}", "green")
+    return total
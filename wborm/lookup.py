@@ -0,0 +1,180 @@
+import threading
+import time
+from collections import OrderedDict
+
+from wborm import stats
+from wborm.cache import table_version
+from wborm.converters import hydration_plan, hydrate
+
+_statements = {}
+_caches = {}
+_lock = threading.Lock()
+
+
+class PKCache:
+    """
+        Cache LRU de linhas por chave primária, com TTL e limite de tamanho (um por modelo).
+
+        Observações:
+        ------------
+        - Guarda a linha lida do banco, não a instância: cada `get` devolve um objeto novo
+          (ou o do mapa de identidade ativo), então alterações locais não vazam entre chamadas.
+        - Cada entrada leva a versão da tabela (`table_version`): qualquer escrita conhecida pelo
+          wborm na tabela torna as entradas anteriores inválidas.
+        """
+
+    def __init__(self, size=1024, ttl=60):
+        self.size = size
+        self.ttl = ttl
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._rows.get(key)
+            if entry is None or entry[1] != version or time.time() - entry[2] >= self.ttl:
+                if entry is not None:
+                    del self._rows[key]
+                self.misses += 1
+                return None
+            self._rows.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, row, version):
+        if self.size <= 0:
+            return
+        with self._lock:
+            self._rows[key] = (row, version, time.time())
+            self._rows.move_to_end(key)
+            while len(self._rows) > self.size:
+                self._rows.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+
+    def __len__(self):
+        return len(self._rows)
+
+
+def pk_cache(model):
+    """Cache de chaves primárias do modelo (criado com `_pk_cache_size` / `_pk_cache_ttl`)."""
+    cache = _caches.get(model)
+    if cache is None:
+        with _lock:
+            cache = _caches.setdefault(model, PKCache(model._pk_cache_size, model._pk_cache_ttl))
+    return cache
+
+
+def clear_pk_cache(model=None):
+    """Esvazia o cache de chaves primárias de `model` (ou de todos os modelos)."""
+    caches = list(_caches.values()) if model is None else [c for m, c in list(_caches.items()) if m is model]
+    for cache in caches:
+        cache.clear()
+
+
+def _statement(model):
+    """`SELECT <campos> FROM <tabela> WHERE ` e a lista de chaves primárias, montados uma vez por modelo."""
+    statement = _statements.get(model)
+    if statement is None:
+        pks = model._primary_keys()
+        if not pks:
+            raise ValueError(f"{model.__name__} não tem chave primária: use filter() em vez de get().")
+        statement = (f"SELECT {', '.join(model._fields)} FROM {model.__tablename__} WHERE ", pks)
+        _statements[model] = statement
+    return statement
+
+
+def _normalize(model, pks, pk):
+    """
+        Converte a chave em uma tupla com os tipos dos campos (`5` e `"5"` viram a mesma chave).
+
+        Textos perdem os espaços à direita: colunas CHAR voltam do banco completadas com espaços
+        (`"ABC   "`) e o Informix compara CHAR ignorando esses espaços.
+        """
+    values = tuple(pk) if isinstance(pk, (tuple, list)) else (pk,)
+    if len(values) != len(pks):
+        raise ValueError(f"{model.__name__} tem chave primária ({', '.join(pks)}): informe {len(pks)} valor(es).")
+    normalized = []
+    for name, value in zip(pks, values):
+        field_type = model._fields[name].field_type
+        if value is not None and field_type in (int, str) and not isinstance(value, field_type):
+            try:
+                value = field_type(value)
+            except (TypeError, ValueError):
+                pass
+        if isinstance(value, str):
+            value = value.rstrip()
+        normalized.append(value)
+    return tuple(normalized)
+
+
+def _where(pks, keys):
+    from wborm.core import _format_value
+
+    if len(pks) == 1 and len(keys) == 1:
+        return f"{pks[0]} = {_format_value(keys[0][0])}"
+    if len(pks) == 1:
+        return f"{pks[0]} IN ({', '.join(_format_value(k[0]) for k in keys)})"
+    return " OR ".join(
+        "(" + " AND ".join(f"{name} = {_format_value(v)}" for name, v in zip(pks, key)) + ")" for key in keys
+    )
+
+
+def _hydrate_rows(model, rows):
+    if not rows:
+        return []
+    return hydrate(model, hydration_plan(model, list(rows[0].keys())), rows)
+
+
+def get_many(model, pks, chunk_size=1000):
+    """
+        Lê vários registros pela chave primária, usando o cache por modelo e lotes IN para o resto.
+
+        Gera comandos como:
+        -------------------
+        SELECT id, nome FROM clientes WHERE id IN ('1', '2', ..., '1000')
+        SELECT a, b, valor FROM itens WHERE (a = '1' AND b = '2') OR (a = '1' AND b = '3')
+
+        Retorna `{chave: instância}` com as chaves encontradas (na ordem pedida), onde `chave`
+        é o valor informado (ou a tupla, em chaves compostas).
+        """
+    prefix, pk_names = _statement(model)
+    cache = pk_cache(model)
+    version = table_version(model.__tablename__)
+
+    requested = OrderedDict()
+    for pk in pks:
+        requested.setdefault(_normalize(model, pk_names, pk), pk)
+
+    cached = {}
+    missing = []
+    for key in requested:
+        row = cache.get(key, version)
+        if row is None:
+            missing.append(key)
+        else:
+            cached[key] = row
+
+    objs = dict(zip(cached, _hydrate_rows(model, list(cached.values()))))
+    if len(pk_names) > 1:
+        chunk_size = max(1, chunk_size // 10)  # OR de ANDs cresce rápido: lotes menores
+    for start in range(0, len(missing), chunk_size):
+        fetched = stats.timed(model._connection, prefix + _where(pk_names, missing[start:start + chunk_size]))
+        for obj, row in zip(_hydrate_rows(model, fetched), fetched):
+            key = _normalize(model, pk_names, tuple(getattr(obj, name) for name in pk_names))
+            objs[key] = obj
+            cache.put(key, row, version)
+
+    return {pk: objs[key] for key, pk in requested.items() if key in objs}
+
+
+def get(model, pk):
+    """Lê um registro pela chave primária (ou None), passando pelo cache por modelo."""
+    return next(iter(get_many(model, [pk]).values()), None)
+
+
+__all__ = ["PKCache", "get", "get_many", "pk_cache", "clear_pk_cache"]
@@ -37,6 +37,7 @@ def save_model_to_disk(table_name, model_cls):
     data = {
         "fields": simplified_fields,
         "relations": model_cls._relations,
+        "indexes": getattr(model_cls, "_indexes", []),
     }
 
     encrypted = Fernet(key).encrypt(pickle.dumps(data))
@@ -66,6 +67,7 @@ def try_load_model_from_disk(table_name, conn):
         class_attrs = {
             "__tablename__": table_name,
             "_relations": cached["relations"],
+            "_indexes": cached.get("indexes", []),
         }
         class_attrs.update(field_map)
 
@@ -84,15 +86,18 @@ def try_load_model_from_disk(table_name, conn):
         print(f"⚠️ Falha ao carregar modelo '{table_name}': {e}")
         return None
 
+# Cabeçalho dos stubs: os campos gerados podem ser Decimal, date e datetime
+_STUB_HEADER = [
+    "from wborm.core import Model",
+    "from typing import Any, Optional",
+    "from decimal import Decimal",
+    "from datetime import date, datetime",
+    "",
+]
+
 # Para gerar/atualizar o stub incrementalmente (por tabela)
 def update_model_stub_file(path: str, model_name: str, fields: dict):
-    from typing import Optional
-
-    header = [
-        "from wborm.core import Model",
-        "from typing import Optional",
-        "",
-    ]
+    header = list(_STUB_HEADER)
 
     target_class = f"class {model_name}(Model):"
     lines = [target_class]
@@ -118,6 +123,10 @@ def update_model_stub_file(path: str, model_name: str, fields: dict):
     with open(path, "r", encoding="utf-8") as f:
         content = f.read()
 
+    missing = [line for line in header if line and line not in content.splitlines()]
+    if missing:
+        content = "\n".join(missing) + "\n" + content
+
     import re
     class_pattern = rf"(class {model_name}\(Model\):\n(?:    .*\n)*?)\n"
     if re.search(class_pattern, content):
@@ -138,11 +147,7 @@ def generate_model_stub(output_path=STUB_FILE):
         print("⚠ Nenhum modelo carregado.")
         return
 
-    lines = [
-        "from wborm.core import Model",
-        "from typing import Optional",
-        "",
-    ]
+    lines = list(_STUB_HEADER)
 
     for name, model_cls in sorted(_model_registry.items()):
         if not issubclass(model_cls, Model):
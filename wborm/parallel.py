@@ -0,0 +1,329 @@
+import heapq
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from wborm import stats
+
+_DONE = object()
+
+
+def _check_supported(queryset, action):
+    if queryset._raw_sql:
+        raise ValueError(f"{action} não suporta raw_sql().")
+    if queryset._limit is not None or queryset._offset:
+        raise ValueError(f"{action} não suporta limit()/offset(): cada partição leria seu próprio recorte.")
+    if queryset._group_by or queryset._having or queryset._distinct:
+        raise ValueError(f"{action} não suporta group_by()/having()/distinct() entre partições.")
+
+
+def _partition_key(queryset, key):
+    if key:
+        field = queryset.model._fields.get(key) if hasattr(queryset.model, "_fields") else None
+        if field is not None and field.field_type is not int:
+            raise ValueError(f"key='{key}' precisa ser inteira para particionar (campo é {field.field_type.__name__}).")
+        return key
+    pks = queryset.model._primary_keys()
+    if len(pks) != 1:
+        raise ValueError(
+            "Informe key='coluna' (inteira): o modelo não tem chave primária simples para particionar."
+        )
+    return pks[0]
+
+
+def _integer_bound(column, value):
+    try:
+        number = Decimal(str(value).strip())
+    except ArithmeticError:
+        number = None
+    if number is None or not number.is_finite() or number != number.to_integral_value():
+        raise ValueError(f"{column} precisa ser inteira para particionar por faixa (encontrado {value!r}).")
+    return int(number)
+
+
+def key_partitions(queryset, partitions, key=None, method="range"):
+    """
+        Condições WHERE que dividem a consulta em `partitions` recortes disjuntos da chave.
+
+        - `method="range"`: lê MIN/MAX da chave (com os mesmos filtros) e gera faixas
+          `t1.id >= a AND t1.id < b`, em ordem crescente.
+        - `method="mod"`: gera `MOD(t1.id, N) = i` (sem consulta prévia; bom para chaves esparsas).
+        - Com `key` informada (que pode não ser a PK), acrescenta a partição `t1.chave IS NULL`:
+          faixas e MOD nunca são verdadeiros para NULL.
+        - A chave precisa ser inteira; valores fracionários em MIN/MAX levantam ValueError.
+        """
+    if partitions < 1:
+        raise ValueError("partitions deve ser maior que zero.")
+    alias = getattr(queryset, "_table_alias", "t1")
+    column = f"{alias}.{_partition_key(queryset, key)}"
+    nulls = [f"{column} IS NULL"] if key else []
+
+    if method == "mod":
+        return [f"MOD({column}, {partitions}) = {i}" for i in range(partitions)] + nulls
+    if method != "range":
+        raise ValueError("method deve ser 'range' ou 'mod'.")
+
+    rows = stats.timed(queryset.conn, f"SELECT MIN({column}) AS lo, MAX({column}) AS hi {queryset._build_from_where()}")
+    if not rows:
+        return []
+    lo, hi = (rows[0].get(k) for k in ("lo", "hi"))
+    if lo is None or hi is None:
+        return nulls
+    lo, hi = _integer_bound(column, lo), _integer_bound(column, hi)
+    bounds = [lo + (hi - lo + 1) * i // partitions for i in range(partitions + 1)]
+    return [
+        f"{column} >= {start} AND {column} < {end}"
+        for start, end in zip(bounds, bounds[1:])
+        if end > start
+    ] + nulls
+
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_BOUND = re.compile(r"^\(*\s*(\w+)\s*(<=|>=|<|>|=)\s*'?(-?\d+(?:\.\d+)?)'?\s*\)*$")
+
+
+def _columns_in(expression, model):
+    """Colunas do modelo citadas na expressão (fora de literais), na ordem de aparição."""
+    names = {name.lower(): name for name in getattr(model, "_fields", {})}
+    found = re.findall(r"[A-Za-z_]\w*", _STRING.sub("", expression))
+    return list(dict.fromkeys(names[w.lower()] for w in found if w.lower() in names))
+
+
+def _interval(expression):
+    """
+        `(coluna, mínimo, inclui_mínimo, máximo, inclui_máximo)` de expressões simples como
+        `id <= 30` ou `id > 30 AND id <= 60`; None quando a expressão não é uma faixa reconhecível.
+        """
+    column, lo, lo_in, hi, hi_in = None, None, False, None, False
+    for term in re.split(r"\s+AND\s+", expression.strip(), flags=re.IGNORECASE):
+        match = _BOUND.match(term.strip())
+        if not match or (column and match.group(1).lower() != column):
+            return None
+        column, op, value = match.group(1).lower(), match.group(2), Decimal(match.group(3))
+        if op in (">", ">=", "=") and (lo is None or value > lo or (value == lo and op == ">")):
+            lo, lo_in = value, op != ">"
+        if op in ("<", "<=", "=") and (hi is None or value < hi or (value == hi and op == "<")):
+            hi, hi_in = value, op != "<"
+    return column, lo, lo_in, hi, hi_in
+
+
+def _may_overlap(a, b):
+    """False só quando as duas expressões são faixas disjuntas da mesma coluna."""
+    a, b = _interval(a), _interval(b)
+    if a is None or b is None or a[0] != b[0]:
+        return True
+    for (_, _, _, hi, hi_in), (_, lo, lo_in, _, _) in ((a, b), (b, a)):
+        if hi is not None and lo is not None and (hi < lo or (hi == lo and not (hi_in and lo_in))):
+            return False
+    return True
+
+
+def fragment_partitions(queryset, fragments, key=None):
+    """
+        Condições WHERE equivalentes a cada fragmento de dados da tabela.
+
+        - Fragmentação por expressão: cada fragmento usa a própria expressão, `(e2)`, para que o
+          otimizador faça a eliminação de fragmentos. Se uma expressão anterior (ordem `evalpos`)
+          pode se sobrepor, exclui as linhas dela como o Informix faz: `(e2) AND NOT (e1)`.
+        - REMAINDER: `NOT ((e1) OR ... OR (en))`, mais as linhas com NULL nas colunas das
+          expressões (para elas as expressões não são verdadeiras e a linha vai para o REMAINDER).
+        - Round-robin e demais estratégias sem expressão: não há predicado por fragmento;
+          usa `MOD(chave, nº de fragmentos)` para manter o mesmo grau de paralelismo.
+        """
+    if not fragments:
+        return []
+    expressions = [f["expression"] for f in fragments]
+    remainder = [e for e in expressions if e and e.upper() == "REMAINDER"]
+    regular = [e for e in expressions if e and e.upper() != "REMAINDER"]
+
+    if len(regular) + len(remainder) != len(fragments) or not regular:
+        return key_partitions(queryset, len(fragments), key=key, method="mod")
+
+    columns = list(dict.fromkeys(c for e in regular for c in _columns_in(e, queryset.model)))
+
+    def not_true(exprs, remainder=False):
+        """Linhas em que nenhuma de `exprs` é verdadeira (falsa ou desconhecida por NULL)."""
+        either = " OR ".join(f"({e})" for e in exprs)
+        if not columns or (len(columns) == 1 and not remainder):
+            return f"NOT ({either})"  # com uma coluna NULL, a própria expressão do fragmento já é falsa
+        nulls = " OR ".join(f"{c} IS NULL" for c in columns)
+        if len(columns) == 1:
+            return f"(NOT ({either}) OR {nulls})"
+        return f"(NOT ({either}) OR (({nulls}) AND CASE WHEN {either} THEN 1 ELSE 0 END = 0))"
+
+    conditions = []
+    for i, expression in enumerate(regular):
+        earlier = [e for e in regular[:i] if _may_overlap(e, expression)]
+        conditions.append(f"({expression})" + (f" AND {not_true(earlier)}" if earlier else ""))
+    if remainder:
+        conditions.append(not_true(regular, remainder=True))
+    return conditions
+
+
+def _partition_querysets(queryset, conditions, ordered):
+    parts = []
+    for condition in conditions:
+        part = queryset._clone()
+        part._filters.append(condition)
+        part._cache_enabled = False
+        if not ordered:
+            part._order_by = []
+        parts.append(part)
+    return parts
+
+
+def _order_key(queryset):
+    """Função de ordenação (e direção) equivalente ao ORDER BY, para mesclar partições."""
+    alias = getattr(queryset, "_table_alias", "t1")
+    attrs, directions = [], set()
+    for item in queryset._order_by:
+        tokens = str(item).split()
+        column = tokens[0]
+        directions.add(tokens[1].upper() if len(tokens) > 1 else "ASC")
+        prefix, sep, name = column.partition(".")
+        name = name if sep else prefix
+        if queryset._joins:
+            name = f"{prefix if sep else alias}_{name}"
+        attrs.append(name)
+    if len(directions) > 1:
+        return None, False
+
+    def key(obj):
+        return tuple((getattr(obj, a, None) is not None, getattr(obj, a, None)) for a in attrs)
+
+    return key, directions == {"DESC"}
+
+
+def _run_all(part, pool):
+    if pool is None:
+        return part._hydrate(stats.timed(part.conn, part._build_query()))
+    with pool.connection() as conn:
+        part.conn = conn
+        return part._hydrate(stats.timed(conn, part._build_query()))
+
+
+def run_partitions(queryset, conditions, pool=None, ordered=False):
+    """
+        Executa uma cópia da consulta por condição, em paralelo (uma conexão do pool por
+        partição) e junta os resultados.
+
+        Sem `pool`, as partições rodam em sequência na conexão do queryset: conexões
+        JDBC não podem ser compartilhadas entre threads.
+        """
+    parts = _partition_querysets(queryset, conditions, ordered)
+    if not parts:
+        return []
+    if pool is None:
+        results = [_run_all(part, None) for part in parts]
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(parts), pool.size), thread_name_prefix="wborm-part") as ex:
+            results = list(ex.map(lambda p: _run_all(p, pool), parts))
+
+    if ordered and queryset._order_by:
+        return list(_merge(queryset, results))
+    return [obj for chunk in results for obj in chunk]
+
+
+def iter_partitions(queryset, conditions, pool=None, ordered=False, chunk_size=1000, buffer=4):
+    """
+        Versão em streaming de `run_partitions`: cada partição é lida em blocos por uma thread
+        e os objetos são entregues assim que chegam (ou mesclados pelo ORDER BY, se `ordered`).
+
+        A memória fica limitada a `buffer` blocos por partição.
+        """
+    parts = _partition_querysets(queryset, conditions, ordered)
+    if not parts:
+        return
+    if pool is None:
+        streams = [part.iterator(chunk_size) for part in parts]
+        yield from _merge(queryset, streams) if ordered and queryset._order_by else (o for s in streams for o in s)
+        return
+    if ordered and len(parts) > pool.size:
+        raise ValueError(
+            f"ordered=True em streaming precisa de uma conexão por partição ({len(parts)}); o pool tem {pool.size}."
+        )
+
+    stop = threading.Event()
+    queues = [queue.Queue(maxsize=buffer) for _ in parts] if ordered else [queue.Queue(maxsize=buffer * len(parts))]
+    semaphore = threading.Semaphore(pool.size)
+
+    def put(q, item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker(part, q):
+        try:
+            with semaphore:
+                if stop.is_set():
+                    return
+                with pool.connection() as conn:
+                    part.conn = conn
+                    chunk = []
+                    for obj in part.iterator(chunk_size):
+                        chunk.append(obj)
+                        if len(chunk) >= chunk_size:
+                            if not put(q, chunk):
+                                return
+                            chunk = []
+                    if chunk:
+                        put(q, chunk)
+        except Exception as e:
+            put(q, e)
+        finally:
+            put(q, _DONE)
+
+    def drain(q, producers):
+        finished = 0
+        while finished < producers:
+            item = q.get()
+            if item is _DONE:
+                finished += 1
+                continue
+            if isinstance(item, Exception):
+                raise item
+            yield from item
+
+    threads = [
+        threading.Thread(target=worker, args=(part, queues[i] if ordered else queues[0]), daemon=True,
+                         name=f"wborm-part-{i}")
+        for i, part in enumerate(parts)
+    ]
+    for t in threads:
+        t.start()
+
+    try:
+        if ordered:
+            yield from _merge(queryset, [drain(q, 1) for q in queues])
+        else:
+            yield from drain(queues[0], len(parts))
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+
+
+def _merge(queryset, streams):
+    key, reverse = _order_key(queryset)
+    if key is None:
+        raise ValueError("ordered=True requer todas as colunas do order_by na mesma direção.")
+    return heapq.merge(*streams, key=key, reverse=reverse)
+
+
+def prepare(queryset, key=None, ordered=False, action="parallel_all"):
+    """Valida o queryset e, com `ordered` sem `order_by()`, ordena pela chave de partição."""
+    _check_supported(queryset, action)
+    if ordered and not queryset._order_by:
+        queryset = queryset._clone()
+        alias = getattr(queryset, "_table_alias", "t1")
+        queryset._order_by = [f"{alias}.{_partition_key(queryset, key)}"]
+    return queryset
+
+
+__all__ = ["prepare", "key_partitions", "fragment_partitions", "run_partitions", "iter_partitions"]
@@ -0,0 +1,82 @@
+import queue
+import threading
+from contextlib import contextmanager
+
+
+class ConnectionPool:
+    """
+        Pool simples de conexões para consultas paralelas (uma conexão por thread).
+
+        Forma de uso:
+        -------------
+        from wbjdbc import connect_to_db
+        pool = wborm.ConnectionPool(lambda: connect_to_db(**params), size=4)
+
+        clientes = Cliente.filter(ativo="S").parallel_all(partitions=4, pool=pool)
+
+        with pool.connection() as conn:
+            conn.execute_query("SELECT ...")
+
+        Observações:
+        ------------
+        - As conexões são abertas sob demanda pela `factory`, até `size` conexões.
+        - Conexões JDBC não são thread-safe: cada conexão é usada por uma thread de cada vez.
+        - `close()` fecha todas as conexões criadas (chama `conn.close()` quando existir).
+        """
+
+    def __init__(self, factory, size=4):
+        if size < 1:
+            raise ValueError("size deve ser maior que zero.")
+        self.factory = factory
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._all = []
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self.size:
+                conn = self.factory()
+                self._all.append(conn)
+                return conn
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"Nenhuma conexão livre no pool após {timeout}s.")
+
+    def release(self, conn):
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        with self._lock:
+            for conn in self._all:
+                close = getattr(conn, "close", None)
+                if close:
+                    close()
+            self._all.clear()
+            self._idle = queue.LifoQueue()
+
+    def __len__(self):
+        return len(self._all)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+__all__ = ["ConnectionPool"]
@@ -1,12 +1,11 @@
 import time
 from tabulate import tabulate
-from wborm.registry import _query_result_cache
+from wborm import stats
+from wborm.cache import CachedRows, cache_get, cache_set, invalidate_tables, single_flight, table_versions, tables_in_sql
 from colorama import Fore, Style
-import os
-import tempfile
-import pickle
+import re
 from wborm.registry import _model_registry
-from hashlib import md5
+from wborm.converters import _ALIAS_COLUMN, hydration_plan, hydrate, split_plan, hydrate_split
 
 class _Alias:
     def __init__(self, alias): self.alias = alias
@@ -20,6 +19,28 @@ def _auto_inject_aliases():
 
 _auto_inject_aliases()  # Executa automaticamente no load do módulo
 
+
+def _is_subquery(values):
+    return isinstance(values, str) and values.strip().upper().startswith("SELECT")
+
+
+def _in_condition(col, vals, op):
+    if isinstance(vals, QuerySet):
+        return f"{col} {op} ({vals._build_query()})"
+    if _is_subquery(vals):
+        return f"{col} {op} ({vals})"
+    lista = ", ".join(f"'{v}'" for v in vals)
+    return f"{col} {op} ({lista})"
+
+
+def _affected_rows(conn, result):
+    """Extrai a quantidade de linhas afetadas do retorno de `conn.execute` (quando disponível)."""
+    if isinstance(result, int) and not isinstance(result, bool):
+        return result
+    rowcount = getattr(conn, "rowcount", None)
+    return rowcount if isinstance(rowcount, int) else None
+
+
 class QuerySet:
     def __init__(self, model, conn):
         self.model = model
@@ -39,6 +60,11 @@ class QuerySet:
         self._preloads = []
         self._cache_enabled = True
         self._cache_ttl = 60
+        self._aggregate_cache_ttl = 10
+        self._in_chunk_size = 1000
+        self._in_temp_threshold = 20000
+        self._split_joins = False
+        self._join_aliases = {}
 
         from wborm.bootstrap import auto_load_cached_models
         auto_load_cached_models(conn)
@@ -97,8 +123,16 @@ class QuerySet:
 
             queryset.filter_in([("t1.cliente_id", [1, 2, 3]), ("t2.cidade", ["Lisboa", "Porto"])])
 
+            queryset.filter_in("cliente_id", Cliente.filter(status="ATIVO").select("id"))
+
             Gera cláusulas como:
                 WHERE status IN ('ATIVO', 'PENDENTE')
+                WHERE cliente_id IN (SELECT id FROM clientes t1 WHERE ...)
+
+            Observações:
+            ------------
+            - Os valores podem ser uma lista, uma SQL de subquery ("SELECT ...") ou outro QuerySet.
+            - Listas grandes são divididas em lotes ou carregadas em tabela temporária (ver `large_in()`).
             """
         if len(args) == 1 and isinstance(args[0], list):
             # Suporta formato: filter_in(t1(coluna=[valores]))
@@ -123,8 +157,12 @@ class QuerySet:
             Gera cláusulas como:
             -------------------
             WHERE status NOT IN ('CANCELADO', 'REJEITADO')
+
+            Observações:
+            ------------
+            - Também aceita uma SQL de subquery ("SELECT ...") ou outro QuerySet.
             """
-        if isinstance(values, str) and values.strip().upper().startswith("SELECT"):
+        if isinstance(values, QuerySet) or _is_subquery(values):
             self._not_in_filters.append((column, values, True))  # flag subquery
         else:
             self._not_in_filters.append((column, values, False))
@@ -197,6 +235,8 @@ class QuerySet:
 
         if alias not in _model_registry and model_to_register:
             _model_registry[alias] = model_to_register
+        if model_to_register:
+            self._join_aliases[alias] = model_to_register
 
         if isinstance(on, (list, tuple)):
             conditions = [f"{self._table_alias}.{col} = {alias}.{col}" for col in on]
@@ -346,11 +386,138 @@ class QuerySet:
 
             Gera cláusulas como:
             --------------------
-            SELECT FIRST 1 1 FROM (<sua_query>) t
+            SELECT FIRST 1 1 AS existe FROM clientes t1 JOIN ... WHERE status = 'ATIVO'
+
+            Observações:
+            ------------
+            - Mantém joins e condições, mas descarta a lista de colunas e o ORDER BY.
+            - Com `distinct()`, `group_by()`, `offset()` ou `raw_sql()`, envolve a consulta em subquery.
+            - O resultado passa pelo cache com TTL próprio (`_aggregate_cache_ttl`).
             """
-        sql = self._build_query()
-        result = self.conn.execute_query(f"SELECT FIRST 1 1 FROM ({sql}) t")
-        return len(result) > 0
+        if self._limit == 0:
+            return False
+        if self._needs_wrapping(limit_matters=True):
+            sql = f"SELECT FIRST 1 1 AS existe FROM ({self._unordered_query()}) t"
+        else:
+            sql = f"SELECT FIRST 1 1 AS existe {self._build_from_where()}"
+        return self._cached_scalar(sql) is not None
+
+    def _needs_wrapping(self, limit_matters):
+        """Indica se count/exists precisam da consulta completa como subquery."""
+        if self._raw_sql or self._distinct or self._group_by or self._having:
+            return True
+        if self._offset:
+            return True
+        return not limit_matters and self._limit is not None
+
+    def _unordered_query(self):
+        """Consulta compilada sem ORDER BY (irrelevante para contagem/existência)."""
+        if self._raw_sql:
+            return self._raw_sql
+        clone = self._clone()
+        clone._order_by = []
+        return clone._build_query()
+
+    def _cached_scalar(self, sql):
+        """
+            Executa uma consulta de valor único (COUNT, FIRST 1) usando o cache de resultados
+            com o TTL de agregações. Retorna o primeiro valor da primeira linha (ou None).
+            """
+        key = self._cache_key(sql)
+        if self._cache_enabled:
+            rows = cache_get(key, self._aggregate_cache_ttl, self._background_refresh(sql, chunks=False))
+            if rows is None:
+                rows = self._fetch_shared(key, sql, chunks=False)
+        else:
+            rows = self._execute(sql, chunks=False)
+        if not rows:
+            return None
+        return next(iter(rows[0].values()), None)
+
+    def explain(self, path=None, show=False):
+        """
+            Captura o plano de execução do Informix para a consulta, sem executá-la.
+
+            Forma de uso:
+            -------------
+            plano = Pedido.filter(status="ABERTO").join(Cliente, "cliente_id").explain()
+            plano.cost              # 1543
+            plano.join_order        # ["informix.t1", "informix.t2"]
+            plano.sequential_scans  # ["informix.t1"]
+            plano.show()
+
+            Gera comandos como:
+            -------------------
+            SET EXPLAIN FILE TO '/tmp/wborm_explain_xxx.out'
+            SET EXPLAIN ON AVOID_EXECUTE
+            SELECT ... (consulta compilada)
+            SET EXPLAIN OFF
+
+            Observações:
+            ------------
+            - Retorna um `QueryPlan` (wborm.explain) com custo, linhas estimadas, caminhos de
+              acesso (SEQUENTIAL SCAN / INDEX PATH), índices usados e ordem de junção.
+            - O arquivo do plano é gravado pelo servidor; se o servidor não for local, informe
+              `path` em um diretório compartilhado.
+            """
+        from wborm.explain import explain_query
+        plan = explain_query(self.conn, self._build_query(), path=path)
+        if show:
+            plan.show()
+        return plan
+
+    def index_report(self, show=True):
+        """
+            Avisa, antes de executar a consulta, quais colunas de filtros, ORDER BY e joins
+            não têm índice utilizável (índice cuja coluna líder seja a coluna usada).
+
+            Forma de uso:
+            -------------
+            Pedido.filter(status="ABERTO").order_by("criado_em").index_report()
+
+            Saída esperada:
+            ---------------
+            ⚠ pedidos.status (filter): nenhum índice com esta coluna como líder
+            ✔ pedidos.criado_em (order_by): índice ix_pedidos_criado
+
+            Observações:
+            ------------
+            - Usa os índices introspectados de sysindexes/sysconstraints (`Model._indexes`).
+            - Retorna a lista de verificações (ver `wborm.indexes.index_report`).
+            """
+        from wborm.indexes import index_report
+        return index_report(self, show=show)
+
+    def large_in(self, chunk_size=None, temp_threshold=None):
+        """
+            Ajusta como listas grandes de `filter_in`/`not_in` são enviadas ao banco.
+
+            Forma de uso:
+            -------------
+            Pedido.filter_in("cliente_id", ids).large_in(chunk_size=500, temp_threshold=5000).all()
+
+            Gera cláusulas como:
+            --------------------
+            Até `chunk_size` valores:      WHERE cliente_id IN ('1', '2', ...)
+            Até `temp_threshold` valores:  um SELECT por lote de `chunk_size` valores, resultados concatenados
+            Acima disso:                   WHERE cliente_id IN (SELECT v FROM tmp_wborm_in1)
+
+            Observações:
+            ------------
+            - Padrões: `chunk_size=1000`, `temp_threshold=20000`.
+            - NOT IN, várias listas grandes, `order_by()`, `limit()`/`offset()`, `distinct()`,
+              `group_by()` e `count()`/`exists()` não podem ser divididos em lotes: usam sempre a
+              tabela temporária (criada com `create_empty_temp_table` e removida ao final).
+            - Valores repetidos na lista são enviados uma única vez.
+            - `iterator()` e as extrações paralelas ainda enviam a lista completa na SQL.
+            """
+        if chunk_size is not None:
+            if chunk_size < 1:
+                raise ValueError("chunk_size deve ser maior que zero.")
+            self._in_chunk_size = chunk_size
+        if temp_threshold is not None:
+            self._in_temp_threshold = temp_threshold
+        return self
 
     def live(self):
         """
@@ -367,10 +534,87 @@ class QuerySet:
         self._cache_enabled = False
         return self
 
+    def split_joins(self):
+        """
+            Hidrata cada alias do join em uma instância do seu próprio modelo, em vez de
+            um objeto plano com atributos `t1_col`, `t2_col` repetidos em todas as linhas.
+
+            Forma de uso:
+            -------------
+            clientes = Cliente.join(Pedido, "cliente_id").split_joins().all()
+            for cliente in clientes:
+                for pedido in cliente.joined("t2"):
+                    print(cliente.nome, pedido.total)
+
+            Observações:
+            ------------
+            - O modelo de cada alias é o informado no `join` (ou o registrado em `_model_registry`).
+            - Pais repetidos (1:N) viram uma única instância, identificada pela chave primária.
+            - O resultado contém apenas as instâncias do modelo principal (t1), sem repetições.
+            - `pedido.joined("t1")` navega de volta para o pai.
+            - Sem efeito com `select()` ou `raw_sql()`.
+            - `limit()`, `offset()` e `first()` não são aceitos: o FIRST/SKIP do banco conta linhas
+              do join, não pais, e cortaria os filhos. Filtre pelo pai (`filter(id=...)`).
+            """
+        self._split_joins = True
+        return self
+
+    def _splitting(self):
+        """True quando o resultado será hidratado por alias (`split_joins()` efetivo)."""
+        return self._split_joins and self._joins and not self._select_fields and not self._raw_sql
+
+    def _clone(self):
+        import copy
+        clone = copy.copy(self)
+        for attr in ("_filters", "_in_filters", "_not_in_filters", "_order_by", "_joins",
+                     "_select_fields", "_group_by", "_preloads"):
+            setattr(clone, attr, list(getattr(self, attr)))
+        clone._join_aliases = dict(self._join_aliases)
+        return clone
+
+    def _output_columns(self):
+        """Nomes das colunas de saída, na ordem do SELECT compilado."""
+        if self._select_fields:
+            columns = []
+            for field in self._select_fields:
+                field = str(field).strip()
+                match = re.search(r"\s+AS\s+(\w+)$", field, re.IGNORECASE)
+                columns.append(match.group(1) if match else field.split(".")[-1])
+            return columns
+
+        alias = getattr(self, "_table_alias", "t1")
+        if not self._joins:
+            return list(self.model._fields)
+
+        columns = [f"{alias}_{col}" for col in self.model._fields]
+        used_aliases = set()
+        for _, join_table, _ in self._joins:
+            join_alias = join_table.split(" AS ")[-1]
+            if join_alias in used_aliases:
+                continue
+            used_aliases.add(join_alias)
+            joined_model = self._alias_model(join_alias)
+            if joined_model and hasattr(joined_model, "_fields"):
+                columns += [f"{join_alias}_{col}" for col in joined_model._fields]
+        return columns
+
     def _cache_key(self, sql):
         import hashlib
         return hashlib.sha256(sql.encode()).hexdigest()
 
+    def _referenced_tables(self, sql=None):
+        """
+            Retorna o conjunto de tabelas lidas pela consulta: tabela base, joins e subqueries.
+
+            Usado para marcar as entradas do cache de resultados, permitindo que escritas
+            feitas pelo wborm invalidem apenas as consultas afetadas.
+            """
+        sql = sql if sql is not None else self._build_query()
+        tables = tables_in_sql(sql)
+        if not self._raw_sql and self.model.__tablename__:
+            tables.add(self.model.__tablename__)
+        return tables
+
     def _build_query(self):
         if self._raw_sql:
             return self._raw_sql
@@ -404,18 +648,41 @@ class QuerySet:
                     continue
                 used_aliases.add(alias)
 
-                joined_model = _model_registry.get(alias)
+                joined_model = self._alias_model(alias)
                 if joined_model and hasattr(joined_model, "_fields"):
                     for col in joined_model._fields:
                         selected_parts.append(f"{alias}.{col} AS {alias}_{col}")
 
             selected = ", ".join(selected_parts)
 
-        sql = f"SELECT {skip_first}{prefix}{selected} FROM {self.model.__tablename__} {self._table_alias}"
+        sql = f"SELECT {skip_first}{prefix}{selected} {self._build_from_where()}"
+
+        if self._group_by:
+            sql += " GROUP BY " + ", ".join(self._group_by)
+
+        if self._having:
+            sql += f" HAVING {self._having}"
+
+        if self._order_by:
+            sql += " ORDER BY " + ", ".join(self._order_by)
+
+        return sql
+
+    def _build_from_where(self):
+        """FROM, JOINs e WHERE da consulta compilada (sem projeção, agrupamento ou ordenação)."""
+        alias = getattr(self, "_table_alias", "t1")
+        sql = f"FROM {self.model.__tablename__} {alias}"
 
         for join_type, join_table, condition in self._joins:
             sql += f" {join_type} JOIN {join_table} ON {condition}"
 
+        conditions = self._build_conditions()
+
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        return sql
+
+    def _build_conditions(self):
         conditions = []
 
         # 📌 Aqui adicionamos o filtro automático para LEFT ANTI ou RIGHT ANTI
@@ -430,68 +697,235 @@ class QuerySet:
             conditions += [f for f in self._filters]
         if self._in_filters:
             for col, vals in self._in_filters:
-                lista = ", ".join(f"'{v}'" for v in vals)
-                conditions.append(f"{col} IN ({lista})")
+                conditions.append(_in_condition(col, vals, "IN"))
         if self._not_in_filters:
-            for col, vals, is_subquery in self._not_in_filters:
-                if is_subquery:
-                    conditions.append(f"{col} NOT IN ({vals})")
-                else:
-                    lista = ", ".join(f"'{v}'" for v in vals)
-                    conditions.append(f"{col} NOT IN ({lista})")
+            for col, vals, _ in self._not_in_filters:
+                conditions.append(_in_condition(col, vals, "NOT IN"))
 
-        if conditions:
-            sql += " WHERE " + " AND ".join(conditions)
+        return conditions
 
-        if self._group_by:
-            sql += " GROUP BY " + ", ".join(self._group_by)
+    def _build_write_where(self, action):
+        """
+            Compila o WHERE do queryset para UPDATE/DELETE em massa.
 
-        if self._having:
-            sql += f" HAVING {self._having}"
+            As condições de nível superior perdem o prefixo do alias base (`t1.`), já que
+            UPDATE e DELETE atuam diretamente sobre a tabela; subqueries são preservadas.
+            """
+        if self._raw_sql:
+            raise ValueError(f"{action} em massa não suporta raw_sql().")
+        if self._joins:
+            raise ValueError(
+                f"{action} em massa não suporta join(). Use filter_in('coluna', outro_queryset) como subquery."
+            )
+        if self._group_by or self._having or self._limit is not None or self._offset:
+            raise ValueError(f"{action} em massa não suporta group_by(), having(), limit() ou offset().")
 
-        if self._order_by:
-            sql += " ORDER BY " + ", ".join(self._order_by)
+        alias = getattr(self, "_table_alias", "t1")
+        # literais entre aspas são casados primeiro e devolvidos intactos: só o alias fora deles sai
+        alias_or_literal = re.compile(rf"('(?:[^']|'')*')|\b{re.escape(alias)}\.")
 
-        return sql
+        def strip_alias(text):
+            return alias_or_literal.sub(lambda m: m.group(1) or "", text)
+
+        conditions = [strip_alias(f) for f in self._filters]
+        for col, vals in self._in_filters:
+            conditions.append(_in_condition(strip_alias(col), vals, "IN"))
+        for col, vals, _ in self._not_in_filters:
+            conditions.append(_in_condition(strip_alias(col), vals, "NOT IN"))
+
+        if not conditions:
+            raise ValueError(f"{action} em massa sem WHERE bloqueado: aplique filter(), filter_in() ou not_in().")
+        return " AND ".join(conditions)
+
+    def _execute_write(self, sql, action):
+        from termcolor import cprint
+
+        try:
+            self.conn.execute("BEGIN WORK")
+            result = stats.timed_write(self.conn, sql)
+            self.conn.execute("COMMIT WORK")
+        except Exception as e:
+            self.conn.execute("ROLLBACK WORK")
+            cprint(f"✖ Falha no {action} em massa de {self.model.__tablename__}: {str(e)}", "red")
+            raise
+
+        invalidate_tables(self.model.__tablename__)
+        affected = _affected_rows(self.conn, result)
+        color = "yellow" if action == "update" else "red"
+        cprint(f"✔ {action} em massa em {self.model.__tablename__}: {affected if affected is not None else '?'} registros", color)
+        return affected
+
+    def update(self, confirm=False, **values):
+        """
+            Atualiza em uma única instrução todos os registros que atendem aos filtros do queryset.
+
+            Forma de uso:
+            -------------
+            Pedido.filter(status="ABERTO").filter_in("cliente_id", [1, 2, 3]).update(status="FECHADO", confirm=True)
+
+            Gera comandos como:
+            -------------------
+            UPDATE pedidos SET status = 'FECHADO' WHERE status = 'ABERTO' AND cliente_id IN ('1', '2', '3')
+
+            Observações:
+            ------------
+            - `confirm=True` é obrigatório e UPDATE sem WHERE é bloqueado.
+            - Suporta filtros IN/NOT IN com listas, SQL de subquery ou outro QuerySet.
+            - Não suporta joins: use `filter_in("coluna", outro_queryset)` como subquery.
+            - Retorna a quantidade de registros afetados (quando informada pela conexão).
+            - Invalida o cache de consultas que dependem da tabela.
+            """
+        if not confirm:
+            raise ValueError("Confirmação necessária: update(confirm=True)")
+        if not values:
+            raise ValueError("Update requer ao menos um campo: ex. update(status='X', confirm=True)")
+
+        where_clause = self._build_write_where("update")
+        updates = []
+        for k, v in values.items():
+            if v is None:
+                updates.append(f"{k} = NULL")
+            else:
+                escaped = str(v).replace("'", "''")
+                updates.append(f"{k} = '{escaped}'")
+        sql = f"UPDATE {self.model.__tablename__} SET {', '.join(updates)} WHERE {where_clause}"
+        return self._execute_write(sql, "update")
+
+    def delete(self, confirm=False):
+        """
+            Exclui em uma única instrução todos os registros que atendem aos filtros do queryset.
+
+            Forma de uso:
+            -------------
+            Pedido.filter(status="CANCELADO").not_in("id", "SELECT pedido_id FROM notas").delete(confirm=True)
+
+            Gera comandos como:
+            -------------------
+            DELETE FROM pedidos WHERE status = 'CANCELADO' AND id NOT IN (SELECT pedido_id FROM notas)
+
+            Observações:
+            ------------
+            - `confirm=True` é obrigatório e DELETE sem WHERE é bloqueado.
+            - `limit()` e `offset()` são recusados: o DELETE atingiria todas as linhas do filtro.
+            - Retorna a quantidade de registros afetados (quando informada pela conexão).
+            """
+        if not confirm:
+            raise ValueError("Confirmação necessária: delete(confirm=True)")
+
+        where_clause = self._build_write_where("delete")
+        sql = f"DELETE FROM {self.model.__tablename__} WHERE {where_clause}"
+        return self._execute_write(sql, "delete")
 
     def preload(self, *relations):
         self._preloads.extend(relations)
         return self
 
     def all(self):
+        if self._splitting() and (self._limit is not None or self._offset):
+            raise ValueError(
+                "split_joins() não aceita limit(), offset() ou first(): o banco limita linhas do join, "
+                "não pais. Filtre pelo pai, ex.: .filter(id=1).split_joins().all()"
+            )
         sql = self._build_query()
         key = self._cache_key(sql)
 
         if self._cache_enabled:
-            cached = _query_result_cache.get(key)
-            if cached:
-                results, timestamp = cached
-                if time.time() - timestamp < self._cache_ttl:
-                    resultset = ResultSet([
-                        self._create_instance_from_row(row) for row in results
-                    ])
-                    if self._select_fields:
-                        resultset._selected_fields = self._select_fields
-                    return resultset
-
-        results = self.conn.execute_query(sql)
-        if self._cache_enabled:
-            _query_result_cache[key] = (results, time.time())
+            results = cache_get(key, self._cache_ttl, self._background_refresh(sql))
+            if results is not None:
+                return self._result_set(results)
+            return self._result_set(self._fetch_shared(key, sql))
+
+        return self._result_set(self._execute(sql))
+
+    def _execute(self, sql, conn=None, chunks=True):
+        """Executa `sql`, dividindo ou trocando por tabela temporária as listas IN grandes."""
+        from wborm.large_in import execute
+        return execute(self, sql, conn=conn, chunks=chunks)
 
-        resultset = ResultSet([
-            self._create_instance_from_row(row) for row in results
-        ], selected_fields=self._select_fields if self._select_fields else None)
-        return resultset
+    def _fetch_shared(self, key, sql, chunks=True):
+        """
+            Executa `sql` e grava no cache, agrupando chamadas concorrentes idênticas
+            (`single_flight`): só a primeira vai ao banco, as demais recebem as mesmas linhas.
+
+            Observações:
+            ------------
+            - As versões das tabelas são lidas antes de executar: se houver escrita durante a
+              consulta, o resultado é devolvido mas não vai para o cache.
+            - Essas versões fazem parte da chave do agrupamento: quem chega depois de uma escrita
+              nunca se junta a uma execução iniciada antes dela (lê a própria escrita).
+            """
+        tables = self._referenced_tables(sql)
+        versions = table_versions(tables)
+
+        def fetch():
+            rows = self._execute(sql, chunks=chunks)
+            cache_set(key, rows, tables, versions=versions)
+            return rows
+
+        return single_flight((key, tuple(sorted(versions.items()))), fetch)
+
+    def _background_refresh(self, sql, chunks=True):
+        """
+            Função que refaz `sql` em uma conexão de `Model._pool`, usada pelo cache para
+            atualizar entradas em segundo plano. Sem pool retorna None: a conexão do queryset
+            não pode ser usada por outra thread.
+            """
+        pool = self.model._pool
+        if pool is None:
+            return None
+
+        def refresh():
+            with pool.connection() as conn:
+                return self._execute(sql, conn=conn, chunks=chunks)
+
+        return refresh
+
+    def _result_set(self, results):
+        if self._splitting():
+            return ResultSet(self._hydrate_split(results), columns=list(self.model._fields))
+        return ResultSet(self._hydrate(results), selected_fields=self._select_fields or None, columns=None if self._raw_sql else self._output_columns())
+
+    def _alias_model(self, alias):
+        return self._join_aliases.get(alias) or _model_registry.get(alias)
+
+    def _join_models(self):
+        models = {}
+        for _, join_table, _ in self._joins:
+            alias = join_table.split(" AS ")[-1]
+            model = self._alias_model(alias)
+            if model is not None:
+                models[alias] = model
+        return models
+
+    def _hydrate(self, rows, columns=None):
+        """
+            Converte as linhas de uma consulta em instâncias do modelo.
+
+            O plano (colunas mantidas, atributos e conversores) é montado a partir da primeira
+            linha e aplicado às demais. Com `columns`, as linhas são tuplas posicionais.
+            """
+        if isinstance(rows, CachedRows):
+            rows, columns = rows.tuples(), rows.columns
+        if not rows:
+            return []
+        keys, positional = (list(rows[0].keys()), False) if columns is None else (columns, True)
+        plan = hydration_plan(self.model, keys, self._join_models(), bool(self._joins), positional)
+        return hydrate(self.model, plan, rows)
+
+    def _hydrate_split(self, rows):
+        if not rows:
+            return []
+        aliases = {getattr(self, "_table_alias", "t1"): self.model, **self._join_models()}
+        return hydrate_split(split_plan(aliases, list(rows[0].keys())), rows)
 
     def _create_instance_from_row(self, row):
-        obj = self.model()
-        for k, v in row.items():
-            k = str(k)
-            if self._joins:  # só ignora sem tX_ se houver joins
-                if not k.startswith("t"):
-                    continue
-            obj.__dict__[k] = v
-        return obj
+        """Hidrata uma única linha, reaproveitando o plano da última forma vista neste queryset."""
+        keys = tuple(row)
+        cached = self.__dict__.get("_row_plan")
+        if cached is None or cached[0] != keys or cached[2] != len(self._joins):
+            plan = hydration_plan(self.model, list(keys), self._join_models(), bool(self._joins))
+            cached = self._row_plan = (keys, plan, len(self._joins))
+        return hydrate(self.model, cached[1], [row])[0]
 
     def first(self):
         """
@@ -519,14 +953,20 @@ class QuerySet:
 
             Gera cláusulas como:
             --------------------
-            SELECT COUNT(*) FROM nome_tabela WHERE status = 'ATIVO'
+            SELECT COUNT(*) AS count FROM clientes t1 JOIN ... WHERE status = 'ATIVO' AND id IN (...)
+
+            Observações:
+            ------------
+            - Considera joins, filtros, `filter_in` e `not_in`; descarta colunas e ORDER BY.
+            - Com `distinct()`, `group_by()`, `limit()`/`offset()` ou `raw_sql()`, conta sobre a
+              consulta completa: SELECT COUNT(*) FROM (...) t
+            - O resultado passa pelo cache com TTL próprio (`_aggregate_cache_ttl`).
             """
-        sql = f"SELECT COUNT(*) as count FROM {self.model.__tablename__}"
-        if self._filters:
-            conditions = ["{} = '{}'".format(k, str(v).replace("'", "''")) for k, v in self._filters]
-            sql += " WHERE " + " AND ".join(conditions)
-        result = self.conn.execute_query(sql)
-        return result[0]["count"] if result else 0
+        if self._needs_wrapping(limit_matters=False):
+            sql = f"SELECT COUNT(*) AS count FROM ({self._unordered_query()}) t"
+        else:
+            sql = f"SELECT COUNT(*) AS count {self._build_from_where()}"
+        return self._cached_scalar(sql) or 0
 
     def max(self, column):
         """
@@ -541,7 +981,7 @@ class QuerySet:
         if self._filters:
             sql += " WHERE " + " AND ".join(self._filters)
 
-        result = self.conn.execute_query(sql)
+        result = stats.timed(self.conn, sql)
         return result[0]["max_value"] if result else None
 
     def min(self, column):
@@ -557,7 +997,7 @@ class QuerySet:
         if self._filters:
             sql += " WHERE " + " AND ".join(self._filters)
 
-        result = self.conn.execute_query(sql)
+        result = stats.timed(self.conn, sql)
         return result[0]["min_value"] if result else None
 
     def sum(self, column):
@@ -573,7 +1013,7 @@ class QuerySet:
         if self._filters:
             sql += " WHERE " + " AND ".join(self._filters)
 
-        result = self.conn.execute_query(sql)
+        result = stats.timed(self.conn, sql)
         return result[0]["sum_value"] if result else None
 
     def show(self, tablefmt="grid"):
@@ -674,6 +1114,169 @@ class QuerySet:
 
         print("\n".join(colored_lines))
 
+    def iterator(self, chunk_size=1000):
+        """
+            Percorre os resultados em blocos, sem carregar tudo em memória e sem usar o cache.
+
+            Forma de uso:
+            -------------
+            for cliente in Cliente.filter(ativo="S").iterator(chunk_size=5000):
+                processar(cliente)
+
+            Observações:
+            ------------
+            - Usa cursor DB-API (`fetchmany`) quando a conexão oferece, senão pagina com `SKIP/FIRST`.
+            - Sem `order_by()`, a paginação ordena pela chave primária para manter páginas estáveis.
+            """
+        from wborm.export import iter_chunks
+        for columns, rows in iter_chunks(self, chunk_size):
+            yield from self._hydrate(rows, columns)
+
+    def parallel_all(self, partitions=4, key=None, method="range", pool=None, ordered=False):
+        """
+            Lê a consulta em `partitions` recortes da chave, em paralelo, e junta os resultados.
+
+            Forma de uso:
+            -------------
+            pool = wborm.ConnectionPool(lambda: connect_to_db(**params), size=4)
+            pedidos = Pedido.filter(ano=2024).parallel_all(partitions=4, pool=pool)
+            pedidos = Pedido.parallel_all(partitions=8, key="id", method="mod", pool=pool, ordered=True)
+
+            Gera cláusulas como:
+            --------------------
+            SELECT MIN(t1.id) AS lo, MAX(t1.id) AS hi FROM pedidos t1 WHERE ano = '2024'
+            SELECT ... WHERE ano = '2024' AND t1.id >= 1 AND t1.id < 250001      (uma por partição)
+            SELECT ... WHERE ano = '2024' AND MOD(t1.id, 8) = 3                   (method="mod")
+
+            Observações:
+            ------------
+            - `key` deve ser inteira; o padrão é a chave primária simples do modelo. Com `key`
+              informada, linhas com a chave NULL vêm de uma partição extra (`t1.chave IS NULL`).
+            - Cada partição usa uma conexão do `pool` (ou `Model._pool`). Sem pool, as partições
+              rodam em sequência na conexão atual (conexões JDBC não são thread-safe).
+            - `ordered=False` (padrão) descarta o ORDER BY nas partições; com `ordered=True` cada
+              partição é ordenada no banco e os resultados são mesclados (ordem da chave, se não
+              houver `order_by()`).
+            - Não suporta `limit()`, `offset()`, `group_by()`, `distinct()` nem `raw_sql()`.
+            """
+        from wborm.parallel import prepare, key_partitions, run_partitions
+        queryset = prepare(self, key, ordered, "parallel_all")
+        conditions = key_partitions(queryset, partitions, key=key, method=method)
+        objs = run_partitions(queryset, conditions, pool=pool if pool is not None else self.model._pool, ordered=ordered)
+        return ResultSet(objs, selected_fields=self._select_fields or None, columns=self._output_columns())
+
+    def parallel_iterator(self, partitions=4, key=None, method="range", pool=None, ordered=False, chunk_size=1000):
+        """
+            Versão em streaming de `parallel_all`: entrega os objetos à medida que as partições
+            são lidas, com memória limitada a alguns blocos por partição.
+
+            Forma de uso:
+            -------------
+            for pedido in Pedido.parallel_iterator(partitions=4, pool=pool, chunk_size=5000):
+                processar(pedido)
+
+            Observações:
+            ------------
+            - Com `ordered=True`, o pool precisa de uma conexão por partição (mescla em streaming).
+            """
+        from wborm.parallel import prepare, key_partitions, iter_partitions
+        queryset = prepare(self, key, ordered, "parallel_iterator")
+        conditions = key_partitions(queryset, partitions, key=key, method=method)
+        yield from iter_partitions(queryset, conditions, pool=pool if pool is not None else self.model._pool,
+                                   ordered=ordered, chunk_size=chunk_size)
+
+    def by_fragment(self, pool=None, ordered=False, chunk_size=1000, key=None, refresh=False):
+        """
+            Lê a consulta seguindo a fragmentação física da tabela (sysfragments): uma consulta
+            por fragmento, em paralelo, em conexões separadas, com os resultados em streaming.
+
+            Forma de uso:
+            -------------
+            for venda in Venda.filter(loja=10).by_fragment(pool=pool):
+                processar(venda)
+
+            Gera cláusulas como:
+            --------------------
+            SELECT ... WHERE loja = '10' AND (ano < 2024)
+            SELECT ... WHERE loja = '10' AND (ano >= 2024 AND ano < 2026)
+            SELECT ... WHERE loja = '10' AND (NOT ((ano < 2024) OR (ano >= 2024 AND ano < 2026)) OR ano IS NULL)
+
+            Observações:
+            ------------
+            - Os fragmentos são introspectados uma vez por modelo (`Model._fragments`); use
+              `refresh=True` após alterar a fragmentação.
+            - Fragmentação por expressão usa as próprias expressões, o que permite a eliminação de
+              fragmentos; expressões que se sobrepõem excluem as anteriores (`AND NOT (e1)`).
+            - Round-robin não tem predicado por fragmento: usa `MOD(chave, nº de fragmentos)`.
+            - Tabela não fragmentada: uma única consulta, como `iterator()`.
+            - Mesmo comportamento de pool e `ordered` de `parallel_iterator`.
+            """
+        from wborm.introspect import get_fragments
+        from wborm.parallel import prepare, fragment_partitions, iter_partitions
+
+        if refresh or self.model.__dict__.get("_fragments") is None:
+            self.model._fragments = get_fragments(self.model.__tablename__, self.conn)
+        fragments = self.model._fragments
+        if not fragments:
+            yield from self.iterator(chunk_size)
+            return
+
+        queryset = prepare(self, key, ordered, "by_fragment")
+        conditions = fragment_partitions(queryset, fragments, key=key)
+        yield from iter_partitions(queryset, conditions, pool=pool if pool is not None else self.model._pool,
+                                   ordered=ordered, chunk_size=chunk_size)
+
+    def to_csv(self, path, chunk_size=5000, compression=None, delimiter=",", header=True):
+        """
+            Exporta o resultado da consulta para CSV em streaming (memória constante).
+
+            Forma de uso:
+            -------------
+            Pedido.filter(status="FECHADO").to_csv("pedidos.csv")
+            Pedido.to_csv("pedidos.csv.gz")                       # gzip pela extensão
+            Pedido.to_csv("pedidos.csv", compression="gzip")
+
+            Observações:
+            ------------
+            - Lê blocos de `chunk_size` linhas direto da conexão e grava sem criar objetos do modelo.
+            - A ordem das colunas segue o SELECT (`select()` ou os campos do modelo).
+            - Retorna a quantidade de linhas exportadas.
+            """
+        from wborm.export import to_csv
+        return to_csv(self, path, chunk_size=chunk_size, compression=compression, delimiter=delimiter, header=header)
+
+    def to_jsonl(self, path, chunk_size=5000, compression=None):
+        """
+            Exporta o resultado da consulta para JSON Lines (um objeto por linha) em streaming.
+
+            Forma de uso:
+            -------------
+            Pedido.filter(status="FECHADO").to_jsonl("pedidos.jsonl.gz")
+
+            Observações:
+            ------------
+            - Valores não serializáveis (datas, decimais, tipos Java) são convertidos para texto.
+            - Retorna a quantidade de linhas exportadas.
+            """
+        from wborm.export import to_jsonl
+        return to_jsonl(self, path, chunk_size=chunk_size, compression=compression)
+
+    def to_parquet(self, path, chunk_size=50000, compression="snappy"):
+        """
+            Exporta o resultado da consulta para Parquet, gravando um row group por bloco.
+
+            Forma de uso:
+            -------------
+            Pedido.filter(status="FECHADO").to_parquet("pedidos.parquet", compression="gzip")
+
+            Observações:
+            ------------
+            - Requer `pyarrow` (`pip install wborm[parquet]`).
+            - Retorna a quantidade de linhas exportadas.
+            """
+        from wborm.export import to_parquet
+        return to_parquet(self, path, chunk_size=chunk_size, compression=compression)
+
     def create_temp_table(self, temp_name, with_log=False):
         """
             Cria uma tabela temporária com base na consulta atual.
@@ -700,12 +1303,13 @@ class QuerySet:
 
         print(f"Criando tabela temporária:\n{create_sql}")
         self.conn.execute_query(create_sql)
+        invalidate_tables(temp_name)
 
         # Sempre retorna o Model, mesmo se estiver vazia
         from wborm.utils import generate_model
         return generate_model(temp_name, self.conn, inject_globals=True)
 
-    def create_empty_temp_table(self, temp_name, columns, with_log=False):
+    def create_empty_temp_table(self, temp_name, columns, with_log=False, as_model=True):
         """
         Cria uma tabela temporária vazia com schema explícito.
 
@@ -719,6 +1323,9 @@ class QuerySet:
                 ],
                 with_log=False
             )
+
+        Use `as_model=False` para apenas criar a tabela (sem introspecção nem geração de modelo),
+        como em tabelas de staging de curta duração.
         """
         log_clause = "WITH LOG" if with_log else "WITH NO LOG"
         cols = ",\n    ".join([f"{name} {dtype}" for name, dtype in columns])
@@ -730,6 +1337,10 @@ class QuerySet:
                 """
         print(f"Criando tabela temporária vazia:\n{create_sql}")
         self.conn.execute_query(create_sql)
+        invalidate_tables(temp_name)
+
+        if not as_model:
+            return None
 
         from wborm.utils import generate_model
         model = generate_model(temp_name, self.conn, inject_globals=True)
@@ -758,50 +1369,81 @@ class QuerySet:
         else:
             insert_sql = f"INSERT INTO {table_name} {sql}"
         self.conn.execute_query(insert_sql)
+        invalidate_tables(table_name)
         return self
 
+def _is_blank(value):
+    return value is None or str(value).strip() == ""
+
+
 class ResultSet(list):
-    def __init__(self, data=None, selected_fields=None):
+    def __init__(self, data=None, selected_fields=None, columns=None):
         super().__init__(data or [])
         self._selected_fields = selected_fields
-        self._render_cache = None
-        self._disk_cache_path = None
-        self._disk_cache_time = None 
+        self._columns = columns
+        self._render_cache = {}
 
     def clear_render_cache(self):
-        self._render_cache = None
-        if self._disk_cache_path and os.path.exists(self._disk_cache_path):
-            os.remove(self._disk_cache_path)
-            self._disk_cache_path = None
-            self._disk_cache_time = None
-
-    def _write_to_disk_cache(self, headers, rows):
-        h = md5("|".join(headers).encode()).hexdigest()
-        path = os.path.join(tempfile.gettempdir(), f"resultset_{h}.wbormcache")
-
-        def _convert_to_python(value):
-            try:
-                return str(value)
-            except Exception:
-                return value
-
-        # Conversão de todos os valores da tabela
-        safe_rows = [[_convert_to_python(cell) for cell in row] for row in rows]
-
-        with open(path, "wb") as f:
-            pickle.dump((headers, safe_rows), f)
-
-        self._disk_cache_path = path
-        self._disk_cache_time = time.time()
-
-    def _read_from_disk_cache(self):
-        if not self._disk_cache_path:
-            return None, None
-        try:
-            with open(self._disk_cache_path, "rb") as f:
-                return pickle.load(f)
-        except Exception:
-            return None, None
+        self._render_cache = {}
+
+    def invalidate_lazy(self, *attrs):
+        """
+            Remove, de todos os objetos do resultado, o cache de atributos lazy e de relações.
+
+            Forma de uso:
+            -------------
+            pedidos = Pedido.filter(status="ABERTO").all()
+            pedidos.invalidate_lazy("cliente")   # só a relação "cliente"
+            pedidos.invalidate_lazy()            # todos os atributos `_lazy_*`
+
+            Observações:
+            ------------
+            - Retorna a quantidade de entradas removidas.
+            """
+        from termcolor import cprint
+        names = {f"_lazy_{attr}" for attr in attrs}
+        removed = 0
+        for obj in self:
+            state = getattr(obj, "__dict__", {})
+            for name in [k for k in state if k.startswith("_lazy_") and (not names or k in names)]:
+                del state[name]
+                removed += 1
+        if removed:
+            cprint(f"⚠ Cache lazy invalidado em {removed} atributo(s)", "cyan")
+        return removed
+
+    def _headers(self, hide_empty_columns):
+        """
+            Calcula (uma única vez por formato) as colunas exibidas e seus rótulos.
+
+            Usa a ordem de colunas compilada da consulta; só recorre aos atributos do
+            primeiro objeto quando o ResultSet foi montado sem essa informação.
+            """
+        cache_key = ("headers", hide_empty_columns, len(self))
+        cached = self._render_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        sample = self[0].__dict__
+        columns = self._columns
+        if not columns or any(c not in sample for c in columns):
+            columns = list(self[0].to_dict().keys())
+        if hide_empty_columns:
+            columns = [c for c in columns if any(not _is_blank(getattr(obj, c, None)) for obj in self)]
+        labels = [c.replace("_", ".", 1) if _ALIAS_COLUMN.match(c) else c for c in columns]
+
+        self._render_cache[cache_key] = (columns, labels)
+        return columns, labels
+
+    def _render_page(self, start, end, tablefmt, hide_empty_columns):
+        cache_key = ("page", start, end, tablefmt, hide_empty_columns, len(self))
+        rendered = self._render_cache.get(cache_key)
+        if rendered is None:
+            columns, labels = self._headers(hide_empty_columns)
+            rows = [[getattr(obj, c, "") for c in columns] for obj in self[start:end]]
+            rendered = tabulate(rows, headers=labels, tablefmt=tablefmt)
+            self._render_cache[cache_key] = rendered
+        return rendered
 
     def show(self, tablefmt="grid", hide_empty_columns=False, page_size=50, reset=False):
         """
@@ -830,72 +1472,25 @@ class ResultSet(list):
             page_size : int or None
                 Define a quantidade de linhas por página (paginação no terminal). Se None, mostra tudo de uma vez.
             reset : bool
-                Ignora cache local e força novo processamento da tabela.
+                Descarta as páginas já renderizadas e força novo processamento da tabela.
+
+            Observações:
+            ------------
+            - Os cabeçalhos vêm da forma da consulta e são calculados uma única vez.
+            - Apenas a página exibida é formatada; páginas já vistas ficam em cache na memória do ResultSet.
             """
         if not self:
             print("Nenhum resultado encontrado.")
             return
 
-        import time
-        from tabulate import tabulate
-        from colorama import Fore, Style
-        from collections import OrderedDict
-        import re
-        from hashlib import md5
-
-        now = time.time()
-
-        headers, rows = None, None
-
-        if not reset and self._disk_cache_path and self._disk_cache_time and (now - self._disk_cache_time < 120):
-            headers, rows = self._read_from_disk_cache()
-
-        if headers is None or rows is None:
-            seen = OrderedDict()
-            for obj in self:
-                for k in obj.to_dict().keys():
-                    if k not in seen:
-                        seen[k] = True
-
-            all_keys = list(seen.keys())
-            has_alias = any(re.match(r"t\d+_", k) for k in all_keys)
-            headers = []
-
-            if has_alias:
-                from wborm.registry import _model_registry
-                aliases = sorted(set(re.match(r"(t\d+)_", k).group(1) for k in all_keys if re.match(r"(t\d+)_", k)))
-                for alias in aliases:
-                    model = _model_registry.get(alias)
-                    if model and hasattr(model, "_fields"):
-                        for field in model._fields:
-                            alias_field = f"{alias}_{field}"
-                            if alias_field in all_keys:
-                                headers.append(alias_field)
-                    else:
-                        headers += [k for k in all_keys if k.startswith(f"{alias}_") and k not in headers]
-            else:
-                headers = list(seen.keys())
-
-            rows = [[getattr(obj, h, "") for h in headers] for obj in self]
-
-            if hide_empty_columns:
-                col_indexes_to_keep = [
-                    idx for idx, h in enumerate(headers)
-                    if any(str(row[idx]).strip() != "" for row in rows)
-                ]
-                headers = [headers[i] for i in col_indexes_to_keep]
-                headers = [h.replace("_", ".", 1) if re.match(r"t\d+_", h) else h for h in headers]
-                rows = [[row[i] for i in col_indexes_to_keep] for row in rows]
-            else:
-                headers = [h.replace("_", ".", 1) if re.match(r"t\d+_", h) else h for h in headers]
-
-            self._write_to_disk_cache(headers, rows)
+        if reset:
+            self.clear_render_cache()
 
         model_cls = self[0].__class__
         cor = Fore.GREEN if not getattr(model_cls, "_from_cache", False) else Fore.BLUE
 
-        def print_page(rows_subset):
-            tabela = tabulate(rows_subset, headers=headers, tablefmt=tablefmt)
+        def print_page(start, end):
+            tabela = self._render_page(start, end, tablefmt, hide_empty_columns)
             linhas_coloridas = []
             for linha in tabela.splitlines():
                 if linha and (linha[0] in "+╒╞╘╤╧═" or all(c in "+-=│╒╞╘╤╧═│ " for c in linha)):
@@ -904,13 +1499,13 @@ class ResultSet(list):
                     linhas_coloridas.append(linha)
             print("\n".join(linhas_coloridas))
 
+        total = len(self)
         if page_size is None:
-            print_page(rows)
+            print_page(0, total)
         else:
-            total = len(rows)
             for start in range(0, total, page_size):
                 end = min(start + page_size, total)
-                print_page(rows[start:end])
+                print_page(start, end)
                 if end < total:
                     res = input(
                         f"\n🔽 Mostrando {start + 1}–{end} de {total}. Pressione Enter para continuar ou 'q' para sair...\n")
@@ -1,4 +1,5 @@
 _model_registry = {}
 _model_cache = {}
 _query_result_cache = {}  # Global TTL cache
+_cache_table_index = {}  # tabela -> chaves do cache que dependem dela
 _connection = None  # Conexão global compartilhada
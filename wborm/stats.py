@@ -0,0 +1,181 @@
+import re
+import threading
+import time
+from collections import deque
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])[-+]?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_REPEATED_GROUP = re.compile(r"(\([^()]*\))(?:\s+OR\s+\1)+", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+_TEMP_IN_TABLE = re.compile(r"\btmp_wborm_in\d+\b")
+
+_SAMPLES = 1000
+_MAX_FINGERPRINTS = 5000
+
+_lock = threading.Lock()
+_entries = {}
+_state = {"enabled": True, "dropped": 0}
+
+
+def fingerprint(sql):
+    """
+        Forma normalizada de uma SQL: literais viram `?` e listas IN viram `IN (?)`.
+
+        Forma de uso:
+        -------------
+        fingerprint("SELECT t1.id FROM clientes t1 WHERE nome = 'Ana' AND id IN ('1', '2') SKIP 0 FIRST 10")
+
+        Retorna:
+        --------
+        "SELECT t1.id FROM clientes t1 WHERE nome = ? AND id IN (?) SKIP ? FIRST ?"
+
+        Observações:
+        ------------
+        - Números dentro de identificadores (`t1`, `tmp_2024`) são preservados, exceto nas
+          tabelas temporárias das listas IN grandes (`tmp_wborm_in17` vira `tmp_wborm_in?`).
+        - Grupos repetidos ligados por OR (chaves compostas em `get_many`) viram um único grupo.
+        """
+    text = _STRING.sub("?", sql or "")
+    text = _TEMP_IN_TABLE.sub("tmp_wborm_in?", text)
+    text = _NUMBER.sub("?", text)
+    text = _IN_LIST.sub("IN (?)", text)
+    text = _REPEATED_GROUP.sub(r"\1", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+class _Entry:
+    __slots__ = ("count", "total", "max", "rows", "samples", "example")
+
+    def __init__(self, example):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.samples = deque(maxlen=_SAMPLES)
+        self.example = example
+
+
+def record(sql, seconds, rows=None):
+    """
+        Acumula uma execução de `sql` (duração em segundos e linhas retornadas/afetadas)
+        na impressão digital correspondente.
+        """
+    if not _state["enabled"]:
+        return
+    key = fingerprint(sql)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            if len(_entries) >= _MAX_FINGERPRINTS:
+                _state["dropped"] += 1
+                return
+            entry = _entries[key] = _Entry(sql[:500])
+        entry.count += 1
+        entry.total += seconds
+        entry.max = max(entry.max, seconds)
+        entry.rows += rows or 0
+        entry.samples.append(seconds)
+
+
+def timed(conn, sql):
+    """Executa `conn.execute_query(sql)` registrando duração e linhas."""
+    start = time.perf_counter()
+    rows = conn.execute_query(sql)
+    record(sql, time.perf_counter() - start, len(rows) if rows is not None else None)
+    return rows
+
+
+def timed_write(conn, sql):
+    """Executa `conn.execute(sql)` registrando duração e linhas afetadas (quando informadas)."""
+    start = time.perf_counter()
+    result = conn.execute(sql)
+    affected = result if isinstance(result, int) and not isinstance(result, bool) else None
+    record(sql, time.perf_counter() - start, affected)
+    return result
+
+
+def _p95(samples):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+def top(n=10, by="total", show=True):
+    """
+        Relatório das impressões digitais mais caras do processo.
+
+        Forma de uso:
+        -------------
+        wborm.stats.top(10)                  # por tempo total
+        wborm.stats.top(5, by="p95")         # por latência p95
+
+        Gera estruturas como:
+        ---------------------
+        [
+            {"fingerprint": "SELECT ... WHERE t1.status = ?", "count": 1200, "total": 38.2,
+             "avg": 0.0318, "p95": 0.091, "max": 0.4, "rows": 96000, "avg_rows": 80.0,
+             "example": "SELECT ... WHERE t1.status = 'ABERTO'"},
+        ]
+
+        Observações:
+        ------------
+        - `by`: "total", "avg", "p95", "max", "count" ou "rows".
+        - Tempos em segundos; o p95 considera as últimas 1000 execuções de cada forma.
+        - Registra cada comando que vai ao banco: consultas de `all()`, `count()`, `exists()`,
+          `iterator()`, agregações e `get()`/`get_many()`; lotes e tabelas temporárias de listas
+          IN grandes; partições de `parallel_*`/`by_fragment` (e o MIN/MAX das faixas); escritas
+          (`add`, `update`, `delete`, em massa, `bulk_load`, `bulk_upsert` e `Session.flush`).
+        - Não entram BEGIN/COMMIT/ROLLBACK nem acertos do cache: só o que foi ao banco.
+        """
+    if by not in ("total", "avg", "p95", "max", "count", "rows"):
+        raise ValueError("by deve ser 'total', 'avg', 'p95', 'max', 'count' ou 'rows'.")
+    with _lock:
+        items = [(key, e.count, e.total, e.max, e.rows, list(e.samples), e.example) for key, e in _entries.items()]
+
+    report = [
+        {
+            "fingerprint": key,
+            "count": count,
+            "total": total,
+            "avg": total / count,
+            "p95": _p95(samples),
+            "max": maximum,
+            "rows": rows,
+            "avg_rows": rows / count,
+            "example": example,
+        }
+        for key, count, total, maximum, rows, samples, example in items
+        if count
+    ]
+    report.sort(key=lambda item: item[by], reverse=True)
+    report = report[:n]
+
+    if show:
+        from tabulate import tabulate
+        from termcolor import cprint
+
+        cprint(f"📊 Top {len(report)} formas de consulta por {by}", "cyan")
+        table = [
+            [r["count"], f"{r['total']:.3f}", f"{r['avg'] * 1000:.1f}", f"{r['p95'] * 1000:.1f}",
+             f"{r['avg_rows']:.1f}", r["fingerprint"][:120]]
+            for r in report
+        ]
+        print(tabulate(table, headers=["n", "total (s)", "média (ms)", "p95 (ms)", "linhas/exec", "consulta"]))
+        if _state["dropped"]:
+            cprint(f"⚠ {_state['dropped']} execuções ignoradas: limite de {_MAX_FINGERPRINTS} formas atingido", "yellow")
+    return report
+
+
+def reset():
+    """Descarta todas as estatísticas acumuladas."""
+    with _lock:
+        _entries.clear()
+        _state["dropped"] = 0
+
+
+def enable(flag=True):
+    """Liga ou desliga a coleta (ligada por padrão)."""
+    _state["enabled"] = bool(flag)
+
+
+__all__ = ["fingerprint", "record", "timed", "timed_write", "top", "reset", "enable"]
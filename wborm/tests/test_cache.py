@@ -0,0 +1,239 @@
+# tests/test_cache.py
+import pytest
+from wborm.core import Model
+from wborm.fields import Field
+from wborm.cache import tables_in_sql, invalidate_tables, clear_cache, cache_stats
+
+
+class DummyConnection:
+    def __init__(self):
+        self.queries = []
+
+    def execute(self, sql):
+        self.queries.append(sql)
+
+    def execute_query(self, sql):
+        self.queries.append(sql)
+        return [{"id": 1, "nome": "Teste"}]
+
+
+class Cliente(Model):
+    __tablename__ = "clientes"
+    id = Field(int, primary_key=True)
+    nome = Field(str)
+
+
+class Pedido(Model):
+    __tablename__ = "pedidos"
+    id = Field(int, primary_key=True)
+    cliente_id = Field(int)
+
+
+@pytest.fixture
+def conn():
+    clear_cache()
+    conn = DummyConnection()
+    Cliente._connection = conn
+    Pedido._connection = conn
+    return conn
+
+
+def test_tables_in_sql_inclui_joins_e_subqueries():
+    sql = (
+        "SELECT t1.id FROM clientes t1 LEFT JOIN pedidos AS t2 ON t1.id = t2.cliente_id "
+        "WHERE t1.id NOT IN (SELECT cliente_id FROM informix.bloqueios)"
+    )
+    assert tables_in_sql(sql) == {"clientes", "pedidos", "bloqueios"}
+
+
+def test_escrita_invalida_apenas_consultas_dependentes(conn):
+    Cliente.filter(nome="Ana").all()
+    Pedido.filter(cliente_id=1).all()
+    assert cache_stats()["entries"] == 2
+
+    Cliente(id=2, nome="Bia").add(confirm=True)
+
+    assert cache_stats()["entries"] == 1
+    executed = len(conn.queries)
+    Pedido.filter(cliente_id=1).all()
+    assert len(conn.queries) == executed
+
+
+def test_join_fica_marcado_com_as_duas_tabelas(conn):
+    Cliente.join(Pedido, "id").all()
+    assert invalidate_tables("pedidos") == 1
+    assert cache_stats()["entries"] == 0
+
+
+def test_cache_armazena_colunar_e_comprime_entradas_grandes():
+    from wborm.cache import CachedRows, cache_get, cache_set, cache_stats, clear_cache, configure_cache
+
+    clear_cache()
+    rows = [{"id": i, "nome": "cliente", "cidade": "Lisboa"} for i in range(2000)]
+    opcoes = configure_cache(compress_min_bytes=1024)
+    try:
+        cache_set("k", rows, {"clientes"})
+    finally:
+        configure_cache(compress_min_bytes=256 * 1024)
+
+    cached = cache_get("k", ttl=60)
+    stats = cache_stats()
+
+    assert isinstance(cached, CachedRows) and cached.compressed
+    assert cached.columns == ["id", "nome", "cidade"]
+    assert len(cached) == 2000 and cached[5] == rows[5] and list(cached)[-1] == rows[-1]
+    assert stats["compressed_entries"] == 1 and 0 < stats["bytes"] < stats["raw_bytes"]
+    assert opcoes["compress_min_bytes"] == 1024
+
+    clear_cache()
+    assert cache_stats()["bytes"] == 0
+
+
+def test_cache_converte_valores_do_driver_antes_de_comprimir():
+    from wborm.cache import CachedRows
+
+    class Valor:  # classe local: o pickle não consegue serializar, como um objeto Java
+        def __str__(self):
+            return "SP"
+
+    rows = [{"id": i, "uf": Valor()} for i in range(2000)]
+    cached = CachedRows.encode(rows, compress_min_bytes=1024)
+
+    assert cached.compressed
+    assert cached[10] == {"id": 10, "uf": "SP"}
+
+
+def test_entrada_vencida_e_servida_enquanto_atualiza_em_segundo_plano(conn, monkeypatch):
+    import time
+    import threading
+    from wborm import cache
+    from wborm.pool import ConnectionPool
+
+    liberado = threading.Event()
+
+    class SlowConnection(DummyConnection):
+        def execute_query(self, sql):
+            liberado.wait(2)
+            return [{"id": 1, "nome": "Atualizado"}]
+
+    pool = ConnectionPool(SlowConnection, size=1)
+    monkeypatch.setattr(Cliente, "_pool", pool)
+    cache.configure_cache(stale_grace=30)
+    try:
+        qs = Cliente.filter(id=1)
+        assert qs.all()[0].nome == "Teste"
+
+        key = next(iter(cache._query_result_cache))
+        results, _, tables = cache._query_result_cache[key]
+        cache._query_result_cache[key] = (results, time.time() - 70, tables)
+        antes = cache.cache_stats()["stale_hits"]
+
+        assert qs.all()[0].nome == "Teste"          # vencido, mas dentro da janela
+        assert qs.all()[0].nome == "Teste"          # atualização única já em andamento
+        assert cache.cache_stats()["stale_hits"] - antes == 2 and len(conn.queries) == 1
+
+        liberado.set()
+        for _ in range(100):
+            if not cache._refreshing and cache.cache_stats()["refreshes"]:
+                break
+            time.sleep(0.01)
+
+        assert qs.all()[0].nome == "Atualizado"
+        assert len(conn.queries) == 1 and len(pool) == 1
+    finally:
+        cache.configure_cache(stale_grace=0)
+
+
+def test_consultas_identicas_concorrentes_executam_uma_vez(conn):
+    import threading
+    import time
+    from wborm import cache
+
+    liberado = threading.Event()
+    original = conn.execute_query
+
+    def lenta(sql):
+        liberado.wait(2)
+        return original(sql)
+
+    conn.execute_query = lenta
+    resultados = []
+    antes = cache.cache_stats()["coalesced"]
+    threads = [threading.Thread(target=lambda: resultados.append(Cliente.filter(id=1).all())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for _ in range(200):
+        if cache.cache_stats()["coalesced"] - antes == 7:
+            break
+        time.sleep(0.01)
+    liberado.set()
+    for t in threads:
+        t.join()
+
+    assert len(conn.queries) == 1
+    assert [r[0].nome for r in resultados] == ["Teste"] * 8
+
+
+def test_escrita_durante_a_consulta_nao_volta_para_o_cache_nem_e_compartilhada(conn):
+    import threading
+
+    iniciado, liberado = threading.Event(), threading.Event()
+    original = conn.execute_query
+
+    def lenta(sql):
+        conn.queries.append(sql)
+        if len(conn.queries) > 1:
+            return [{"id": 1, "nome": "Depois"}]
+        iniciado.set()
+        liberado.wait(2)
+        return [{"id": 1, "nome": "Antes"}]
+
+    conn.execute_query = lenta
+    lider = []
+    t = threading.Thread(target=lambda: lider.append(Cliente.filter(id=1).all()))
+    t.start()
+    iniciado.wait(2)
+
+    invalidate_tables("clientes")  # escrita confirmada enquanto a consulta do líder roda
+    depois = Cliente.filter(id=1).all()  # não espera o voo antigo: lê a própria escrita
+    liberado.set()
+    t.join()
+
+    assert depois[0].nome == "Depois" and lider[0][0].nome == "Antes"
+    assert len(conn.queries) == 2
+    assert Cliente.filter(id=1).all()[0].nome == "Depois"  # o resultado antigo não foi gravado
+    conn.execute_query = original
+
+
+def test_single_flight_propaga_erro_e_timeout():
+    import threading
+    from wborm.cache import single_flight
+
+    iniciado, liberado = threading.Event(), threading.Event()
+
+    def falha():
+        iniciado.set()
+        liberado.wait(2)
+        raise ValueError("banco indisponível")
+
+    lider = threading.Thread(target=lambda: pytest.raises(ValueError, single_flight, "q", falha))
+    lider.start()
+    iniciado.wait(2)
+
+    with pytest.raises(TimeoutError):
+        single_flight("q", falha, timeout=0.01)
+
+    erros = []
+
+    def esperar():
+        try:
+            single_flight("q", falha, timeout=2)
+        except ValueError as e:
+            erros.append(e)
+
+    seguidor = threading.Thread(target=esperar)
+    seguidor.start()
+    liberado.set()
+    lider.join()
+    seguidor.join()
+    assert [str(e) for e in erros] == ["banco indisponível"]
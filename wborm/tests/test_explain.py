@@ -0,0 +1,80 @@
+# tests/test_explain.py
+import re
+from wborm.core import Model
+from wborm.fields import Field
+from wborm.explain import parse_explain
+
+PLANO = """
+QUERY: (OPTIMIZATION TIMESTAMP: 10-19-2026 10:00:00)
+------
+SELECT t1.id AS t1_id FROM pedidos t1 INNER JOIN clientes AS t2 ON t1.cliente_id = t2.id WHERE t1.status = 'A'
+
+Estimated Cost: 154
+Estimated # of Rows Returned: 12
+
+  1) informix.t1: SEQUENTIAL SCAN
+
+        Filters: informix.t1.status = 'A'
+
+  2) informix.t2: INDEX PATH
+
+    (1) Index Name: informix.pk_clientes
+        Index Keys: id   (Serial, fragments: ALL)
+        Lower Index Filter: informix.t1.cliente_id = informix.t2.id
+NESTED LOOP JOIN
+
+"""
+
+
+class ExplainConnection:
+    """Simula o servidor: grava o plano no arquivo indicado por SET EXPLAIN FILE."""
+
+    def __init__(self):
+        self.queries = []
+        self.path = None
+        self.explain_on = False
+
+    def execute(self, sql):
+        self.queries.append(sql)
+        match = re.match(r"SET EXPLAIN FILE TO '(.+)'", sql)
+        if match:
+            self.path = match.group(1)
+        self.explain_on = sql.startswith("SET EXPLAIN ON")
+
+    def execute_query(self, sql):
+        self.queries.append(sql)
+        if self.explain_on:
+            with open(self.path, "a") as f:
+                f.write(PLANO)
+        return []
+
+
+class Pedido(Model):
+    __tablename__ = "pedidos"
+    id = Field(int, primary_key=True)
+    status = Field(str)
+
+
+def test_parse_explain_extrai_acessos_custo_e_ordem():
+    plan = parse_explain(PLANO)
+
+    assert plan.cost == 154 and plan.rows == 12
+    assert plan.join_order == ["informix.t1", "informix.t2"]
+    assert plan.sequential_scans == ["informix.t1"]
+    assert plan.steps[1].index == "informix.pk_clientes"
+    assert plan.steps[1].index_keys == ["id"]
+    assert plan.joins == ["NESTED LOOP JOIN"]
+
+
+def test_explain_usa_avoid_execute_e_le_apenas_o_plano_novo(tmp_path):
+    conn = ExplainConnection()
+    Pedido._connection = conn
+    path = tmp_path / "plano.out"
+    path.write_text(PLANO.replace("154", "999"))
+
+    plan = Pedido.filter(status="A").explain(path=str(path))
+
+    assert conn.queries[1] == "SET EXPLAIN ON AVOID_EXECUTE"
+    assert conn.queries[-1] == "SET EXPLAIN OFF"
+    assert plan.cost == 154
+    assert plan.sql.startswith("SELECT t1.id")
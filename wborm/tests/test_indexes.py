@@ -0,0 +1,131 @@
+# tests/test_indexes.py
+from wborm.core import Model
+from wborm.fields import Field
+from wborm.introspect import get_indexes
+
+
+class CatalogConnection:
+    def execute_query(self, sql):
+        if "sysindexes" in sql:
+            base = {f"part{n}": 0 for n in range(1, 17)}
+            return [
+                {**base, "idxname": "pk_pedidos", "idxtype": "U", "part1": 1, "constrtype": "P"},
+                {**base, "idxname": "ix_ped_cli", "idxtype": "D", "part1": 3, "part2": -2, "constrtype": None},
+            ]
+        return [
+            {"name": "id", "type": "SERIAL", "position": 1},
+            {"name": "status", "type": "CHAR", "position": 2},
+            {"name": "cliente_id", "type": "INTEGER", "position": 3},
+        ]
+
+
+class Pedido(Model):
+    __tablename__ = "pedidos"
+    id = Field(int, primary_key=True)
+    status = Field(str)
+    cliente_id = Field(int)
+
+
+class Cliente(Model):
+    __tablename__ = "clientes"
+    id = Field(int, primary_key=True)
+
+
+def test_get_indexes_resolve_colunas_e_constraints():
+    indexes = get_indexes("pedidos", CatalogConnection())
+
+    assert indexes == [
+        {"name": "pk_pedidos", "columns": ["id"], "unique": True, "constraint": "P"},
+        {"name": "ix_ped_cli", "columns": ["cliente_id", "status"], "unique": False, "constraint": None},
+    ]
+
+
+def test_index_report_aponta_colunas_sem_indice_lider():
+    Pedido._indexes = get_indexes("pedidos", CatalogConnection())
+    Pedido._connection = CatalogConnection()
+
+    qs = Pedido.filter("t1.status = 'id = 1'").filter_in("cliente_id", [1]).join(Cliente, "id").order_by("t1.status")
+    report = qs.index_report(show=False)
+
+    indexed = {(r["table"], r["column"], r["source"]): r["indexed"] for r in report}
+    assert indexed[("pedidos", "status", "filter")] is False
+    assert indexed[("pedidos", "cliente_id", "filter_in")] is True
+    assert indexed[("pedidos", "id", "join")] is True
+    assert indexed[("clientes", "id", "join")] is None
+    assert indexed[("pedidos", "status", "order_by")] is False
+    assert ("pedidos", "id", "filter") not in indexed
+
+
+def test_chave_primaria_composta_persiste_no_cache_de_modelos(tmp_path, monkeypatch):
+    from wborm.introspect import get_primary_key
+    from wborm.model_cache import save_model_to_disk, try_load_model_from_disk
+
+    base = {f"part{n}": 0 for n in range(1, 17)}
+    indexes_rows = [{**base, "idxname": "pk_itens", "idxtype": "U", "part1": 1, "part2": 2, "constrtype": "P"}]
+    conn = CatalogConnection()
+    conn.execute_query = lambda sql: indexes_rows if "sysindexes" in sql else [
+        {"name": "pedido_id", "position": 1}, {"name": "item", "position": 2}, {"name": "qtd", "position": 3},
+    ]
+    assert get_primary_key("itens", conn) == ["pedido_id", "item"]
+
+    class Itens(Model):
+        __tablename__ = "itens"
+        pedido_id = Field(int, primary_key=True, nullable=False)
+        item = Field(int, primary_key=True, nullable=False)
+        qtd = Field(int)
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".wbmodels").mkdir()
+    save_model_to_disk("itens", Itens)
+    loaded = try_load_model_from_disk("itens", conn)
+
+    assert loaded._primary_keys() == ["pedido_id", "item"]
+
+
+def test_modelo_gerado_com_pk_serial_aceita_add_sem_id(tmp_path, monkeypatch):
+    from wborm.utils import generate_model
+
+    class WriteCatalogConnection(CatalogConnection):
+        def __init__(self):
+            self.executed = []
+
+        def execute(self, sql):
+            self.executed.append(sql)
+
+    from wborm.model_cache import generate_model_stub
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("wborm.utils.generate_model_stub", lambda: generate_model_stub(str(tmp_path / "models.pyi")))
+    (tmp_path / ".wbmodels").mkdir()
+    conn = WriteCatalogConnection()
+    Pedidos = generate_model("pedidos", conn, refresh=True, inject_globals=False)
+
+    assert Pedidos._primary_keys() == ["id"]
+    Pedidos(status="A", cliente_id=1).add(confirm=True)
+    assert "INSERT INTO pedidos (status, cliente_id) VALUES ('A', '1')" in conn.executed
+
+    Pedidos.bulk_add([Pedidos(status="B", cliente_id=2), Pedidos(id=7, status="C", cliente_id=3)], confirm=True)
+    assert "INSERT INTO pedidos (status, cliente_id) VALUES ('B', '2')" in conn.executed
+    assert "INSERT INTO pedidos (id, status, cliente_id) VALUES ('7', 'C', '3')" in conn.executed
+
+
+def test_stub_gerado_importa_decimal_e_datas(tmp_path, monkeypatch):
+    from datetime import date
+    from decimal import Decimal
+    from wborm.model_cache import generate_model_stub, update_model_stub_file
+
+    class Faturas(Model):
+        __tablename__ = "faturas"
+        id = Field(int, primary_key=True)
+        valor = Field(Decimal)
+        vencimento = Field(date)
+
+    monkeypatch.setattr("wborm.model_cache._model_registry", {"faturas": Faturas})
+    completo, incremental = tmp_path / "models.pyi", tmp_path / "stubs" / "inc.pyi"
+    generate_model_stub(str(completo))
+    update_model_stub_file(str(incremental), "Faturas", Faturas._fields)
+
+    for path in (completo, incremental):
+        text = path.read_text()
+        assert "valor: Optional[Decimal]" in text and "vencimento: Optional[date]" in text
+        exec(compile(text, str(path), "exec"), {})  # nomes indefinidos levantariam NameError
@@ -0,0 +1,64 @@
+# tests/test_large_in.py
+import re
+import pytest
+from wborm.cache import clear_cache
+from wborm.core import Model
+from wborm.fields import Field
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.queries = []
+        self.executed = []
+
+    def execute(self, sql):
+        self.executed.append(sql)
+
+    def execute_query(self, sql):
+        self.queries.append(sql)
+        if "COUNT(*)" in sql:
+            return [{"count": 7}]
+        ids = re.findall(r"'(\d+)'", sql.split("IN (", 1)[-1])
+        return [{"id": int(i), "cliente_id": 1} for i in ids]
+
+
+class Pedido(Model):
+    __tablename__ = "pedidos"
+    id = Field(int, primary_key=True)
+    cliente_id = Field(int)
+
+
+@pytest.fixture
+def conn():
+    clear_cache()
+    conn = RecordingConnection()
+    Pedido._connection = conn
+    return conn
+
+
+def test_lista_media_vira_lotes_concatenados(conn):
+    ids = list(range(25)) + [3, 4]
+    pedidos = Pedido.filter_in("id", ids).large_in(chunk_size=10, temp_threshold=100).all()
+
+    assert len(conn.queries) == 3
+    assert all(q.count("', '") <= 9 for q in conn.queries)
+    assert [p.id for p in pedidos] == list(range(25))
+
+
+def test_lista_enorme_e_not_in_usam_tabela_temporaria(conn):
+    qs = Pedido.filter_in("id", list(range(50))).not_in("cliente_id", list(range(20))).large_in(chunk_size=10)
+    assert qs.count() == 7
+
+    creates = [s for s in conn.executed if s.startswith("CREATE TEMP TABLE")]
+    assert len(creates) == 2 and not any("CREATE" in q for q in conn.queries)
+    assert all(re.fullmatch(r"CREATE TEMP TABLE tmp_wborm_in\d+ \(v INT8\) WITH NO LOG", c) for c in creates)
+    inserts = [s for s in conn.executed if s.startswith("INSERT INTO tmp_wborm_in")]
+    assert len(inserts) == 2 and sum(s.count("FROM systables") for s in inserts) == 70
+    assert re.search(r"WHERE id IN \(SELECT v FROM tmp_wborm_in\d+\)", conn.queries[-1])
+    assert "cliente_id NOT IN (SELECT v FROM tmp_wborm_in" in conn.queries[-1]
+    assert len([s for s in conn.executed if s.startswith("DROP TABLE tmp_wborm_in")]) == 2
+
+
+def test_lista_pequena_continua_inline(conn):
+    Pedido.filter_in("id", [1, 2, 3]).all()
+    assert len(conn.queries) == 1 and "IN ('1', '2', '3')" in conn.queries[0]
@@ -0,0 +1,47 @@
+# tests/test_loader.py
+import pytest
+from wborm.core import Model
+from wborm.fields import Field
+
+
+class DummyConnection:
+    def __init__(self):
+        self.queries = []
+
+    def execute(self, sql):
+        self.queries.append(sql)
+
+    def execute_query(self, sql):
+        self.queries.append(sql)
+        return []
+
+
+class Leitura(Model):
+    __tablename__ = "leituras"
+    id = Field(int, primary_key=True)
+    sensor = Field(str, nullable=False)
+    valor = Field(float)
+
+
+@pytest.fixture
+def conn():
+    conn = DummyConnection()
+    Leitura._connection = conn
+    return conn
+
+
+def test_bulk_load_csv_em_lotes(conn, tmp_path):
+    path = tmp_path / "leituras.csv"
+    path.write_text("id,sensor,valor\n" + "".join(f"{i},s{i},{i}.5\n" for i in range(5)))
+
+    total = Leitura.bulk_load(str(path), batch_size=2, workers=2, confirm=True)
+
+    assert total == 5
+    assert conn.queries.count("BEGIN WORK") == 3
+    assert "INSERT INTO leituras (id, sensor, valor) VALUES ('4', 's4', '4.5')" in conn.queries
+
+
+def test_bulk_load_informa_linha_invalida(conn):
+    rows = iter([{"id": "1", "sensor": "a"}, {"id": "2", "sensor": ""}])
+    with pytest.raises(ValueError, match="Linha 2"):
+        Leitura.bulk_load(rows, batch_size=10, confirm=True)
@@ -7,10 +7,12 @@ from wborm.fields import Field
 class DummyConnection:
     def __init__(self):
         self.last_query = None
+        self.history = []
         self.fail = False
 
     def execute(self, sql):
         self.last_query = sql
+        self.history.append(sql)
         if self.fail:
             raise Exception("Erro simulado")
 
@@ -75,3 +77,129 @@ def test_bulk_add_varios(conn):
     c2 = Cliente(nome="B")
     Cliente.bulk_add([c1, c2], confirm=True)
     assert "INSERT INTO clientes" in conn.last_query
+
+
+def test_update_envia_apenas_campos_alterados(conn):
+    Cliente._connection = conn
+    c = Cliente.live().filter(id=1).first()
+    assert c.dirty_fields == []
+    c.nome = "Novo"
+    assert c.dirty_fields == ["nome"]
+    c.update(confirm=True, id=1)
+    assert "UPDATE clientes SET nome = 'Novo' WHERE id = '1'" in conn.history
+
+
+def test_update_sem_alteracao_nao_vai_ao_banco(conn):
+    Cliente._connection = conn
+    c = Cliente.live().filter(id=1).first()
+    conn.history.clear()
+    c.update(confirm=True, id=1)
+    assert conn.history == []
+
+
+def test_bulk_upsert_usa_temp_table_e_merge(conn):
+    Cliente._connection = conn
+    total = Cliente.bulk_upsert([Cliente(id=1, nome="A"), Cliente(id=2, nome="B")], confirm=True)
+    assert total == 2
+    merge = [q for q in conn.history if q.startswith("MERGE")]
+    assert merge == [
+        "MERGE INTO clientes AS t USING tmp_upsert_clientes AS s ON (t.id = s.id) "
+        "WHEN MATCHED THEN UPDATE SET nome = s.nome, idade = s.idade "
+        "WHEN NOT MATCHED THEN INSERT (id, nome, idade) VALUES (s.id, s.nome, s.idade)"
+    ]
+    assert conn.history[-1] == "DROP TABLE tmp_upsert_clientes"
+    staging = [q for q in conn.history if q.startswith("INSERT INTO tmp_upsert_clientes")]
+    assert staging == [
+        "INSERT INTO tmp_upsert_clientes (id, nome, idade) "
+        "SELECT '1', 'A', CAST(NULL AS INT8) FROM systables WHERE tabid = 1 "
+        "UNION ALL SELECT '2', 'B', CAST(NULL AS INT8) FROM systables WHERE tabid = 1"
+    ]
+
+
+def test_format_value_usa_literais_boolean_do_informix():
+    from wborm.core import _format_value
+    assert (_format_value(True), _format_value(False), _format_value(1)) == ("'t'", "'f'", "'1'")
+
+
+def test_relacao_cacheada_invalida_por_chave_e_escrita(conn):
+    from wborm.cache import invalidate_tables
+    from wborm.core import cached_relation
+    from wborm.query import ResultSet
+
+    class Pedido(Model):
+        __tablename__ = "pedidos"
+        id = Field(int, primary_key=True)
+        cliente_id = Field(int)
+
+    consultas = []
+
+    def getter(self):
+        consultas.append(self.cliente_id)
+        return Cliente(id=self.cliente_id, nome="X")
+
+    Pedido.cliente = cached_relation(getter, "cliente", "cliente_id", "clientes")
+    pedido = Pedido(id=1, cliente_id=7)
+
+    assert pedido.cliente is pedido.cliente
+    pedido.cliente_id = 8
+    assert pedido.cliente.id == 8
+    invalidate_tables("clientes")
+    pedido.cliente
+    assert consultas == [7, 8, 8]
+
+    assert ResultSet([pedido]).invalidate_lazy("cliente") == 1
+    pedido.cliente
+    assert len(consultas) == 4
+
+
+def test_get_many_usa_lotes_e_cache_por_chave_primaria():
+    import re
+    from wborm.cache import invalidate_tables
+    from wborm.lookup import clear_pk_cache
+
+    class LookupConnection:
+        def __init__(self):
+            self.queries = []
+
+        def execute_query(self, sql):
+            self.queries.append(sql)
+            ids = [int(i) for i in re.findall(r"'(\d+)'", sql) if int(i) < 50]
+            return [{"id": i, "nome": f"C{i}", "idade": 30} for i in ids]
+
+    conn = LookupConnection()
+    Cliente._connection = conn
+    clear_pk_cache(Cliente)
+
+    clientes = Cliente.get_many(list(range(45)) + [99, "3"], chunk_size=20)
+    assert len(conn.queries) == 3 and conn.queries[0].startswith("SELECT id, nome, idade FROM clientes WHERE id IN (")
+    assert list(clientes)[:3] == [0, 1, 2] and 99 not in clientes and len(clientes) == 45
+
+    assert Cliente.get("7").nome == "C7" and Cliente.get(7) is not Cliente.get(7)
+    assert Cliente.get(99) is None
+    assert len(conn.queries) == 4 and conn.queries[-1].endswith("WHERE id = '99'")
+
+    invalidate_tables("clientes")
+    Cliente.get(7)
+    assert len(conn.queries) == 5
+
+
+def test_get_com_chave_char_ignora_espacos_a_direita():
+    class Produto(Model):
+        __tablename__ = "produtos_char"
+        codigo = Field(str, primary_key=True)
+        nome = Field(str)
+
+    class CharConnection:
+        def __init__(self):
+            self.queries = []
+
+        def execute_query(self, sql):
+            self.queries.append(sql)
+            return [{"codigo": "ABC   ", "nome": "Caneta"}]
+
+    conn = CharConnection()
+    Produto._connection = conn
+
+    assert Produto.get("ABC").nome == "Caneta"
+    assert conn.queries == ["SELECT codigo, nome FROM produtos_char WHERE codigo = 'ABC'"]
+    assert Produto.get("ABC  ").nome == "Caneta" and len(conn.queries) == 1
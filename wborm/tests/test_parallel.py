@@ -0,0 +1,142 @@
+# tests/test_parallel.py
+import re
+import threading
+from wborm.core import Model
+from wborm.fields import Field
+from wborm.pool import ConnectionPool
+
+TABELA = [{"id": i, "status": "A" if i % 2 else "B"} for i in range(1, 101)]
+
+
+class FakeConnection:
+    """Filtra a tabela em memória pelas condições de partição geradas pelo wborm."""
+
+    threads = set()
+
+    def execute(self, sql):
+        pass
+
+    def execute_query(self, sql):
+        FakeConnection.threads.add(threading.current_thread().name)
+        if "t1.id IS NULL" in sql:
+            return [{"id": None, "status": "N"}]
+        if "MIN(" in sql:
+            return [{"lo": 1, "hi": 100}]
+        rows = TABELA
+        faixa = re.search(r"t1\.id >= (\d+) AND t1\.id < (\d+)", sql)
+        if faixa:
+            lo, hi = map(int, faixa.groups())
+            rows = [r for r in rows if lo <= r["id"] < hi]
+        mod = re.search(r"MOD\(t1\.id, (\d+)\) = (\d+)", sql)
+        if mod:
+            n, i = map(int, mod.groups())
+            rows = [r for r in rows if r["id"] % n == i]
+        after = re.search(r"t1\.id > '(\d+)'", sql)
+        if after:
+            rows = [r for r in rows if r["id"] > int(after.group(1))]
+        rows = self.filter_rows(rows, sql)
+        page = re.search(r"SKIP (\d+) FIRST (\d+)", sql)
+        if page:
+            skip, first = map(int, page.groups())
+            rows = rows[skip:skip + first]
+        return rows
+
+    def filter_rows(self, rows, sql):
+        return rows
+
+
+class Registro(Model):
+    __tablename__ = "registros"
+    id = Field(int, primary_key=True)
+    status = Field(str)
+
+
+def test_parallel_all_divide_por_faixas_e_usa_o_pool():
+    Registro._connection = FakeConnection()
+    FakeConnection.threads.clear()
+    pool = ConnectionPool(FakeConnection, size=3)
+
+    result = Registro.parallel_all(partitions=4, pool=pool)
+
+    assert sorted(r.id for r in result) == list(range(1, 101))
+    assert len(pool) <= 3
+    assert any(name.startswith("wborm-part") for name in FakeConnection.threads)
+
+
+def test_parallel_iterator_mod_ordenado_mescla_as_particoes():
+    Registro._connection = FakeConnection()
+    pool = ConnectionPool(FakeConnection, size=4)
+
+    ids = [r.id for r in Registro.parallel_iterator(partitions=4, method="mod", pool=pool, ordered=True, chunk_size=7)]
+
+    assert ids == list(range(1, 101))
+
+
+def test_parallel_all_sem_pool_roda_em_sequencia():
+    Registro._connection = FakeConnection()
+
+    result = Registro.parallel_all(partitions=3, method="mod", ordered=True)
+
+    assert [r.id for r in result] == list(range(1, 101))
+
+
+def test_key_informada_inclui_particao_de_nulos_e_exige_inteiros():
+    import pytest
+    from wborm.parallel import key_partitions
+
+    Registro._connection = FakeConnection()
+    result = Registro.parallel_all(partitions=2, key="id")
+    assert len(result) == 101 and sum(r.id is None for r in result) == 1
+
+    conditions = key_partitions(Registro._get_queryset(), 2, key="id", method="mod")
+    assert conditions[-1] == "t1.id IS NULL"
+
+    Registro._connection.execute_query = lambda sql: [{"lo": "-0.5", "hi": "10"}]
+    with pytest.raises(ValueError):
+        key_partitions(Registro._get_queryset(), 2)
+    with pytest.raises(ValueError):
+        key_partitions(Registro._get_queryset(), 2, key="status")
+
+
+class FragmentConnection(FakeConnection):
+    fragments = [
+        {"evalpos": 0, "strategy": "E", "dbspace": "dbs1", "partition": "p1", "exprtext": "id <= 30", "nrows": 30},
+        {"evalpos": 1, "strategy": "E", "dbspace": "dbs2", "partition": "p2", "exprtext": "id <= 60", "nrows": 30},
+        {"evalpos": 2, "strategy": "E", "dbspace": "dbs3", "partition": "p3", "exprtext": "REMAINDER", "nrows": 40},
+    ]
+
+    def execute_query(self, sql):
+        if "sysfragments" in sql:
+            return self.fragments
+        return super().execute_query(sql)
+
+    def filter_rows(self, rows, sql):
+        if "(id <= 60) AND NOT ((id <= 30))" in sql:
+            return [r for r in rows if 30 < r["id"] <= 60]
+        if "(NOT ((id <= 30) OR (id <= 60)) OR id IS NULL)" in sql:
+            return [r for r in rows if r["id"] > 60]
+        if "(id <= 30)" in sql:
+            return [r for r in rows if r["id"] <= 30]
+        return rows
+
+
+def test_by_fragment_gera_uma_consulta_por_expressao():
+    Registro._connection = FragmentConnection()
+    Registro._fragments = None
+    pool = ConnectionPool(FragmentConnection, size=3)
+
+    ids = sorted(r.id for r in Registro.by_fragment(pool=pool, chunk_size=50))
+
+    assert ids == list(range(1, 101))
+    assert [f["expression"] for f in Registro._fragments] == ["id <= 30", "id <= 60", "REMAINDER"]
+
+
+def test_fragmentos_disjuntos_usam_so_a_propria_expressao():
+    from wborm.parallel import fragment_partitions
+
+    fragments = [{"expression": "id <= 30"}, {"expression": "id > 30 AND id <= 60"}, {"expression": "REMAINDER"}]
+    assert fragment_partitions(Registro._get_queryset(), fragments) == [
+        "(id <= 30)",
+        "(id > 30 AND id <= 60)",
+        "(NOT ((id <= 30) OR (id > 30 AND id <= 60)) OR id IS NULL)",
+    ]
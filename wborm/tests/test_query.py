@@ -0,0 +1,292 @@
+# tests/test_query.py
+import pytest
+from wborm.core import Model
+from wborm.fields import Field
+from wborm.cache import clear_cache
+
+
+class DummyConnection:
+    def __init__(self, rows=None):
+        self.queries = []
+        self.rows = rows if rows is not None else [{"id": 1, "status": "ABERTO", "cliente_id": 7}]
+
+    def execute(self, sql):
+        self.queries.append(sql)
+        return 3 if sql.startswith(("UPDATE", "DELETE")) else None
+
+    def execute_query(self, sql):
+        self.queries.append(sql)
+        return self.rows
+
+
+class Pedido(Model):
+    __tablename__ = "pedidos"
+    id = Field(int, primary_key=True)
+    status = Field(str)
+    cliente_id = Field(int)
+
+
+class Cliente(Model):
+    __tablename__ = "clientes"
+    id = Field(int, primary_key=True)
+    ativo = Field(str)
+
+
+@pytest.fixture
+def conn():
+    clear_cache()
+    conn = DummyConnection()
+    Pedido._connection = conn
+    Cliente._connection = conn
+    return conn
+
+
+def test_update_em_massa_compila_filtros_e_subquery(conn):
+    ativos = Cliente.filter(ativo="S").select("t1.id")
+    affected = (
+        Pedido.filter(status="ABERTO")
+        .filter_in("cliente_id", ativos)
+        .not_in("id", [10, 11])
+        .update(status="FECHADO", confirm=True)
+    )
+    assert affected == 3
+    assert conn.queries[1] == (
+        "UPDATE pedidos SET status = 'FECHADO' WHERE status = 'ABERTO' "
+        "AND cliente_id IN (SELECT t1.id FROM clientes t1 WHERE ativo = 'S') "
+        "AND id NOT IN ('10', '11')"
+    )
+
+
+def test_update_em_massa_preserva_alias_dentro_de_literais(conn):
+    Pedido.filter("t1.status = 'ver t1.x'").update(status="FECHADO", confirm=True)
+    assert conn.queries[1] == "UPDATE pedidos SET status = 'FECHADO' WHERE status = 'ver t1.x'"
+
+
+def test_delete_em_massa_exige_where_e_confirmacao(conn):
+    with pytest.raises(ValueError):
+        Pedido.filter(status="X").delete()
+    with pytest.raises(ValueError):
+        Pedido._get_queryset().delete(confirm=True)
+
+    assert Pedido.filter("t1.status = 'CANCELADO'").delete(confirm=True) == 3
+    assert "DELETE FROM pedidos WHERE status = 'CANCELADO'" in conn.queries
+
+
+def test_escrita_em_massa_recusa_limit_e_offset(conn):
+    with pytest.raises(ValueError, match="offset"):
+        Pedido.filter(status="X").offset(10).delete(confirm=True)
+    with pytest.raises(ValueError, match="offset"):
+        Pedido.filter(status="X").offset(10).update(status="Y", confirm=True)
+    with pytest.raises(ValueError, match="limit"):
+        Pedido.filter(status="X").limit(5).delete(confirm=True)
+    assert not any(q.startswith(("DELETE", "UPDATE")) for q in conn.queries)
+
+
+class PagedConnection(DummyConnection):
+    def execute_query(self, sql):
+        self.queries.append(sql)
+        import re
+        skip, first = map(int, re.search(r"SKIP (\d+) FIRST (\d+)", sql).groups())
+        data = [{"ID": i, "STATUS": f"s{i}", "CLIENTE_ID": i % 2} for i in range(5)]
+        after = re.search(r"t1\.id > '(\d+)'", sql)
+        if after:
+            data = [r for r in data if r["ID"] > int(after.group(1))]
+        return data[skip:skip + first]
+
+
+def test_to_csv_exporta_em_blocos_com_gzip(tmp_path):
+    import gzip
+    conn = PagedConnection()
+    Pedido._connection = conn
+    path = tmp_path / "pedidos.csv.gz"
+
+    assert Pedido.filter(status="X").to_csv(str(path), chunk_size=2) == 5
+
+    lines = gzip.open(path, "rt").read().splitlines()
+    assert lines[0] == "id,status,cliente_id"
+    assert lines[-1] == "4,s4,0"
+    assert len(conn.queries) == 3
+    assert all("ORDER BY t1.id" in q and "SKIP 0 " in q for q in conn.queries)
+    assert "t1.id > '3'" in conn.queries[2]
+
+
+def test_to_jsonl_respeita_limit(tmp_path):
+    import json
+    conn = PagedConnection()
+    Pedido._connection = conn
+    path = tmp_path / "pedidos.jsonl"
+
+    assert Pedido.filter(status="X").limit(3).to_jsonl(str(path), chunk_size=2) == 3
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert rows[2] == {"id": 2, "status": "s2", "cliente_id": 0}
+
+
+def test_show_formata_apenas_a_pagina_exibida(conn, monkeypatch, capsys):
+    conn.rows = [{"id": i, "status": f"s{i}", "cliente_id": None} for i in range(5)]
+    results = Pedido.live().all()
+    monkeypatch.setattr("builtins.input", lambda *_: "q")
+
+    results.show(page_size=2, hide_empty_columns=True)
+
+    pages = [k for k in results._render_cache if k[0] == "page"]
+    assert [(k[1], k[2]) for k in pages] == [(0, 2)]
+    out = capsys.readouterr().out
+    assert "status" in out and "cliente_id" not in out
+
+
+def test_hidratacao_converte_decimal_e_datetime_por_coluna(conn):
+    from datetime import datetime
+    from decimal import Decimal
+    from wborm.utils import map_coltype_to_python
+
+    class Fatura(Model):
+        __tablename__ = "faturas"
+        id = Field(int, primary_key=True)
+        valor = Field(Decimal)
+        emitida_em = Field(datetime)
+
+    Fatura._connection = conn
+    conn.rows = [{"id": "5", "valor": 10.5, "emitida_em": "2024-01-31 10:20:30.5"}]
+
+    fatura = Fatura.live().all()[0]
+
+    assert fatura.id == 5
+    assert fatura.valor == Decimal("10.5")
+    assert fatura.emitida_em == datetime(2024, 1, 31, 10, 20, 30, 500000)
+    assert not fatura.is_dirty
+    assert map_coltype_to_python(5) is Decimal and map_coltype_to_python(2) is int
+
+
+def test_to_json_serializa_decimal_e_datetime_hidratados(conn):
+    import json
+    from datetime import date, datetime
+    from decimal import Decimal
+
+    class Nota(Model):
+        __tablename__ = "notas"
+        id = Field(int, primary_key=True)
+        valor = Field(Decimal)
+        emitida_em = Field(datetime)
+        vencimento = Field(date)
+
+    Nota._connection = conn
+    conn.rows = [{"id": "1", "valor": "10.50", "emitida_em": "2024-01-31 10:20:30", "vencimento": "2024-02-29"}]
+
+    nota = Nota.live().all()[0]
+
+    assert json.loads(nota.to_json()) == {
+        "id": 1, "valor": "10.50", "emitida_em": "2024-01-31T10:20:30", "vencimento": "2024-02-29",
+    }
+
+
+def test_plano_de_hidratacao_montado_uma_vez_para_joins(conn, monkeypatch):
+    import wborm.converters as converters
+
+    converters._hydration_plans.clear()
+    chamadas = []
+    original = converters.build_converters
+    monkeypatch.setattr(converters, "build_converters", lambda *a: chamadas.append(a) or original(*a))
+    conn.rows = [
+        {"t1_id": str(i), "t1_status": "A", "t2_id": i, "t2_ativo": "S", "total": 1}
+        for i in range(3)
+    ]
+
+    results = Pedido.live().join(Cliente, "id").all()
+
+    assert len(chamadas) == 1
+    assert [r.t1_id for r in results] == [0, 1, 2]
+    assert results[0].t2_ativo == "S"
+    assert "total" not in results[0].__dict__
+
+
+def test_hidratacao_copia_colunas_ja_tipadas_e_converte_as_demais(conn):
+    from decimal import Decimal
+    import wborm.converters as converters
+
+    class Conta(Model):
+        __tablename__ = "contas"
+        id = Field(int, primary_key=True)
+        saldo = Field(Decimal)
+        ativa = Field(bool)
+
+    plan = converters.hydration_plan(Conta, ["id", "saldo", "ativa"])
+    pendentes = converters._pending_converters(plan[1], {"id": 1, "saldo": None, "ativa": 1})
+    assert [key for key, _ in pendentes] == ["saldo", "ativa"]  # NULL e int em campo bool convertem
+
+    Conta._connection = conn
+    conn.rows = [{"id": 1, "saldo": None, "ativa": "t"}, {"id": 2, "saldo": 2.5, "ativa": "f"}]
+    contas = Conta.live().all()
+
+    assert [(c.id, c.saldo, c.ativa) for c in contas] == [(1, None, True), (2, Decimal("2.5"), False)]
+    assert not contas[1].is_dirty
+
+
+def test_split_joins_deduplica_pais_e_liga_filhos(conn):
+    conn.rows = [
+        {"t1_id": 1, "t1_ativo": "S", "t2_id": 10, "t2_status": "A", "t2_cliente_id": 1},
+        {"t1_id": 1, "t1_ativo": "S", "t2_id": 11, "t2_status": "B", "t2_cliente_id": 1},
+        {"t1_id": 2, "t1_ativo": "N", "t2_id": None, "t2_status": None, "t2_cliente_id": None},
+    ]
+
+    clientes = Cliente.live().join(Pedido, "id").split_joins().all()
+
+    assert [c.id for c in clientes] == [1, 2]
+    assert [p.id for p in clientes[0].joined("t2")] == [10, 11]
+    assert clientes[0].joined("t2")[0].joined("t1") == [clientes[0]]
+    assert clientes[1].joined("t2") == []
+    assert "t2.status AS t2_status" in conn.queries[-1]
+
+
+def test_split_joins_nao_funde_linhas_identicas_de_modelo_sem_pk(conn):
+    class Item(Model):
+        __tablename__ = "itens"
+        id = Field(int)
+        produto = Field(str)
+
+    conn.rows = [
+        {"t1_id": 1, "t1_ativo": "S", "t2_id": 1, "t2_produto": "caneta"},
+        {"t1_id": 1, "t1_ativo": "S", "t2_id": 1, "t2_produto": "caneta"},
+    ]
+    Item._connection = conn
+
+    clientes = Cliente.live().join(Item, "id").split_joins().all()
+    assert [c.id for c in clientes] == [1]
+    assert [i.produto for i in clientes[0].joined("t2")] == ["caneta", "caneta"]
+
+    conn.rows = [
+        {"t1_id": 1, "t1_produto": "caneta", "t2_id": 1, "t2_ativo": "S"},
+        {"t1_id": 1, "t1_produto": "caneta", "t2_id": 1, "t2_ativo": "S"},
+    ]
+    itens = Item.live().join(Cliente, "id").split_joins().all()
+    assert len(itens) == 2 and itens[0] is not itens[1]
+    assert itens[0].joined("t2") == itens[1].joined("t2") == [itens[0].joined("t2")[0]]
+
+
+def test_split_joins_recusa_limit_e_first(conn):
+    with pytest.raises(ValueError):
+        Cliente.live().join(Pedido, "id").split_joins().first()
+    with pytest.raises(ValueError):
+        Cliente.live().join(Pedido, "id").split_joins().limit(10).all()
+    assert conn.queries == []
+
+
+def test_count_e_exists_reescrevem_a_consulta_compilada(conn):
+    conn.rows = [{"count": 4}]
+    qs = Pedido.filter(status="A").filter_in("cliente_id", [1, 2]).join(Cliente, "id").order_by("t1.id")
+
+    assert qs.count() == 4
+    assert qs.count() == 4
+    assert conn.queries == [
+        "SELECT COUNT(*) AS count FROM pedidos t1 INNER JOIN clientes AS t2 ON t1.id = t2.id "
+        "WHERE status = 'A' AND cliente_id IN ('1', '2')"
+    ]
+
+    conn.rows = [{"existe": 1}]
+    assert qs.exists()
+    assert conn.queries[-1].startswith("SELECT FIRST 1 1 AS existe FROM pedidos t1 INNER JOIN")
+    assert "ORDER BY" not in conn.queries[-1] and "AS t1_id" not in conn.queries[-1]
+
+    conn.rows = [{"count": 2}]
+    assert Pedido.live().distinct().limit(2).order_by("id").count() == 2
+    assert conn.queries[-1].startswith("SELECT COUNT(*) AS count FROM (SELECT SKIP 0 FIRST 2 DISTINCT")
+    assert "ORDER BY" not in conn.queries[-1]
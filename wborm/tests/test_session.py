@@ -0,0 +1,109 @@
+# tests/test_session.py
+import pytest
+from wborm.core import Model
+from wborm.fields import Field
+from wborm.unit_of_work import Session, session
+
+
+class DummyConnection:
+    def __init__(self):
+        self.queries = []
+        self.fail_on = None
+
+    def execute(self, sql):
+        self.queries.append(sql)
+        if self.fail_on and self.fail_on in sql:
+            raise Exception("Erro simulado")
+
+    def execute_query(self, sql):
+        self.queries.append(sql)
+        return []
+
+
+class Produto(Model):
+    __tablename__ = "produtos"
+    id = Field(int, primary_key=True)
+    nome = Field(str, nullable=False)
+
+
+@pytest.fixture
+def conn():
+    conn = DummyConnection()
+    Produto._connection = conn
+    return conn
+
+
+def test_flush_usa_uma_unica_transacao(conn):
+    with session(conn) as s:
+        s.add(Produto(id=1, nome="A"))
+        s.add(Produto(id=2, nome="B"))
+        s.delete(Produto(id=3))
+        s.delete(Produto(id=4))
+
+    assert conn.queries.count("BEGIN WORK") == 1
+    assert conn.queries.count("COMMIT WORK") == 1
+    assert "DELETE FROM produtos WHERE id IN ('3', '4')" in conn.queries
+    assert sum(q.startswith("INSERT INTO produtos") for q in conn.queries) == 2
+
+
+def test_commit_every_gera_commits_intermediarios(conn):
+    s = Session(conn, commit_every=2)
+    for i in range(5):
+        s.add(Produto(id=i, nome=str(i)))
+    assert s.flush() == 5
+    assert conn.queries.count("COMMIT WORK") == 3
+
+
+def test_falha_faz_rollback_e_mantem_pendencias(conn):
+    conn.fail_on = "INSERT"
+    s = Session(conn)
+    s.add(Produto(id=1, nome="A"))
+    with pytest.raises(Exception):
+        s.flush()
+    assert "ROLLBACK WORK" in conn.queries
+    assert s.pending == 1
+
+
+def test_falha_apos_commits_intermediarios_mantem_so_o_lote_atual(conn):
+    conn.fail_on = "VALUES ('5',"
+    s = Session(conn, commit_every=2)
+    produtos = [Produto(id=i, nome=str(i)) for i in range(1, 7)]
+    s.add_all(produtos)
+    with pytest.raises(Exception):
+        s.flush()
+
+    assert conn.queries.count("COMMIT WORK") == 2
+    assert s.pending == 2 and not produtos[0].dirty_fields
+
+    conn.fail_on = None
+    conn.queries.clear()
+    assert s.flush() == 2
+    assert [q for q in conn.queries if q.startswith("INSERT")] == [
+        "INSERT INTO produtos (id, nome) VALUES ('5', '5')",
+        "INSERT INTO produtos (id, nome) VALUES ('6', '6')",
+    ]
+
+
+def test_excecao_no_bloco_descarta_pendencias(conn):
+    with pytest.raises(RuntimeError):
+        with session(conn) as s:
+            s.add(Produto(id=1, nome="A"))
+            raise RuntimeError("abortar")
+    assert conn.queries == []
+
+
+def test_identity_map_devolve_a_mesma_instancia(conn):
+    from wborm.identity import current_identity_map
+
+    conn.execute_query = lambda sql: [{"id": "1", "nome": "A"}]
+
+    with session(conn, identity_map=True) as s:
+        a = Produto.filter(id=1).first()
+        a.nome = "alterado"
+        b = Produto.live().filter(id=1).first()
+        novo = s.add(Produto(id=2, nome="B"))
+
+    assert a is b and b.nome == "alterado"
+    assert len(s.identity_map) == 2 and novo in s.identity_map
+    assert current_identity_map() is None
+    assert Produto.live().filter(id=1).first() is not a
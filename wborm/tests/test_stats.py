@@ -0,0 +1,74 @@
+# tests/test_stats.py
+import pytest
+from wborm import stats
+from wborm.cache import clear_cache
+from wborm.core import Model
+from wborm.fields import Field
+
+
+class DummyConnection:
+    def execute_query(self, sql):
+        return [{"id": 1, "nome": "Teste"}, {"id": 2, "nome": "Outro"}]
+
+
+class Cliente(Model):
+    __tablename__ = "clientes"
+    id = Field(int, primary_key=True)
+    nome = Field(str)
+
+
+@pytest.fixture(autouse=True)
+def limpo():
+    stats.reset()
+    clear_cache()
+    yield
+    stats.reset()
+
+
+def test_fingerprint_normaliza_literais_e_listas_in():
+    a = stats.fingerprint("SELECT t1.id FROM clientes t1 WHERE t1.nome = 'D''Ávila' AND t1.id IN ('1', '2', '3') SKIP 0 FIRST 10")
+    b = stats.fingerprint("SELECT  t1.id FROM clientes t1\nWHERE t1.nome = 'Ana' AND t1.id IN (7) SKIP 20 FIRST 10")
+
+    assert a == b == "SELECT t1.id FROM clientes t1 WHERE t1.nome = ? AND t1.id IN (?) SKIP ? FIRST ?"
+    assert stats.fingerprint("WHERE (a = '1' AND b = '2') OR (a = '3' AND b = '4')") == "WHERE (a = ? AND b = ?)"
+
+
+def test_top_agrega_execucoes_por_forma():
+    Cliente._connection = DummyConnection()
+    for nome in ("Ana", "Bia", "Caio"):
+        Cliente.filter(nome=nome).all()
+    Cliente.filter(nome="Ana").all()          # acerto do cache: não vai ao banco
+    Cliente.get(5)
+
+    report = stats.top(5, show=False)
+
+    assert len(report) == 2
+    assert report[0]["count"] + report[1]["count"] == 4
+    filtro = next(r for r in report if "nome = ?" in r["fingerprint"])
+    assert filtro["count"] == 3 and filtro["rows"] == 6 and filtro["avg_rows"] == 2
+    assert filtro["p95"] <= filtro["max"] and "'Ana'" in filtro["example"]
+    assert stats.top(1, by="count", show=False)[0]["fingerprint"] == filtro["fingerprint"]
+
+
+def test_flush_lotes_in_e_particoes_entram_no_relatorio():
+    from wborm.unit_of_work import Session
+
+    class WriteConnection(DummyConnection):
+        def execute(self, sql):
+            return 1
+
+    Cliente._connection = WriteConnection()
+    s = Session(Cliente._connection)
+    s.add(Cliente(id=3, nome="C"))
+    s.flush()
+    Cliente.filter_in("id", list(range(30))).large_in(chunk_size=10, temp_threshold=100).all()
+    Cliente.live().filter_in("id", list(range(30))).large_in(chunk_size=10, temp_threshold=20).all()
+    Cliente.parallel_all(partitions=2, method="mod")
+
+    counts = {r["fingerprint"]: r["count"] for r in stats.top(50, show=False)}
+
+    assert counts["INSERT INTO clientes (id, nome) VALUES (?, ?)"] == 1
+    assert counts["SELECT t1.id, t1.nome FROM clientes t1 WHERE id IN (?)"] == 3
+    assert counts["CREATE TEMP TABLE tmp_wborm_in? (v INT8) WITH NO LOG"] == 1
+    assert counts["SELECT t1.id, t1.nome FROM clientes t1 WHERE id IN (SELECT v FROM tmp_wborm_in?)"] == 1
+    assert counts["SELECT t1.id, t1.nome FROM clientes t1 WHERE MOD(t1.id, ?) = ?"] == 2
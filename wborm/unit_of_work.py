@@ -0,0 +1,286 @@
+from contextlib import contextmanager
+from termcolor import cprint
+from wborm import stats
+from wborm.cache import invalidate_tables
+from wborm.identity import IdentityMap, current_identity_map, _current
+
+
+class Session:
+    """
+        Unidade de trabalho: acumula inserções, atualizações e exclusões e grava tudo
+        em uma única transação no `flush()`.
+
+        Forma de uso:
+        -------------
+        s = Session(conn, commit_every=5000)
+        s.add(Cliente(id=1, nome="João"))
+        s.update(cliente, id=2)
+        s.delete(pedido)
+        s.flush()
+
+        Observações:
+        ------------
+        - Os objetos são agrupados por tabela e formato de instrução (tipo, colunas e WHERE).
+        - Atualizações enviam apenas os campos alterados (`dirty_fields`); objetos sem alteração são ignorados.
+        - Exclusões com uma única coluna no WHERE são agrupadas em `DELETE ... WHERE col IN (...)`.
+        - `commit_every` define commits intermediários a cada N registros (padrão: um único commit).
+        - Se o WHERE não for informado em `update`/`delete`, usa as chaves primárias do modelo.
+        - Em caso de falha executa `ROLLBACK WORK` e mantém para nova tentativa apenas as pendências
+          ainda não confirmadas: com `commit_every`, os lotes já gravados por um COMMIT intermediário
+          saem da sessão (e são marcados como limpos) a cada COMMIT.
+        - Com `identity_map=True`, as consultas feitas dentro do `with` compartilham um mapa de
+          identidade (uma instância por tabela + chave primária), exposto em `s.identity_map`.
+        """
+
+    def __init__(self, conn=None, commit_every=None, batch_size=500, identity_map=False):
+        self.conn = conn
+        self.commit_every = commit_every
+        self.batch_size = batch_size
+        self.identity_map = IdentityMap() if identity_map else None
+        self._identity_tokens = []
+        self._new = []
+        self._dirty = []
+        self._deleted = []
+        self._seen = set()
+
+    def add(self, obj):
+        """Marca um objeto novo para inserção."""
+        self._register(self._new, obj, None)
+        return obj
+
+    def add_all(self, objs):
+        for obj in objs:
+            self.add(obj)
+
+    def update(self, obj, **where):
+        """Marca um objeto alterado para atualização (WHERE via kwargs ou chave primária)."""
+        self._register(self._dirty, obj, self._where_for(obj, where, "update"))
+        return obj
+
+    def delete(self, obj, **where):
+        """Marca um objeto para exclusão (WHERE via kwargs ou chave primária)."""
+        self._register(self._deleted, obj, self._where_for(obj, where, "delete"))
+        return obj
+
+    @property
+    def pending(self):
+        return len(self._new) + len(self._dirty) + len(self._deleted)
+
+    def _register(self, bucket, obj, where):
+        marker = (id(bucket), id(obj))
+        if marker in self._seen:
+            return
+        self._seen.add(marker)
+        bucket.append((obj, where))
+
+    @staticmethod
+    def _where_for(obj, where, action):
+        if where:
+            return where
+        pks = obj._primary_keys()
+        if not pks:
+            raise ValueError(
+                f"{action} requer cláusula explícita ou chave primária: ex. session.{action}(obj, id=1)"
+            )
+        return {pk: getattr(obj, pk) for pk in pks}
+
+    def _connection_for(self, obj):
+        conn = self.conn or obj._connection
+        if conn is None:
+            raise RuntimeError("Sessão sem conexão: informe Session(conn) ou defina Model._connection.")
+        return conn
+
+    def _plan(self):
+        """
+            Agrupa as pendências por (tipo, tabela, colunas, colunas do WHERE), preservando
+            a ordem da primeira ocorrência de cada grupo.
+            """
+        groups = {}
+
+        for obj, _ in self._new:
+            obj.before_add()
+            obj.validate()
+            keys = tuple(obj._insert_columns())
+            group = groups.setdefault(("INSERT", obj.__tablename__, keys, ()), [])
+            group.append((obj, None))
+
+        for obj, where in self._dirty:
+            keys = tuple(obj.dirty_fields)
+            if not keys:
+                continue
+            group = groups.setdefault(("UPDATE", obj.__tablename__, keys, tuple(where)), [])
+            group.append((obj, where))
+
+        for obj, where in self._deleted:
+            group = groups.setdefault(("DELETE", obj.__tablename__, (), tuple(where)), [])
+            group.append((obj, where))
+
+        return groups
+
+    def _statements(self, kind, table, keys, where_cols, items):
+        from wborm.core import _format_value
+
+        if kind == "INSERT":
+            columns = ", ".join(keys)
+            for item in items:
+                values = ", ".join(_format_value(getattr(item[0], k)) for k in keys)
+                yield f"INSERT INTO {table} ({columns}) VALUES ({values})", 1, [item]
+
+        elif kind == "UPDATE":
+            for item in items:
+                obj, where = item
+                updates = ", ".join(f"{k} = {_format_value(getattr(obj, k))}" for k in keys)
+                where_clause = " AND ".join(f"{k} = {_format_value(v)}" for k, v in where.items())
+                yield f"UPDATE {table} SET {updates} WHERE {where_clause}", 1, [item]
+
+        elif len(where_cols) == 1:
+            col = where_cols[0]
+            by_value = {}
+            for item in items:
+                by_value.setdefault(item[1][col], []).append(item)
+            values = list(by_value)
+            for start in range(0, len(values), self.batch_size):
+                chunk = values[start:start + self.batch_size]
+                lista = ", ".join(_format_value(v) for v in chunk)
+                yield f"DELETE FROM {table} WHERE {col} IN ({lista})", len(chunk), [i for v in chunk for i in by_value[v]]
+
+        else:
+            for item in items:
+                where_clause = " AND ".join(f"{k} = {_format_value(v)}" for k, v in item[1].items())
+                yield f"DELETE FROM {table} WHERE {where_clause}", 1, [item]
+
+    def flush(self):
+        """
+            Grava todas as pendências em uma única transação (ou em lotes, se `commit_every`).
+
+            Gera comandos como:
+            -------------------
+            BEGIN WORK
+            INSERT INTO clientes (id, nome) VALUES ('1', 'João')
+            INSERT INTO clientes (id, nome) VALUES ('2', 'Maria')
+            DELETE FROM pedidos WHERE id IN ('10', '11', '12')
+            COMMIT WORK
+
+            Retorna a quantidade de registros gravados.
+            """
+        if not self.pending:
+            return 0
+
+        groups = self._plan()
+        if not groups:
+            self._clear()
+            return 0
+        first = (self._new or self._dirty or self._deleted)[0][0]
+        conn = self._connection_for(first)
+        tables = {table for _, table, _, _ in groups}
+
+        written = 0
+        since_commit = 0
+        batch = []
+        try:
+            conn.execute("BEGIN WORK")
+            for (kind, table, keys, where_cols), items in groups.items():
+                for sql, rows, covered in self._statements(kind, table, keys, where_cols, items):
+                    stats.timed_write(conn, sql)
+                    written += rows
+                    since_commit += rows
+                    batch += [(kind, table, item) for item in covered]
+                    if self.commit_every and since_commit >= self.commit_every:
+                        conn.execute("COMMIT WORK")
+                        self._committed(batch)
+                        batch = []
+                        conn.execute("BEGIN WORK")
+                        since_commit = 0
+            conn.execute("COMMIT WORK")
+        except Exception as e:
+            conn.execute("ROLLBACK WORK")
+            invalidate_tables(*tables)
+            cprint(f"✖ Falha no flush da sessão: {str(e)}", "red")
+            raise
+
+        self._committed(batch)
+        invalidate_tables(*tables)
+        self._clear()
+        cprint(f"✔ Sessão gravada: {written} registros em {len(tables)} tabela(s)", "green")
+        return written
+
+    def _committed(self, batch):
+        """
+            Finaliza itens já confirmados por COMMIT: marca como limpos, atualiza o mapa de
+            identidade, invalida as tabelas e remove-os das pendências (não serão regravados).
+            """
+        if not batch:
+            return
+        imap = self.identity_map or current_identity_map()
+        done = {"INSERT": set(), "UPDATE": set(), "DELETE": set()}
+        for kind, _, (obj, _) in batch:
+            done[kind].add(id(obj))
+            if kind == "INSERT":
+                obj._mark_clean()
+                if imap is not None:
+                    imap.add(obj)
+            elif kind == "UPDATE":
+                obj._mark_clean()
+                obj.after_update()
+            elif imap is not None:
+                imap.discard(obj)
+        invalidate_tables(*{table for _, table, _ in batch})
+
+        for kind, bucket in (("INSERT", self._new), ("UPDATE", self._dirty), ("DELETE", self._deleted)):
+            kept = [item for item in bucket if id(item[0]) not in done[kind]]
+            removed = [item for item in bucket if id(item[0]) in done[kind]]
+            bucket[:] = kept
+            for obj, _ in removed:
+                self._seen.discard((id(bucket), id(obj)))
+
+    commit = flush
+
+    def rollback(self):
+        """Descarta todas as pendências ainda não gravadas."""
+        self._clear()
+
+    def _clear(self):
+        self._new.clear()
+        self._dirty.clear()
+        self._deleted.clear()
+        self._seen.clear()
+
+    def __enter__(self):
+        if self.identity_map is not None:
+            self._identity_tokens.append(_current.set(self.identity_map))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.flush()
+            else:
+                self.rollback()
+        finally:
+            if self._identity_tokens:
+                _current.reset(self._identity_tokens.pop())
+        return False
+
+
+@contextmanager
+def session(conn=None, commit_every=None, batch_size=500, identity_map=False):
+    """
+        Abre uma unidade de trabalho que grava tudo ao sair do bloco `with`.
+
+        Forma de uso:
+        -------------
+        with wborm.session(conn, commit_every=10000) as s:
+            for linha in linhas:
+                s.add(Cliente(**linha))
+
+        Observações:
+        ------------
+        - Se o bloco terminar com exceção, as pendências são descartadas sem tocar no banco.
+        - `identity_map=True` ativa um mapa de identidade durante o bloco (ver `Session`).
+        """
+    s = Session(conn, commit_every=commit_every, batch_size=batch_size, identity_map=identity_map)
+    with s:
+        yield s
+
+
+__all__ = ["Session", "session"]
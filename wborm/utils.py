@@ -1,39 +1,51 @@
 import sys, os
 import time
 from wborm.fields import Field
-from wborm.core import Model
-from wborm.introspect import introspect_table, get_foreign_keys
+from wborm.core import Model, cached_relation
+from wborm.introspect import introspect_table, get_foreign_keys, get_indexes, get_primary_key
 from wborm.model_cache import try_load_model_from_disk, save_model_to_disk, generate_model_stub, get_or_create_key
 from wborm.registry import _model_registry, _model_cache
 from cryptography.fernet import Fernet
 import pickle
 
+_INFORMIX_TYPE_CODES = {
+    0: "CHAR", 1: "SMALLINT", 2: "INTEGER", 3: "FLOAT", 4: "SMALLFLOAT", 5: "DECIMAL",
+    6: "SERIAL", 7: "DATE", 8: "MONEY", 10: "DATETIME", 13: "VARCHAR", 15: "NCHAR",
+    16: "NVARCHAR", 17: "INT8", 18: "SERIAL8", 40: "LVARCHAR", 45: "BOOLEAN",
+    52: "BIGINT", 53: "BIGSERIAL",
+}
+
+
 def map_coltype_to_python(coltype):
     """
     Mapeia o tipo da coluna (int ou string) para um tipo Python.
     - Se receber um int (tipo Informix original), usa o bitmask.
     - Se receber uma string (como 'VARCHAR'), faz o mapeamento direto.
+
+    Inteiros -> int, FLOAT/SMALLFLOAT -> float, DECIMAL/MONEY -> Decimal,
+    DATE -> date, DATETIME -> datetime, BOOLEAN -> bool, demais -> str.
     """
+    from datetime import date, datetime
+    from decimal import Decimal
+
     if isinstance(coltype, int):
-        type_code = coltype & 0xFF
-        if type_code in (0, 5):  # CHAR, DECIMAL
-            return int
-        if type_code in (1, 13):  # SMALLINT, VARCHAR
-            return str
-        if type_code in (2, 3):  # INTEGER, FLOAT
-            return float
-        return str
+        type_str = _INFORMIX_TYPE_CODES.get(coltype & 0xFF, "CHAR")
     else:
-        type_str = str(coltype).upper()
-        if type_str in ("SMALLINT", "INTEGER", "INT8", "SERIAL", "SERIAL8"):
-            return int
-        if type_str in ("FLOAT", "SMALLFLOAT", "REAL", "DECIMAL", "MONEY"):
-            return float
-        if type_str in ("DATE", "DATETIME"):
-            return str
-        if type_str in ("BOOLEAN",):
-            return bool
-        return str
+        type_str = str(coltype).strip().upper()
+
+    if type_str in ("SMALLINT", "INTEGER", "INT8", "SERIAL", "SERIAL8", "BIGINT", "BIGSERIAL"):
+        return int
+    if type_str in ("FLOAT", "SMALLFLOAT", "REAL"):
+        return float
+    if type_str in ("DECIMAL", "MONEY"):
+        return Decimal
+    if type_str == "DATE":
+        return date
+    if type_str == "DATETIME":
+        return datetime
+    if type_str == "BOOLEAN":
+        return bool
+    return str
 
 
 def generate_model(table_name, conn, refresh=False, inject_globals=True, target_globals=None):
@@ -64,7 +76,8 @@ def generate_model(table_name, conn, refresh=False, inject_globals=True, target_
         - Se o modelo já existir no cache, apenas reutiliza.
         - Se houver modelo salvo no disco, carrega para evitar reintrospecção.
         - Se não existir, introspecta a estrutura da tabela e gera dinamicamente:
-            - Campos normais (`Field`) para cada coluna.
+            - Campos normais (`Field`) para cada coluna, com `primary_key=True` nas colunas da
+              chave primária do catálogo (inclusive chaves compostas).
             - Relações automáticas baseadas nas Foreign Keys.
         - Injeta a classe e aliases t1–t10 no escopo se `inject_globals=True`.
         - Gera também o arquivo de stubs (.pyi) para suporte a autocomplete.
@@ -76,7 +89,8 @@ def generate_model(table_name, conn, refresh=False, inject_globals=True, target_
 
         Observações:
         ------------
-        - Cria propriedades automáticas para relações de Foreign Keys (FKs e reversas).
+        - Cria propriedades automáticas para relações de Foreign Keys (FKs e reversas), cacheadas
+          por instância (`cached_relation`) até a chave mudar ou a tabela alvo receber escritas.
         - Se ocorrer erro ao ler FKs, prossegue apenas com os campos normais.
         - Chama `save_model_to_disk()` para persistir o modelo localmente.
         - Atualiza o registro `_model_registry` para permitir joins automáticos.
@@ -102,11 +116,20 @@ def generate_model(table_name, conn, refresh=False, inject_globals=True, target_
             return model
 
     metadata = introspect_table(table_name, conn)
-    class_attrs = {"__tablename__": table_name}
+    class_attrs = {"__tablename__": table_name, "_relations": {}}
+
+    try:
+        class_attrs["_indexes"] = get_indexes(table_name, conn)
+    except Exception as e:
+        print(f"     ⚠️ Ignorando índices para '{table_name}': {e}")
+        class_attrs["_indexes"] = []
+    primary_key = set(get_primary_key(table_name, conn, indexes=class_attrs["_indexes"]))
 
     for col in metadata:
+        name = str(col["name"]).strip()
         py_type = map_coltype_to_python(col["type"])
-        class_attrs[str(col["name"])] = Field(py_type)
+        # PK continua nullable: colunas SERIAL são preenchidas pelo banco quando omitidas no INSERT
+        class_attrs[name] = Field(py_type, primary_key=name in primary_key)
 
     class_name = table_name.capitalize()
     class_attrs["__module__"] = "wborm.core"
@@ -128,7 +151,7 @@ def generate_model(table_name, conn, refresh=False, inject_globals=True, target_
                 def relation_getter(self, t=to_tbl, fk_col=from_col, pk_col=to_col):
                     Target = generate_model(t, conn, target_globals=target_globals)
                     return Target.filter(**{pk_col: getattr(self, fk_col)}).first()
-                setattr(model_class, rel_name, property(relation_getter))
+                setattr(model_class, rel_name, cached_relation(relation_getter, rel_name, from_col, to_tbl))
                 model_class._relations[rel_name] = to_tbl
 
             if to_tbl == table_name:
@@ -136,7 +159,7 @@ def generate_model(table_name, conn, refresh=False, inject_globals=True, target_
                 def reverse_getter(self, t=from_tbl, fk_col=from_col, pk_col=to_col):
                     Source = generate_model(t, conn, target_globals=target_globals)
                     return Source.filter(**{fk_col: getattr(self, pk_col)}).all()
-                setattr(model_class, reverse_name, property(reverse_getter))
+                setattr(model_class, reverse_name, cached_relation(reverse_getter, reverse_name, to_col, from_tbl))
                 model_class._relations[reverse_name] = from_tbl
     except Exception as e:
         print(f"     ⚠️ Ignorando FKs para '{table_name}': {e}")
@@ -354,5 +377,8 @@ def create_temp_table_from_queryset(queryset, temp_name, with_log=False):
     # print(f"📦 Criando temp table: {create_sql}")
     queryset.conn.execute(create_sql)
 
+    from wborm.cache import invalidate_tables
+    invalidate_tables(temp_name)
+
     from wborm.utils import generate_model
     return generate_model(temp_name, queryset.conn, inject_globals=True)